@@ -0,0 +1,337 @@
+"""
+Benchmark suite of the parser.
+Generates synthetic boards at increasing scales, then times and memory-profiles
+the parsing and the access to every public property of the object model on each
+of them with each xml backend, and prints a scaling report. The growth column is
+the exponent of the best power law fit between the first and last scales: about
+1 for linear accesses and 2 for quadratic ones.
+
+Usage:
+    python benchmarks/bench.py --scales 1,4,16 --json results.json
+    python benchmarks/bench.py --scales 1,4,16 --compare results.json
+    python benchmarks/bench.py --backends etree,lxml --no-memory
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sboardgen  # noqa: E402
+
+from sboardparser import parser  # noqa: E402
+
+# Size of the board generated at scale 1. Scenes, video clips, transitions and
+# library drawings grow with the scale.
+BASE_CONFIG = {
+    "scenes": 10,
+    "panels": 10,
+    "layers": 4,
+    "audio_tracks": 2,
+    "library": 100,
+    "video_clips": 10,
+    "transitions": 5,
+}
+SCALED = ("scenes", "library", "video_clips", "transitions")
+
+
+def _scaled_config(scale: int) -> Dict[str, int]:
+    """Returns the generator config of the given scale."""
+    return {
+        key: value * scale if key in SCALED else value
+        for key, value in BASE_CONFIG.items()
+    }
+
+
+def _panels(project: parser.SBoardProject) -> List[parser.SBoardPanel]:
+    """Returns all the panels of the project."""
+    return [panel for scene in project.timeline.scenes for panel in scene.panels]
+
+
+def _video_tracks(project: parser.SBoardProject) -> List[parser.SBoardVideoTrack]:
+    """Returns all the video tracks of the project."""
+    return list(project.timeline.video_tracks)
+
+
+def _audio_tracks(project: parser.SBoardProject) -> List[parser.SBoardAudioTrack]:
+    """Returns all the audio tracks of the project."""
+    return list(project.timeline.audio_tracks)
+
+
+# Functions returning all the objects of a class from a project, reaching them
+# the way a user would so that only the lookups needed to get to the objects
+# of the class are done before they are measured.
+COLLECTORS: Dict[type, Callable[[parser.SBoardProject], List[Any]]] = {
+    parser.SBoardProject: lambda project: [project],
+    parser.SBoardTimeline: lambda project: [project.timeline],
+    parser.SBoardSequence: lambda project: list(project.sequences),
+    parser.SBoardScene: lambda project: list(project.timeline.scenes),
+    parser.SBoardPanel: _panels,
+    parser.SBoardLayer: lambda project: [
+        layer
+        for panel in _panels(project)
+        for layer in panel.layer_iter(groups=True, recursive=True)
+    ],
+    parser.SBoardVideoTrack: _video_tracks,
+    parser.SBoardVideoClip: lambda project: [
+        clip for track in _video_tracks(project) for clip in track.clips
+    ],
+    parser.SBoardAudioTrack: _audio_tracks,
+    parser.SBoardAudioClip: lambda project: [
+        clip for track in _audio_tracks(project) for clip in track.clips
+    ],
+    parser.SBoardTransition: lambda project: list(project.timeline.transitions),
+    parser.SBoardLibrary: lambda project: [project.library],
+    parser.SBoardLibraryCategory: lambda project: list(project.library.categories),
+    parser.SBoardLibraryElement: lambda project: list(project.library.elements),
+}
+
+
+def _consume(value: Any) -> None:
+    """Exhausts the value if it is an iterator."""
+    if hasattr(value, "__next__"):
+        for _ in value:
+            pass
+
+
+def _benchmarks(cls: type) -> List[Tuple[str, Callable[[Any], Any]]]:
+    """Returns the name and the accessor of every public property of the
+    class, along with the calls of its public methods."""
+    benchmarks = [
+        (name, lambda obj, name=name: getattr(obj, name))
+        for name, value in vars(cls).items()
+        if isinstance(value, property) and not name.startswith("_")
+    ]
+
+    methods = {
+        parser.SBoardPanel: [
+            ("layer_iter()", lambda obj: obj.layer_iter()),
+            (
+                "layer_iter(groups, recursive)",
+                lambda obj: obj.layer_iter(groups=True, recursive=True),
+            ),
+        ],
+        parser.SBoardLayer: [
+            (
+                "layer_iter(groups, recursive)",
+                lambda obj: obj.layer_iter(groups=True, recursive=True),
+            ),
+            ("is_group()", lambda obj: obj.is_group()),
+        ],
+        parser.SBoardVideoTrack: [("is_enabled()", lambda obj: obj.is_enabled())],
+        parser.SBoardAudioTrack: [("is_enabled()", lambda obj: obj.is_enabled())],
+        parser.SBoardTimeline: [
+            (
+                "at_frame() x 1000",
+                lambda obj: [
+                    obj.at_frame(frame)
+                    for frame in range(0, obj.length, max(obj.length // 1000, 1))
+                ],
+            ),
+            ("in_range()", lambda obj: obj.in_range(1, obj.length)),
+        ],
+        parser.SBoardProject: [("fingerprint()", lambda obj: obj.fingerprint())],
+    }
+    benchmarks.extend(methods.get(cls, []))
+
+    if parser.numpy is not None and cls in (parser.SBoardTimeline, parser.SBoardScene):
+        benchmarks.append(("to_arrays()", lambda obj: obj.to_arrays()))
+
+    return benchmarks
+
+
+def _measure(func: Callable[[], Any], memory: bool) -> float:
+    """Returns the duration in seconds of the call of func or the peak of
+    memory allocated during the call in bytes if memory is True."""
+    gc.collect()
+
+    if memory:
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return float(peak)
+
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_scale(path: str, memory: bool, backend: str) -> Dict[str, float]:
+    """Returns the measures of the parsing and of all the properties on the
+    given board with the given xml backend.
+
+    The collection of the objects of each class is measured as
+    Class.<collect>. Each property is then measured on a new project, on
+    objects just collected, so that it does not benefit from the caches
+    filled by the other properties.
+    """
+
+    def parse():
+        return parser.SBoardProject.from_file(path, backend=backend)
+
+    results = {"parse": _measure(parse, memory)}
+
+    for cls, collect in COLLECTORS.items():
+        project = parse()
+        key = "{}.<collect>".format(cls.__name__)
+        results[key] = _measure(lambda: collect(project), memory)
+
+        for name, accessor in _benchmarks(cls):
+            objects = collect(parse())
+
+            def access_all(accessor=accessor):
+                for obj in objects:
+                    _consume(accessor(obj))
+
+            key = "{}.{}".format(cls.__name__, name)
+            results[key] = _measure(access_all, memory)
+
+    return results
+
+
+def _growth(values: List[float], scales: List[int]) -> str:
+    """Returns the exponent of the power law fit between the first and the
+    last values."""
+    if len(values) < 2 or min(values[0], values[-1]) <= 0:
+        return "-"
+
+    ratio = math.log(values[-1] / values[0]) / math.log(scales[-1] / scales[0])
+    return "{:.2f}".format(ratio)
+
+
+def report(results: Dict[str, Any], compare: Dict[str, Any] = None) -> str:
+    """Returns the scaling report of the given results as text."""
+    lines = []
+
+    for backend, measures in results["backends"].items():
+        reference = (compare or {}).get("backends", {}).get(backend)
+        lines.append("Backend: {}\n".format(backend))
+        lines.append(_report_backend(results["scales"], measures, reference))
+
+    return "\n".join(lines)
+
+
+def _report_backend(
+    scales: List[int], results: Dict[str, Any], compare: Dict[str, Any] = None
+) -> str:
+    """Returns the scaling report of the results of a backend as text."""
+    lines = []
+
+    for kind, unit, factor in (("time", "ms", 1e3), ("memory", "KiB", 1 / 1024.0)):
+        measures = results.get(kind)
+
+        if not measures:
+            continue
+
+        header = "{:<52}".format("{} ({})".format(kind, unit))
+        header += "".join("{:>12}".format("x{}".format(scale)) for scale in scales)
+        header += "{:>8}".format("growth")
+        if compare and compare.get(kind):
+            header += "{:>10}".format("vs ref")
+        lines.append(header)
+
+        for key, values in measures.items():
+            line = "{:<52}".format(key)
+            line += "".join("{:>12.2f}".format(value * factor) for value in values)
+            line += "{:>8}".format(_growth(values, scales))
+
+            reference = (compare or {}).get(kind, {}).get(key)
+            if reference and reference[-1] > 0:
+                line += "{:>9.2f}x".format(values[-1] / reference[-1])
+
+            lines.append(line)
+
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def run(
+    scales: List[int], memory: bool = True, backends: List[str] = ("etree",)
+) -> Dict[str, Any]:
+    """Runs the benchmarks at the given scales with the given xml backends and
+    returns the results."""
+    results: Dict[str, Any] = {
+        "config": BASE_CONFIG,
+        "scales": scales,
+        "sizes": [],
+        "backends": {backend: {"time": {}, "memory": {}} for backend in backends},
+    }
+    kinds = ["time", "memory"] if memory else ["time"]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in scales:
+            path = os.path.join(tmp_dir, "x{}.sboard".format(scale))
+
+            with open(path, "w") as fp:
+                sboardgen.generate(fp, **_scaled_config(scale))
+
+            results["sizes"].append(os.path.getsize(path))
+
+            for backend in backends:
+                measures = results["backends"][backend]
+
+                for kind in kinds:
+                    values = run_scale(path, kind == "memory", backend)
+
+                    for key, value in values.items():
+                        measures[kind].setdefault(key, []).append(value)
+
+    return results
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    argument_parser.add_argument(
+        "--scales", default="1,4,16", help="Comma separated scale factors"
+    )
+    argument_parser.add_argument("--json", help="Write the results to this file")
+    argument_parser.add_argument(
+        "--compare", help="Compare with the results of this file"
+    )
+    argument_parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the memory profiling"
+    )
+    argument_parser.add_argument(
+        "--backends", default="etree", help="Comma separated xml backends"
+    )
+    args = argument_parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(",")]
+    backends = args.backends.split(",")
+    results = run(scales, memory=not args.no_memory, backends=backends)
+
+    compare = None
+    if args.compare:
+        with open(args.compare) as fp:
+            compare = json.load(fp)
+
+    sizes = ", ".join(
+        "x{}: {:.1f} MB".format(scale, size / 1e6)
+        for scale, size in zip(scales, results["sizes"])
+    )
+    print("Board sizes: {}\n".format(sizes))
+    print(report(results, compare))
+
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump(results, fp, indent=1)
+
+
+if __name__ == "__main__":
+    main()
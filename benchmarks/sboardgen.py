@@ -0,0 +1,273 @@
+"""
+Generator of synthetic Storyboard Pro .sboard files.
+The generated files follow the structure of the files saved by Storyboard Pro
+14.20 for all the nodes read by the parser, at a configurable scale.
+
+Usage:
+    python benchmarks/sboardgen.py out.sboard --scenes 100 --panels 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+from typing import IO
+
+PANEL_LENGTH = 24
+CLIP_LENGTH = 48
+
+
+def generate(
+    fp: IO[str],
+    scenes: int = 10,
+    panels: int = 10,
+    layers: int = 4,
+    audio_tracks: int = 2,
+    library: int = 100,
+    video_clips: int = 10,
+    transitions: int = 5,
+    scenes_per_sequence: int = 10,
+    attrs: int = 20,
+) -> None:
+    """Writes a synthetic project to the given text file object.
+
+    Args:
+        fp: The file object to write to
+        scenes: The number of scenes
+        panels: The number of panels per scene
+        layers: The number of drawing layers per panel, all of them in a group
+        audio_tracks: The number of audio tracks, each one holding one clip per
+            scene
+        library: The number of drawings in the library, used in turn by the
+            layers
+        video_clips: The number of clips of the video track
+        transitions: The number of transitions, placed between scenes
+        scenes_per_sequence: The number of scenes in each sequence
+        attrs: The number of attributes nodes of each layer, which make the
+            bulk of real files
+    """
+    counter = itertools.count(1)
+
+    def uid() -> str:
+        return "{:016x}".format(next(counter))
+
+    write = fp.write
+    scene_length = panels * PANEL_LENGTH
+    drawing_names = ["drawing_{}".format(k) for k in range(max(library, 1))]
+    clip_names = ["clip_{}".format(k) for k in range(max(video_clips, 1))]
+    attrs_xml = "".join(
+        '<attr{} val="0"><x val="0"/><y val="0"/></attr{}>'.format(k, k)
+        for k in range(attrs)
+    )
+
+    scene_ids = [uid() for _ in range(scenes)]
+    panel_ids = [[uid() for _ in range(panels)] for _ in range(scenes)]
+    clip_ids = [uid() for _ in range(video_clips)]
+
+    write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    write('<project source="sboardgen" version="14204" build="14806">\n')
+
+    # Library
+    write(" <elements>\n")
+    write(
+        '  <element id="1" elementName="Draw" elementFolder="Draw" '
+        'rootFolder="elements">\n   <drawings>\n'
+    )
+    for name in drawing_names:
+        write('    <dwg name="{}" scaleFactor="1"/>\n'.format(name))
+    write("   </drawings>\n  </element>\n")
+    write(
+        '  <element id="2" elementName="mp4" elementFolder="mp4" '
+        'rootFolder="elements">\n   <drawings>\n'
+    )
+    for name in clip_names:
+        write('    <dwg name="{}" scaleFactor="1"/>\n'.format(name))
+    write("   </drawings>\n  </element>\n </elements>\n")
+
+    write(' <options>\n  <framerate val="24"/>\n </options>\n <scenes>\n')
+
+    # Timeline
+    write(
+        '  <scene name="Top" id="{}" nbframes="{}">\n   <columns>\n'.format(
+            uid(), scenes * scene_length
+        )
+    )
+    write('    <column type="0" name="ATV-SCENES" id="1">\n')
+    for k, scene_id in enumerate(scene_ids):
+        start = k * scene_length + 1
+        write(
+            '     <warpSeq exposures="{}-{}" id="{}" start="1" end="{}"/>\n'.format(
+                start, start + scene_length - 1, scene_id, scene_length
+            )
+        )
+    for k in range(min(transitions, max(scenes - 1, 0))):
+        end = (k + 1) * scene_length
+        write(
+            '     <transitionSeq exposures="{}-{}" id="{}" type="dissolve"/>\n'.format(
+                end - 5, end + 6, uid()
+            )
+        )
+    write("    </column>\n")
+
+    write('    <column type="0" name="ATV-VIDEO" id="1">\n')
+    for k, clip_id in enumerate(clip_ids):
+        start = k * CLIP_LENGTH + 1
+        write(
+            '     <warpSeq exposures="{}-{}" id="{}" start="1" end="{}"/>\n'.format(
+                start, start + CLIP_LENGTH - 1, clip_id, CLIP_LENGTH
+            )
+        )
+    write("    </column>\n")
+
+    for track in range(audio_tracks):
+        write(
+            '    <column type="1" name="AudioTrack{}" disabled="false">\n'.format(
+                track + 1
+            )
+        )
+        for k in range(scenes):
+            start = k * scene_length + 1
+            write(
+                '     <soundSequence startFrame="{}" stopFrame="{}" '
+                'name="audio_{}.wav" clippingTimeStart="0" '
+                'clippingTimeStop="{}"/>\n'.format(
+                    start, start + scene_length, k, scene_length / 24.0
+                )
+            )
+        write("    </column>\n")
+
+    write("   </columns>\n")
+    write('   <rootgroup name="Top">\n    <nodeslist>\n')
+    write(
+        '     <module type="READ" name="TopLayer"><attrs><drawing>'
+        '<element col="ATV-SCENES"/></drawing></attrs></module>\n'
+    )
+    write(
+        '     <module type="READ" name="VideoTrack1"><options/><attrs><drawing>'
+        '<element col="ATV-VIDEO"/></drawing></attrs></module>\n'
+    )
+    write("    </nodeslist>\n   </rootgroup>\n  </scene>\n")
+
+    # Scenes and their panels
+    drawings = itertools.cycle(drawing_names)
+
+    for k, scene_id in enumerate(scene_ids):
+        write(
+            '  <scene name="shot" id="{}" nbframes="{}">\n'.format(
+                scene_id, scene_length
+            )
+        )
+        write(
+            '   <columns>\n    <column type="0" name="ATV-{}" id="1">\n'.format(uid())
+        )
+        for p, panel_id in enumerate(panel_ids[k]):
+            start = p * PANEL_LENGTH + 1
+            write(
+                '     <warpSeq exposures="{}-{}" id="{}" start="1" '
+                'end="{}"/>\n'.format(
+                    start, start + PANEL_LENGTH - 1, panel_id, PANEL_LENGTH
+                )
+            )
+        write("    </column>\n   </columns>\n")
+        write(
+            '   <rootgroup name="Top">\n    <nodeslist>\n'
+            '     <module type="CAMERA" name="Camera"><attrs>{}</attrs></module>\n'
+            "    </nodeslist>\n   </rootgroup>\n".format(attrs_xml)
+        )
+        write(
+            '   <metas>\n    <meta type="sceneInfo" name="sceneInfo">\n'
+            '     <sceneInfo name="{}" sequenceName="{}"/>\n'
+            "    </meta>\n   </metas>\n  </scene>\n".format(
+                k + 1, k // max(scenes_per_sequence, 1) + 1
+            )
+        )
+
+        for panel_id in panel_ids[k]:
+            columns = ["ATV-{}".format(uid()) for _ in range(layers)]
+            write(
+                '  <scene name="panel" id="{}" nbframes="{}">\n   <columns>\n'.format(
+                    panel_id, PANEL_LENGTH
+                )
+            )
+            for column in columns:
+                write(
+                    '    <column type="0" name="{}" id="1"><elementSeq '
+                    'exposures="1-{}" val="{}" id="1"/></column>\n'.format(
+                        column, PANEL_LENGTH, next(drawings)
+                    )
+                )
+            write('   </columns>\n   <rootgroup name="Top">\n    <nodeslist>\n')
+            write(
+                '     <module type="PEG" name="Group"><options><collapsed '
+                'val="false"/></options><attrs>{}<drawing><element col=""/>'
+                "</drawing></attrs></module>\n".format(attrs_xml)
+            )
+            for l, column in enumerate(columns):
+                write(
+                    '     <module type="READ" name="Layer{}"><options><collapsed '
+                    'val="false"/></options><attrs>{}<drawing><element col="{}"/>'
+                    "</drawing></attrs></module>\n".format(l + 1, attrs_xml, column)
+                )
+            write("    </nodeslist>\n    <linkedlist>\n")
+            for l in range(layers):
+                write('     <link out="Group" in="Layer{}"/>\n'.format(l + 1))
+            write("    </linkedlist>\n   </rootgroup>\n")
+            write(
+                '   <metas>\n    <meta type="panelInfo" name="panelInfo"/>\n'
+                "   </metas>\n  </scene>\n"
+            )
+
+    # Video clips
+    for k, clip_id in enumerate(clip_ids):
+        write(
+            '  <scene name="Clip" id="{}" nbframes="{}">\n   <columns>\n'
+            '    <column type="0" name="ATV-{}" id="1"><movieSeqExp '
+            'exposures="1-{}" val="{}" id="2"/></column>\n'
+            "   </columns>\n  </scene>\n".format(
+                clip_id, CLIP_LENGTH, uid(), CLIP_LENGTH, clip_names[k]
+            )
+        )
+
+    write(" </scenes>\n")
+    write(
+        ' <metas>\n  <meta type="string" name="projectTitle">\n'
+        '   <string value="Synthetic project"/>\n  </meta>\n'
+        '  <meta type="bool" name="sequenceExists">\n   <bool value="true"/>\n'
+        "  </meta>\n </metas>\n</project>\n"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("output", help="Path of the .sboard file to write")
+
+    for name, default in (
+        ("scenes", 10),
+        ("panels", 10),
+        ("layers", 4),
+        ("audio-tracks", 2),
+        ("library", 100),
+        ("video-clips", 10),
+        ("transitions", 5),
+        ("attrs", 20),
+    ):
+        parser.add_argument("--" + name, type=int, default=default)
+
+    args = parser.parse_args()
+
+    with open(args.output, "w") as fp:
+        generate(
+            fp,
+            scenes=args.scenes,
+            panels=args.panels,
+            layers=args.layers,
+            audio_tracks=args.audio_tracks,
+            library=args.library,
+            video_clips=args.video_clips,
+            transitions=args.transitions,
+            attrs=args.attrs,
+        )
+
+
+if __name__ == "__main__":
+    main()
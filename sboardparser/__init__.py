@@ -1,6 +1,16 @@
 
 """A parser for Toon Boom Story Board Pro .sboard files"""
 
+from .aio import aparse
+from .batch import ParseResult
+from .batch import parse_many
+from .cache import ProjectCache
+from .cache import SnapshotCache
+from .parser import SECTIONS
 from .parser import SBoardProject
+from .parser import SBoardSectionError
+from .parser import SBoardSlimReport
+from .stats import SBoardStats
 
 parse = SBoardProject.from_file
+iter_project = SBoardProject.iter_file
@@ -0,0 +1,141 @@
+"""
+Command line tool of the parser.
+Extracts plain values from .sboard files and directories of .sboard files,
+parsed over a pool of processes, and writes them to the standard output as
+json lines or csv as soon as each file is parsed.
+
+Usage:
+    python -m sboardparser summary /path/to/boards
+    python -m sboardparser panels board.sboard --format csv
+    python -m sboardparser tracks /path/to/boards --workers 8 --timings
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from . import batch
+from .backends import BACKENDS
+
+# Extract function of each command
+COMMANDS = {
+    "summary": batch.summary,
+    "panels": batch.panels,
+    "library": batch.library,
+    "tracks": batch.tracks,
+}
+
+# Extensions of the files found in directories
+EXTENSIONS = (".sboard", ".sboard.gz")
+
+
+def _board_paths(paths: Iterable[str]) -> Iterator[str]:
+    """Generates the given files and the .sboard files found recursively in
+    the given directories, in name order."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for directory, directories, files in os.walk(path):
+            directories.sort()
+
+            for name in sorted(files):
+                if name.endswith(EXTENSIONS):
+                    yield os.path.join(directory, name)
+
+
+class _RowWriter(object):
+    """Writes the rows of the results to a text file object as json lines or
+    csv. The csv columns are the ones of the first row."""
+
+    def __init__(self, fp, output_format: str):
+        self.__fp = fp
+        self.__format = output_format
+        self.__csv_writer: Optional[csv.DictWriter] = None
+
+    def write(self, rows: List[dict]) -> None:
+        fp = self.__fp
+
+        if self.__format == "jsonl":
+            for row in rows:
+                fp.write(json.dumps(row))
+                fp.write("\n")
+
+        elif rows:
+            if self.__csv_writer is None:
+                self.__csv_writer = csv.DictWriter(
+                    fp, list(rows[0]), extrasaction="ignore"
+                )
+                self.__csv_writer.writeheader()
+            self.__csv_writer.writerows(rows)
+
+        fp.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argument_parser = argparse.ArgumentParser(
+        prog="python -m sboardparser", description=__doc__.split("\n")[1]
+    )
+    argument_parser.add_argument("command", choices=sorted(COMMANDS))
+    argument_parser.add_argument(
+        "paths", nargs="+", help=".sboard files or directories searched recursively"
+    )
+    argument_parser.add_argument(
+        "--format", choices=("jsonl", "csv"), default="jsonl", help="Output format"
+    )
+    argument_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes, defaults to the number of CPUs",
+    )
+    argument_parser.add_argument(
+        "--backend", choices=sorted(BACKENDS), default=None, help="Xml backend"
+    )
+    argument_parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print the parse and extraction times of each file to stderr",
+    )
+    args = argument_parser.parse_args(argv)
+
+    writer = _RowWriter(sys.stdout, args.format)
+    failures = 0
+
+    for result in batch.parse_many(
+        _board_paths(args.paths),
+        workers=args.workers,
+        extract=COMMANDS[args.command],
+        backend=args.backend,
+    ):
+        if args.timings:
+            sys.stderr.write(
+                "{}: parse {:.3f}s, extract {:.3f}s\n".format(
+                    result.path, result.parse_time, result.extract_time
+                )
+            )
+
+        if not result.ok:
+            failures += 1
+            sys.stderr.write(
+                "{}: {}\n".format(result.path, result.error.strip().splitlines()[-1])
+            )
+            continue
+
+        rows = result.value if isinstance(result.value, list) else [result.value]
+        writer.write([dict({"file": result.path}, **row) for row in rows])
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
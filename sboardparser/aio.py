@@ -0,0 +1,64 @@
+"""
+Asyncio helpers for Storyboard Pro projects.
+aparse reads and parses a .sboard file in a thread pool so that the event loop
+is not blocked while large files are parsed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+from typing import Optional
+from typing import Union
+
+from .backends import XMLBackend
+from .parser import SBoardProject
+
+# Maximum number of files parsed at the same time by the default executor
+MAX_CONCURRENCY = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _default_executor() -> ThreadPoolExecutor:
+    """Returns the executor used by aparse, creating it on first use."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENCY, thread_name_prefix="sboardparser"
+            )
+        return _executor
+
+
+async def aparse(
+    sboard_path: str,
+    executor: Optional[Executor] = None,
+    sections: Optional[Iterable[str]] = None,
+    backend: Union[str, XMLBackend, None] = None,
+    slim: bool = False,
+) -> SBoardProject:
+    """Returns a SBoardProject from the given path, parsed in an executor.
+
+    By default, files are parsed in a thread pool of MAX_CONCURRENCY threads,
+    so that at most MAX_CONCURRENCY files are parsed at the same time whatever
+    the number of pending calls. See SBoardProject.from_file for the
+    sections, the backend and slim.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor or _default_executor(),
+        functools.partial(
+            SBoardProject.from_file,
+            sboard_path,
+            sections=sections,
+            backend=backend,
+            slim=slim,
+        ),
+    )
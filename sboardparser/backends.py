@@ -0,0 +1,237 @@
+"""
+XML backends of the parser.
+The object model only accesses the xml tree of a project through the backend
+of the project, which parses the .sboard file and runs the lookups.
+ElementTreeBackend relies on the standard library and is the default.
+LxmlBackend relies on lxml, when it is installed, and evaluates the lookups
+with precompiled XPath expressions.
+"""
+
+from __future__ import annotations
+
+import abc
+import re
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from xml.etree import ElementTree
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+
+class XMLBackend(object):
+    """Abstract class of the xml backends.
+
+    The lookups of the object model are ElementPath expressions made of child
+    steps and attribute predicates, which are also valid XPath expressions.
+    The values compared in predicates are given as variables, such as
+    "./drawings/dwg[@name=$name]" with name="drawing", so that the paths do
+    not depend on the identifiers looked up.
+    """
+
+    __metaclass__ = abc.ABCMeta
+
+    # Name of the backend in BACKENDS
+    name = ""
+
+    @abc.abstractmethod
+    def parse(self, source: Any, target: Any = None) -> Any:
+        """Returns the element tree of the given path or file object, built by
+        the given parser target if any."""
+
+    @abc.abstractmethod
+    def iterparse(self, source: Any, events: Tuple[str, ...]) -> Iterator:
+        """Returns an iterator of the (event, element) pairs of the given path
+        or file object."""
+
+    @abc.abstractmethod
+    def tree_builder(self) -> Any:
+        """Returns a new tree builder, used as the parser target building the
+        elements of the backend."""
+
+    @abc.abstractmethod
+    def element_tree(self, root: Any) -> Any:
+        """Returns the element tree of the given root element."""
+
+    @abc.abstractmethod
+    def find(self, node: Any, path: str, **variables: str) -> Optional[Any]:
+        """Returns the first element matching path from the given node."""
+
+    @abc.abstractmethod
+    def findall(self, node: Any, path: str, **variables: str) -> List[Any]:
+        """Returns all the elements matching path from the given node."""
+
+    def iter(self, node: Any, tag: str) -> Iterator[Any]:
+        """Returns an iterator of the node and its descendants with the given
+        tag."""
+        return node.iter(tag)
+
+
+_VARIABLE = re.compile(r"\$(\w+)")
+
+
+def _quote(value: str) -> str:
+    """Returns the given value as an ElementPath string literal."""
+    return "'{}'".format(value) if "'" not in value else '"{}"'.format(value)
+
+
+class ElementTreeBackend(XMLBackend):
+    """The backend of the xml.etree.ElementTree module of the standard
+    library. Variables are replaced by their quoted value in the paths."""
+
+    name = "etree"
+
+    def parse(self, source: Any, target: Any = None) -> ElementTree.ElementTree:
+        parser = None if target is None else ElementTree.XMLParser(target=target)
+        return ElementTree.parse(source, parser)
+
+    def iterparse(self, source: Any, events: Tuple[str, ...]) -> Iterator:
+        return ElementTree.iterparse(source, events)
+
+    def tree_builder(self) -> ElementTree.TreeBuilder:
+        return ElementTree.TreeBuilder()
+
+    def element_tree(self, root: ElementTree.Element) -> ElementTree.ElementTree:
+        return ElementTree.ElementTree(root)
+
+    @staticmethod
+    def __substitute(path: str, variables: Dict[str, str]) -> str:
+        """Returns the path with its variables replaced by their value."""
+        return _VARIABLE.sub(lambda match: _quote(variables[match.group(1)]), path)
+
+    def find(
+        self, node: Any, path: str, **variables: str
+    ) -> Optional[ElementTree.Element]:
+        if variables:
+            path = self.__substitute(path, variables)
+        return node.find(path)
+
+    def findall(
+        self, node: Any, path: str, **variables: str
+    ) -> List[ElementTree.Element]:
+        if variables:
+            path = self.__substitute(path, variables)
+        return node.findall(path)
+
+
+class LxmlBackend(XMLBackend):
+    """The backend of lxml. Lookups are compiled once into XPath expressions,
+    evaluated with their variables. Comments and processing instructions are
+    dropped while parsing."""
+
+    name = "lxml"
+
+    # Number of compiled expressions kept, the cache is cleared when reached
+    MAX_COMPILED = 1024
+
+    def __init__(self):
+        if lxml_etree is None:
+            raise ImportError("The lxml backend requires lxml to be installed")
+
+        self.__first: Dict[str, Any] = {}
+        self.__all: Dict[str, Any] = {}
+
+    def parse(self, source: Any, target: Any = None) -> Any:
+        parser = lxml_etree.XMLParser(
+            target=target, remove_comments=True, remove_pis=True
+        )
+
+        if target is None:
+            return lxml_etree.parse(source, parser)
+
+        # Parsing with a target returns the result of its close method
+        return lxml_etree.ElementTree(lxml_etree.parse(source, parser))
+
+    def iterparse(self, source: Any, events: Tuple[str, ...]) -> Iterator:
+        return lxml_etree.iterparse(
+            source, events=events, remove_comments=True, remove_pis=True
+        )
+
+    def tree_builder(self) -> Any:
+        return lxml_etree.TreeBuilder()
+
+    def element_tree(self, root: Any) -> Any:
+        return lxml_etree.ElementTree(root)
+
+    def __compile(self, compiled: Dict[str, Any], expression: str, path: str) -> Any:
+        """Returns the compiled XPath expression of the given path."""
+        xpath = compiled.get(path)
+
+        if xpath is None:
+            if len(compiled) >= self.MAX_COMPILED:
+                compiled.clear()
+            xpath = compiled[path] = lxml_etree.XPath(expression)
+
+        return xpath
+
+    @staticmethod
+    def __root(node: Any) -> Any:
+        """Returns the root element of node if it is an element tree, as
+        lookups are relative to the root element like in ElementTree."""
+        if isinstance(node, lxml_etree._ElementTree):
+            return node.getroot()
+        return node
+
+    def find(self, node: Any, path: str, **variables: str) -> Optional[Any]:
+        xpath = self.__compile(self.__first, "({})[1]".format(path), path)
+        result = xpath(self.__root(node), **variables)
+        return result[0] if result else None
+
+    def findall(self, node: Any, path: str, **variables: str) -> List[Any]:
+        xpath = self.__compile(self.__all, path, path)
+        return xpath(self.__root(node), **variables)
+
+    def iter(self, node: Any, tag: str) -> Iterator[Any]:
+        return self.__root(node).iter(tag)
+
+
+BACKENDS = {
+    ElementTreeBackend.name: ElementTreeBackend,
+    LxmlBackend.name: LxmlBackend,
+}
+DEFAULT_BACKEND = ElementTreeBackend.name
+
+# Backends are shared so that the compiled expressions are reused
+_instances: Dict[str, XMLBackend] = {}
+
+
+def get_backend(backend: Union[str, XMLBackend, None] = None) -> XMLBackend:
+    """Returns the backend of the given name among BACKENDS, the default one
+    if None. Backend objects are returned as is.
+
+    Raises:
+        ValueError: If there is no backend of the given name
+        ImportError: If the package required by the backend is not installed
+    """
+    if isinstance(backend, XMLBackend):
+        return backend
+
+    name = DEFAULT_BACKEND if backend is None else backend
+    instance = _instances.get(name)
+
+    if instance is None:
+        if name not in BACKENDS:
+            raise ValueError(
+                "Unknown xml backend {!r}, expected one of {}".format(
+                    name, ", ".join(sorted(BACKENDS))
+                )
+            )
+        instance = _instances[name] = BACKENDS[name]()
+
+    return instance
+
+
+def backend_of(xml_node: Any) -> XMLBackend:
+    """Returns the backend which built the given element or element tree."""
+    if lxml_etree is not None and isinstance(
+        xml_node, (lxml_etree._Element, lxml_etree._ElementTree)
+    ):
+        return get_backend(LxmlBackend.name)
+    return get_backend(ElementTreeBackend.name)
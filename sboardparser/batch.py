@@ -0,0 +1,206 @@
+"""
+Batch parsing of Storyboard Pro projects.
+parse_many parses several .sboard files over a pool of processes and only sends
+back the plain values extracted from each project, so that the xml trees never
+cross process boundaries. summary, panels, library and tracks are extract
+functions returning plain values, used by the command line tool, and
+scene_panels returns the panels of a single scene.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+from .parser import SBoardProject
+from .parser import SBoardScene
+
+
+class ParseResult(NamedTuple):
+    """The outcome of the parsing of a single file by parse_many."""
+
+    path: str
+    value: Any
+    error: Optional[str]
+    # Time in seconds spent parsing the file and extracting the value
+    parse_time: float = 0.0
+    extract_time: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Returns True if the file has been parsed and extracted."""
+        return self.error is None
+
+
+def summary(project: SBoardProject) -> dict:
+    """Returns a summary of the given project made of plain values."""
+    timeline = project.timeline
+    return {
+        "title": project.title,
+        "frame_rate": project.frame_rate,
+        "length": timeline.length,
+        "scenes": sum(1 for _ in timeline.scenes),
+        "panels": sum(1 for _ in timeline.panels),
+        "sequences": sum(1 for _ in project.sequences),
+        "video_tracks": sum(1 for _ in timeline.video_tracks),
+        "audio_tracks": sum(1 for _ in timeline.audio_tracks),
+        "transitions": sum(1 for _ in timeline.transitions),
+        "elements": sum(1 for _ in project.library.elements),
+    }
+
+
+def scene_panels(scene: SBoardScene) -> List[dict]:
+    """Returns the panels of the given scene as plain values."""
+    scene_name = scene.name
+    rows = []
+
+    for panel in scene.panels:
+        start, end = panel.timeline_range
+        rows.append(
+            {
+                "scene": scene_name,
+                "number": panel.number,
+                "uid": panel.uid,
+                "timeline_start": start,
+                "timeline_end": end,
+                "length": panel.length,
+            }
+        )
+
+    return rows
+
+
+def panels(project: SBoardProject) -> List[dict]:
+    """Returns the panels of the given project in timeline order as plain
+    values."""
+    return [row for scene in project.timeline.scenes for row in scene_panels(scene)]
+
+
+def library(project: SBoardProject) -> List[dict]:
+    """Returns the elements of the library of the given project as plain
+    values."""
+    return [
+        {
+            "category": category.uid,
+            "category_name": category.name,
+            "name": element.name,
+            "path": element.path,
+        }
+        for category in project.library.categories
+        for element in category.elements
+    ]
+
+
+def tracks(project: SBoardProject) -> List[dict]:
+    """Returns the clips of the video and audio tracks of the given project
+    as plain values."""
+    timeline = project.timeline
+    rows = []
+
+    for video_track in timeline.video_tracks:
+        for video_clip in video_track.clips:
+            start, end = video_clip.timeline_range
+            element = video_clip.element
+            rows.append(
+                {
+                    "kind": "video",
+                    "track": video_track.name,
+                    "enabled": video_track.is_enabled(),
+                    "clip": video_clip.uid,
+                    "timeline_start": start,
+                    "timeline_end": end,
+                    "path": None if element is None else element.path,
+                }
+            )
+
+    for audio_track in timeline.audio_tracks:
+        for audio_clip in audio_track.clips:
+            start, end = audio_clip.timeline_range
+            rows.append(
+                {
+                    "kind": "audio",
+                    "track": audio_track.name,
+                    "enabled": audio_track.is_enabled(),
+                    "clip": audio_clip.file_name,
+                    "timeline_start": start,
+                    "timeline_end": end,
+                    "path": audio_clip.path,
+                }
+            )
+
+    return rows
+
+
+def _parse_and_extract(
+    path: str, extract: Callable[[SBoardProject], Any], backend: Optional[str]
+) -> ParseResult:
+    """Parses the given file and returns the value extracted from it. Errors
+    are returned instead of being raised."""
+    start = time.perf_counter()
+    parse_time = 0.0
+
+    try:
+        project = SBoardProject.from_file(path, backend=backend)
+        parse_time = time.perf_counter() - start
+        value = extract(project)
+    except Exception:
+        return ParseResult(
+            path, None, traceback.format_exc(), parse_time=parse_time
+        )
+
+    extract_time = time.perf_counter() - start - parse_time
+    return ParseResult(path, value, None, parse_time, extract_time)
+
+
+def parse_many(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    extract: Callable[[SBoardProject], Any] = summary,
+    backend: Optional[str] = None,
+) -> Iterator[ParseResult]:
+    """Parses the given files over a pool of processes and generates a
+    ParseResult for each of them as soon as it is available.
+
+    The extract callable is called in the worker process with the parsed
+    SBoardProject and must return a picklable value. Like the callable itself,
+    it must be picklable, so it has to be defined at module level. An error
+    while parsing or extracting a file is captured in the error of its result
+    and does not stop the other files.
+
+    Args:
+        paths: The paths of the .sboard files
+        workers: The number of processes, defaults to the number of CPUs. With
+            a single worker, files are parsed in the current process.
+        extract: The function returning the value to keep from a project
+        backend: The name of the xml backend, see SBoardProject.from_file
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(paths) <= 1:
+        for path in paths:
+            yield _parse_and_extract(path, extract, backend)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        futures = {
+            executor.submit(_parse_and_extract, path, extract, backend): path
+            for path in paths
+        }
+
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception:
+                # The result or the extract function could not be pickled
+                yield ParseResult(futures[future], None, traceback.format_exc())
@@ -0,0 +1,495 @@
+"""
+Caches of parsed Storyboard Pro projects.
+The SnapshotCache class stores on disk a compact snapshot of the part of the
+.sboard file read by the object model, so that unchanged files can be loaded
+again without parsing the whole xml content.
+The ProjectCache class keeps parsed projects in memory for long running
+processes opening the same files repeatedly.
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import io
+import os
+import struct
+import threading
+import zlib
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from xml.etree import ElementTree
+
+from .backends import XMLBackend
+from .backends import get_backend
+from .parser import SBoardProject
+from .parser import _ModelTreeBuilder
+
+
+def _default_cache_dir() -> str:
+    """Returns the default directory of the snapshot cache."""
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(root, "sboardparser")
+
+
+class SnapshotCache(object):
+    """An on-disk cache of parsed projects.
+
+    Each snapshot holds the nodes of the .sboard file read by the object model
+    (see parser._MODEL_NODES) as compressed xml, which does not depend on the
+    backend. The projects returned by the cache are built by the given
+    backend, see SBoardProject.from_file, and their xml_node only contain
+    those nodes. Snapshots are always built with the standard library, so a
+    miss costs an ElementTree parse whatever the backend, followed by a parse
+    of the snapshot with other backends.
+
+    A snapshot is keyed by the real path of the .sboard file and is valid
+    while the size and modification time of the file are unchanged. When they
+    differ, the content hash of the file is compared before reparsing.
+    Least recently used snapshots are evicted when the total size of the
+    cache exceeds max_size bytes.
+    """
+
+    MAGIC = b"SBSNAP01"
+    EXTENSION = ".sbsnap"
+
+    # magic, file size, file mtime in ns, sha256 digest of the file
+    __HEADER = struct.Struct("<8sQQ32s")
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size: int = 256 << 20,
+        backend: Union[str, XMLBackend, None] = None,
+    ):
+        self.__cache_dir = cache_dir or _default_cache_dir()
+        self.__max_size = max_size
+        self.__backend = get_backend(backend)
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    @property
+    def cache_dir(self) -> str:
+        """Returns the directory where snapshots are stored."""
+        return self.__cache_dir
+
+    @property
+    def max_size(self) -> int:
+        """Returns the maximum size of the cache in bytes."""
+        return self.__max_size
+
+    @property
+    def backend(self) -> XMLBackend:
+        """Returns the xml backend of the projects returned by the cache."""
+        return self.__backend
+
+    @property
+    def hits(self) -> int:
+        """Returns the number of projects loaded from a snapshot."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """Returns the number of projects which had to be parsed."""
+        return self.__misses
+
+    @property
+    def evictions(self) -> int:
+        """Returns the number of snapshots evicted from the cache."""
+        return self.__evictions
+
+    @property
+    def hit_rate(self) -> float:
+        """Returns the ratio of projects loaded from a snapshot."""
+        total = self.__hits + self.__misses
+        return self.__hits / total if total else 0.0
+
+    def snapshot_path(self, sboard_path: str) -> str:
+        """Returns the path of the snapshot of the given .sboard file."""
+        real_path = os.path.realpath(sboard_path)
+        key = hashlib.sha1(real_path.encode("utf-8")).hexdigest()
+        return os.path.join(self.__cache_dir, key + self.EXTENSION)
+
+    def parse(self, sboard_path: str) -> SBoardProject:
+        """Returns a SBoardProject from the given path, loading it from its
+        snapshot when it is still valid."""
+        snapshot_path = self.snapshot_path(sboard_path)
+        stat = os.stat(sboard_path)
+        snapshot = self.__read(snapshot_path)
+        digest = None
+
+        if snapshot is not None:
+            header, payload = snapshot
+            _, size, mtime_ns, snapshot_digest = header
+
+            valid = size == stat.st_size and mtime_ns == stat.st_mtime_ns
+
+            if not valid:
+                # The file may have been touched without being modified
+                digest = self.__digest(sboard_path)
+                valid = digest == snapshot_digest
+
+                if valid:
+                    self.__write(snapshot_path, stat, digest, payload)
+
+            if valid:
+                self.__hits += 1
+
+                try:
+                    os.utime(snapshot_path)
+                except OSError:
+                    # The snapshot was evicted by another process meanwhile,
+                    # its content is still valid
+                    pass
+
+                return self.__load(zlib.decompress(payload))
+
+        self.__misses += 1
+
+        with open(sboard_path, "rb") as sboard_file:
+            data = sboard_file.read()
+
+        if digest is None:
+            digest = hashlib.sha256(data).digest()
+
+        # Only the nodes of the model are built while parsing
+        parser = ElementTree.XMLParser(
+            target=_ModelTreeBuilder(ElementTree.TreeBuilder())
+        )
+        parser.feed(data)
+        root = parser.close()
+
+        data = ElementTree.tostring(root)
+        self.__write(snapshot_path, stat, digest, zlib.compress(data))
+        self.__evict()
+
+        return self.__load(data, root)
+
+    def clear(self) -> None:
+        """Removes all the snapshots from the cache."""
+        for path, _, _ in self.__entries():
+            os.remove(path)
+
+    def __load(
+        self, data: bytes, root: Optional[ElementTree.Element] = None
+    ) -> SBoardProject:
+        """Returns the project of the given snapshot content, built by the
+        backend of the cache. The ElementTree root of the content is reused
+        if given and the backend is the standard library."""
+        backend = self.__backend
+
+        if root is not None and backend.name == "etree":
+            tree = backend.element_tree(root)
+        else:
+            tree = backend.parse(io.BytesIO(data))
+
+        return SBoardProject(tree, backend=backend)
+
+    @staticmethod
+    def __digest(sboard_path: str) -> bytes:
+        """Returns the content hash of the given file."""
+        digest = hashlib.sha256()
+
+        with open(sboard_path, "rb") as sboard_file:
+            for chunk in iter(lambda: sboard_file.read(1 << 20), b""):
+                digest.update(chunk)
+
+        return digest.digest()
+
+    def __read(self, snapshot_path: str) -> Optional[Tuple[tuple, bytes]]:
+        """Returns the header and the payload of the given snapshot or None if
+        there is no usable snapshot."""
+        try:
+            with open(snapshot_path, "rb") as snapshot_file:
+                data = snapshot_file.read()
+        except OSError:
+            return None
+
+        if len(data) < self.__HEADER.size:
+            return None
+
+        header = self.__HEADER.unpack_from(data)
+
+        if header[0] != self.MAGIC:
+            return None
+
+        return header, data[self.__HEADER.size :]
+
+    def __write(
+        self, snapshot_path: str, stat: os.stat_result, digest: bytes, payload: bytes
+    ) -> None:
+        """Writes atomically the snapshot of a file."""
+        os.makedirs(self.__cache_dir, exist_ok=True)
+        header = self.__HEADER.pack(
+            self.MAGIC, stat.st_size, stat.st_mtime_ns, digest
+        )
+
+        tmp_path = "{}.{}.tmp".format(snapshot_path, os.getpid())
+        with open(tmp_path, "wb") as snapshot_file:
+            snapshot_file.write(header)
+            snapshot_file.write(payload)
+        os.replace(tmp_path, snapshot_path)
+
+    def __entries(self) -> List[Tuple[str, int, int]]:
+        """Returns the path, size and last use time of all the snapshots."""
+        try:
+            names = os.listdir(self.__cache_dir)
+        except OSError:
+            return []
+
+        entries = []
+
+        for name in names:
+            if not name.endswith(self.EXTENSION):
+                continue
+            path = os.path.join(self.__cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime_ns))
+
+        return entries
+
+    def __evict(self) -> None:
+        """Removes the least recently used snapshots until the cache fits in
+        its maximum size."""
+        entries = self.__entries()
+        total = sum(size for _, size, _ in entries)
+
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.__max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.__evictions += 1
+
+
+class _CachedProject(NamedTuple):
+    """A project of the ProjectCache with the state of its file."""
+
+    # Size and modification time in ns of the file when it was parsed
+    signature: Tuple[int, int]
+    project: SBoardProject
+
+
+def _signature(path: str) -> Optional[Tuple[int, int]]:
+    """Returns the size and modification time in ns of the given file or None
+    if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return stat.st_size, stat.st_mtime_ns
+
+
+class _ParseLock(object):
+    """The lock held while parsing a file of the ProjectCache, with the number
+    of threads using it."""
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+class ProjectCache(object):
+    """An in-memory cache of parsed projects.
+
+    Projects are keyed by the real path of their .sboard file. The size and
+    modification time of the file are checked on each access and the file is
+    parsed again when they changed. The new project then replaces the old one
+    atomically: the callers which got the old project keep using it
+    unchanged, the following calls get the new one.
+
+    Least recently used projects are evicted when there are more than
+    max_projects projects or when the total size of their files exceeds
+    max_size bytes. max_size bounds the size on disk of the .sboard files,
+    not the memory used by the projects, which grows with it: a full project
+    takes many times the size of its file. The projects are parsed with the
+    given sections, backend and slim option, see SBoardProject.from_file.
+    Slim projects use much less memory than their file size, so max_size can
+    be raised accordingly.
+
+    The cache can be shared between threads. A file is parsed by one thread
+    at a time, the other threads requesting it wait for the result.
+    """
+
+    def __init__(
+        self,
+        max_projects: int = 16,
+        max_size: int = 1 << 30,
+        sections: Optional[Iterable[str]] = None,
+        backend: Union[str, XMLBackend, None] = None,
+        slim: bool = False,
+    ):
+        self.__max_projects = max_projects
+        self.__max_size = max_size
+        self.__sections = sections
+        self.__backend = backend
+        self.__slim = slim
+        self.__projects: collections.OrderedDict[str, _CachedProject] = (
+            collections.OrderedDict()
+        )
+        self.__size = 0
+        self.__lock = threading.Lock()
+        # Locks of the files being parsed, by real path
+        self.__parse_locks: Dict[str, _ParseLock] = {}
+        self.__hits = 0
+        self.__misses = 0
+        self.__reloads = 0
+        self.__evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.__projects)
+
+    @property
+    def max_projects(self) -> int:
+        """Returns the maximum number of projects in the cache."""
+        return self.__max_projects
+
+    @property
+    def max_size(self) -> int:
+        """Returns the maximum total size in bytes on disk of the files of the
+        projects in the cache."""
+        return self.__max_size
+
+    @property
+    def size(self) -> int:
+        """Returns the total size in bytes on disk of the files of the
+        projects in the cache."""
+        return self.__size
+
+    @property
+    def hits(self) -> int:
+        """Returns the number of projects returned from the cache."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """Returns the number of projects which had to be parsed."""
+        return self.__misses
+
+    @property
+    def reloads(self) -> int:
+        """Returns the number of projects parsed again because their file
+        changed, counted among the misses."""
+        return self.__reloads
+
+    @property
+    def evictions(self) -> int:
+        """Returns the number of projects evicted from the cache."""
+        return self.__evictions
+
+    @property
+    def hit_rate(self) -> float:
+        """Returns the ratio of projects returned from the cache."""
+        total = self.__hits + self.__misses
+        return self.__hits / total if total else 0.0
+
+    def parse(self, sboard_path: str) -> SBoardProject:
+        """Returns the SBoardProject of the given path, parsing the file if it
+        is not in the cache or if it changed since it was parsed."""
+        key = os.path.realpath(sboard_path)
+        # The file is checked without holding the lock of the cache
+        signature = _signature(key)
+
+        with self.__lock:
+            project = self.__get(key, signature)
+            if project is not None:
+                return project
+
+            parse_lock = self.__parse_locks.get(key)
+            if parse_lock is None:
+                parse_lock = self.__parse_locks[key] = _ParseLock()
+            parse_lock.users += 1
+
+        try:
+            with parse_lock.lock:
+                return self.__parse(key)
+        finally:
+            with self.__lock:
+                parse_lock.users -= 1
+                # The lock is dropped once no thread uses it anymore
+                if parse_lock.users == 0:
+                    del self.__parse_locks[key]
+
+    def __parse(self, key: str) -> SBoardProject:
+        """Returns the SBoardProject of the given real path, parsing the file
+        unless another thread did while waiting. Must be called with the
+        parse lock of the file held."""
+        stat = os.stat(key)
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        with self.__lock:
+            project = self.__get(key, signature)
+            if project is not None:
+                return project
+
+        project = SBoardProject.from_file(
+            key,
+            sections=self.__sections,
+            backend=self.__backend,
+            slim=self.__slim,
+        )
+
+        with self.__lock:
+            self.__misses += 1
+            old = self.__projects.pop(key, None)
+
+            if old is not None:
+                self.__reloads += 1
+                self.__size -= old.signature[0]
+
+            self.__projects[key] = _CachedProject(signature, project)
+            self.__size += stat.st_size
+            self.__evict()
+
+        return project
+
+    def clear(self) -> None:
+        """Removes all the projects from the cache."""
+        with self.__lock:
+            self.__projects.clear()
+            self.__size = 0
+
+    def __get(
+        self, key: str, signature: Optional[Tuple[int, int]]
+    ) -> Optional[SBoardProject]:
+        """Returns the cached project of the given real path if its file still
+        has the given signature, counting the hit. Must be called with the
+        lock held."""
+        cached = self.__projects.get(key)
+
+        if cached is None or cached.signature != signature:
+            return None
+
+        self.__projects.move_to_end(key)
+        self.__hits += 1
+        return cached.project
+
+    def __evict(self) -> None:
+        """Removes the least recently used projects until the cache fits in
+        its limits, keeping at least the most recent one. Must be called with
+        the lock held."""
+        projects = self.__projects
+
+        while len(projects) > 1 and (
+            len(projects) > self.__max_projects or self.__size > self.__max_size
+        ):
+            key, cached = projects.popitem(last=False)
+            self.__size -= cached.signature[0]
+            self.__evictions += 1
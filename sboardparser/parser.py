@@ -7,32 +7,84 @@ given sboard file path.
 from __future__ import annotations
 
 import abc
+import asyncio
+import bisect
+import collections
+import contextlib
+import functools
+import gzip
+import hashlib
+import heapq
+import io
+import itertools
+import json
 import os
+import sys
+import weakref
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO
+from typing import Any
+from typing import AsyncIterator
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
 from typing import Iterator
+from typing import List
+from typing import NamedTuple
 from typing import Optional
+from typing import Set
 from typing import Tuple
-from xml.etree import cElementTree
+from typing import Type
+from typing import TypeVar
+from typing import Union
+from xml.etree import ElementTree
+
+from .backends import XMLBackend
+from .backends import backend_of
+from .backends import get_backend
+from .records import ProjectRecord
+from .records import materialize
+from .stats import SBoardStats
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 def _get_timeline(
-    scene_node: cElementTree.Element,
-) -> cElementTree.Element:
+    project: SBoardProject, scene_node: ElementTree.Element
+) -> ElementTree.Element:
     assert scene_node.attrib["name"] != "Top"
 
     # Shot timeline is described in the column with type=0
-    columns = scene_node.find("columns")
+    columns = project._find("columns", scene_node)
     assert columns is not None
-    return next(c for c in columns.findall("column") if c.attrib["type"] == "0")
+    column_nodes = project._findall("column", columns)
+    return next(
+        c
+        for c in project._scan(column_nodes, "_get_timeline")
+        if c.attrib["type"] == "0"
+    )
 
 
-def _get_timeline_range(
-    timeline_node: cElementTree.Element, uid: str
-) -> Tuple[int, int]:
-    warp_seq = next(
-        ws for ws in timeline_node.iter("warpSeq") if ws.attrib["id"] == uid
-    )
+# Number of items generated by the async iterators before yielding control to
+# the event loop
+ASYNC_BATCH_SIZE = 64
+
+
+async def _aiterate(iterator: Iterator, batch_size: int) -> AsyncIterator:
+    """Generates the items of the given iterator, yielding control to the
+    event loop every batch_size items."""
+    for count, item in enumerate(iterator, 1):
+        yield item
+
+        if count % batch_size == 0:
+            await asyncio.sleep(0)
 
-    exposure = warp_seq.attrib["exposures"]
+
+def _parse_exposures(exposure: str) -> Tuple[int, int]:
     ex_split = exposure.split("-")
 
     if len(ex_split) == 1:
@@ -41,27 +93,895 @@ def _get_timeline_range(
     return int(ex_split[0]), int(ex_split[1])
 
 
+# Nodes read by the object model, by tag. A dict value lists the children to
+# keep under the node, None keeps the whole subtree.
+_MODEL_NODES = {
+    "elements": {"element": {"drawings": {"dwg": None}}},
+    "options": None,
+    "metas": None,
+    "scenes": {
+        "scene": {
+            "columns": {"column": None},
+            "rootgroup": {
+                "nodeslist": {
+                    "module": {
+                        "attrs": {"drawing": {"element": None}},
+                        "options": {"disabled": None},
+                    }
+                },
+                "linkedlist": {"link": None},
+            },
+            "metas": {"meta": {"sceneInfo": None}},
+        }
+    },
+}
+
+
+# Nodes kept by the slim projects (see SBoardProject.from_file), a subset of
+# _MODEL_NODES without the options and metas of the project which are not read
+_SLIM_NODES = dict(
+    _MODEL_NODES,
+    options={"framerate": None},
+    metas={"meta": {"string": None, "bool": None}},
+)
+
+# Attributes kept by the slim projects by tag. All the attributes of the other
+# tags are kept, as the clip columns of the timeline may hold any kind of
+# sequence.
+_SLIM_ATTRIBUTES = {
+    "project": frozenset(),
+    "element": frozenset(("id", "elementName", "elementFolder", "rootFolder", "col")),
+    "dwg": frozenset(("name",)),
+    "framerate": frozenset(("val",)),
+    "meta": frozenset(("name",)),
+    "string": frozenset(("value",)),
+    "bool": frozenset(("value",)),
+    "scene": frozenset(("name", "id", "nbframes")),
+    "column": frozenset(("type", "name", "disabled")),
+    "warpSeq": frozenset(("exposures", "id", "start", "end")),
+    "transitionSeq": frozenset(("exposures", "id", "type")),
+    "soundSequence": frozenset(
+        ("name", "startFrame", "stopFrame", "clippingTimeStart", "clippingTimeStop")
+    ),
+    "elementSeq": frozenset(("id", "val")),
+    "movieSeqExp": frozenset(("id", "val")),
+    "rootgroup": frozenset(),
+    "module": frozenset(("name", "type")),
+    "disabled": frozenset(("val",)),
+    "link": frozenset(("in", "out")),
+    "sceneInfo": frozenset(("name", "sequenceName")),
+}
+
+
+class SBoardSlimReport(NamedTuple):
+    """What was dropped while parsing a slim project (see
+    SBoardProject.from_file)."""
+
+    # Number of elements which were not built
+    elements: int
+    # Number of attributes dropped from the elements which were built
+    attributes: int
+    # Size in bytes of the attributes dropped from the elements which were
+    # built, as measured by sys.getsizeof. The elements which were not built
+    # are only counted, measuring them would slow the parse down, so this is
+    # a lower bound of the memory saved.
+    bytes: int
+
+
+class _ModelTreeBuilder:
+    """Parser target building only the nodes read by the object model, listed
+    in _MODEL_NODES. The other subtrees are skipped without creating any
+    element.
+
+    When slim is True, only the nodes of _SLIM_NODES and the attributes of
+    _SLIM_ATTRIBUTES are built and what was dropped is counted in report.
+    The skipped subtrees are walked by start and end for every element they
+    hold, which is why they do nothing but count.
+    """
+
+    def __init__(self, builder, slim: bool = False):
+        self.__builder = builder
+        self.__nodes = _SLIM_NODES if slim else _MODEL_NODES
+        self.__slim = slim
+        # Specs of the children of the nodes being built, from the root node
+        self.__specs: List[Optional[dict]] = []
+        # Depth of the subtree being skipped, 0 when building
+        self.__skipped = 0
+        self.__elements = 0
+        self.__attributes = 0
+        self.__bytes = 0
+
+    @property
+    def report(self) -> SBoardSlimReport:
+        """Returns what was dropped so far."""
+        return SBoardSlimReport(self.__elements, self.__attributes, self.__bytes)
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if self.__skipped:
+            self.__skipped += 1
+            self.__elements += 1
+            return
+
+        specs = self.__specs
+
+        if not specs:
+            specs.append(self.__nodes)
+        else:
+            spec = specs[-1]
+
+            if spec is None:
+                specs.append(None)
+            elif tag in spec:
+                specs.append(spec[tag])
+            else:
+                self.__skipped = 1
+                self.__elements += 1
+                return
+
+        if self.__slim:
+            kept = _SLIM_ATTRIBUTES.get(tag)
+
+            if kept is not None and len(attrib) > len(kept.intersection(attrib)):
+                slim_attrib = {}
+
+                for name, value in attrib.items():
+                    if name in kept:
+                        slim_attrib[name] = value
+                    else:
+                        self.__attributes += 1
+                        self.__bytes += sys.getsizeof(value)
+
+                self.__bytes += sys.getsizeof(attrib) - sys.getsizeof(slim_attrib)
+                attrib = slim_attrib
+
+        self.__builder.start(tag, attrib)
+
+    def end(self, tag: str) -> None:
+        if self.__skipped:
+            self.__skipped -= 1
+        else:
+            self.__specs.pop()
+            self.__builder.end(tag)
+
+    def close(self):
+        return self.__builder.close()
+
+
+def _canonical_parts(
+    node: ElementTree.Element, spec: Optional[dict], parts: List[str]
+) -> None:
+    """Appends to parts the canonical form of the given subtree, whose
+    children are listed in spec as in _SLIM_NODES, None meaning all of them.
+
+    Only the nodes of spec and the attributes of _SLIM_ATTRIBUTES are
+    included, which are what the object model reads. The canonical form
+    thus does not depend on how the project was loaded, nor on the order of
+    the attributes, the text content or the whitespaces.
+    """
+    tag = node.tag
+    parts.append("<" + tag)
+    attrib = node.attrib
+    kept = _SLIM_ATTRIBUTES.get(tag)
+
+    for key in sorted(attrib):
+        if kept is None or key in kept:
+            parts.append("{}={}".format(key, attrib[key]))
+
+    for child in node:
+        if spec is None:
+            _canonical_parts(child, None, parts)
+        elif child.tag in spec:
+            _canonical_parts(child, spec[child.tag], parts)
+
+    parts.append(">")
+
+
+def _subtree_hash(*subtrees: Tuple[ElementTree.Element, Optional[dict]]) -> str:
+    """Returns the content hash of the canonical form of the given subtrees,
+    given as (node, spec) pairs, see _canonical_parts."""
+    parts: List[str] = []
+
+    for node, spec in subtrees:
+        _canonical_parts(node, spec, parts)
+
+    # Xml content cannot hold NUL characters, so it safely separates parts
+    content = "\x00".join(parts).encode("utf-8")
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+# Specs of the subtrees hashed by the fingerprints, see _canonical_parts. The
+# modules of the scenes are not read, only those of the panels and the Top
+# scene, see _SectionTreeBuilder.
+_PANEL_SPEC = _SLIM_NODES["scenes"]["scene"]
+_SCENE_SPEC = {tag: spec for tag, spec in _PANEL_SPEC.items() if tag != "rootgroup"}
+_MODULE_SPEC = _PANEL_SPEC["rootgroup"]["nodeslist"]["module"]
+_CATEGORY_SPEC = _SLIM_NODES["elements"]["element"]
+
+
+# Magic numbers of the compressed boards, see _open_board
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZIP_MAGIC = b"PK\x03\x04"
+
+
+def _peek(stream: IO[bytes], size: int) -> Tuple[IO[bytes], bytes]:
+    """Returns the stream with its first size bytes, which are not consumed.
+    Streams which can neither seek nor peek are wrapped in a buffered
+    reader."""
+    if hasattr(stream, "peek"):
+        return stream, stream.peek(size)[:size]
+
+    if stream.seekable():
+        position = stream.tell()
+        data = stream.read(size)
+        stream.seek(position)
+        return stream, data
+
+    stream = io.BufferedReader(stream)
+    return stream, stream.peek(size)[:size]
+
+
+@contextlib.contextmanager
+def _open_board(source: Any) -> Iterator[Any]:
+    """Returns a context manager of the source to parse for the given path or
+    binary file object.
+
+    Gzip compressed boards are decompressed while they are parsed and the
+    first .sboard member of zip archives is read from the archive, without
+    temporary files. The paths of uncompressed boards are returned as is so
+    that the backend reads the file itself.
+    """
+    with contextlib.ExitStack() as stack:
+        if isinstance(source, (str, bytes, os.PathLike)):
+            with open(source, "rb") as fp:
+                magic = fp.read(len(_ZIP_MAGIC))
+
+            if not magic.startswith(_GZIP_MAGIC) and magic != _ZIP_MAGIC:
+                yield source
+                return
+
+            stream = stack.enter_context(open(source, "rb"))
+        else:
+            stream, magic = _peek(source, len(_ZIP_MAGIC))
+
+        if magic.startswith(_GZIP_MAGIC):
+            stream = stack.enter_context(gzip.GzipFile(fileobj=stream, mode="rb"))
+
+        elif magic == _ZIP_MAGIC:
+            # The central directory of zip archives is at the end of the file
+            if not stream.seekable():
+                stream = io.BytesIO(stream.read())
+
+            archive = stack.enter_context(zipfile.ZipFile(stream))
+            names = [name for name in archive.namelist() if name.endswith(".sboard")]
+
+            if not names:
+                raise ValueError("There is no .sboard file in the zip archive")
+
+            stream = stack.enter_context(archive.open(names[0]))
+
+        yield stream
+
+
+# Sections of a project which can be loaded separately, see
+# SBoardProject.from_file
+SECTIONS = ("timeline", "library", "scenes_meta", "panels", "layers")
+
+# Sections required by each section
+_SECTION_DEPENDENCIES = {
+    "scenes_meta": ("timeline",),
+    "panels": ("scenes_meta",),
+    "layers": ("panels",),
+}
+
+
+class SBoardSectionError(LookupError):
+    """Raised when accessing a section of a project which was not loaded."""
+
+
+def _resolve_sections(sections: Iterable[str]) -> FrozenSet[str]:
+    """Returns the given sections with the sections they depend on."""
+    resolved = set()
+    pending = list(sections)
+
+    while pending:
+        section = pending.pop()
+
+        if section not in SECTIONS:
+            raise ValueError(
+                "Unknown section {!r}, expected one of {}".format(section, SECTIONS)
+            )
+
+        if section not in resolved:
+            resolved.add(section)
+            pending.extend(_SECTION_DEPENDENCIES.get(section, ()))
+
+    return frozenset(resolved)
+
+
+class _SectionTreeBuilder:
+    """Parser target building only the nodes of the given sections.
+
+    The subtrees of the other sections are skipped without creating any
+    element. Text content is never read by the object model and is dropped.
+    """
+
+    def __init__(self, sections: FrozenSet[str], builder):
+        self.__builder = builder
+        self.__sections = sections
+        self.__depth = 0
+        # Depth of the subtree being skipped, 0 when building
+        self.__skipped = 0
+        self.__scene_section = None
+
+    def __is_loaded(self, tag: str, attrib: Dict[str, str]) -> bool:
+        """Returns True if the node starting at the current depth is loaded."""
+        depth = self.__depth
+
+        if depth == 2:
+            return tag != "elements" or "library" in self.__sections
+
+        if depth == 3 and tag == "scene":
+            name = attrib.get("name", "")
+
+            if name == "Top":
+                section = "timeline"
+            elif "shot" in name:
+                section = "scenes_meta"
+            elif "panel" in name:
+                section = "panels"
+            else:
+                # Video clips
+                section = "timeline"
+
+            self.__scene_section = section
+            return section in self.__sections
+
+        if depth == 4 and tag == "rootgroup":
+            # Only the layers of panels and the tracks of the timeline are read
+            section = self.__scene_section
+
+            if section == "panels":
+                return "layers" in self.__sections
+
+            return section == "timeline"
+
+        return True
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        self.__depth += 1
+
+        if self.__skipped:
+            self.__skipped += 1
+        elif self.__is_loaded(tag, attrib):
+            self.__builder.start(tag, attrib)
+        else:
+            self.__skipped = 1
+
+    def end(self, tag: str) -> None:
+        self.__depth -= 1
+
+        if self.__skipped:
+            self.__skipped -= 1
+        else:
+            self.__builder.end(tag)
+
+    def close(self) -> ElementTree.Element:
+        return self.__builder.close()
+
+
+# Fields of the structured arrays returned by to_arrays, without the uid
+_SCENE_FIELDS = [
+    ("clip_start", "i8"),
+    ("clip_end", "i8"),
+    ("timeline_start", "i8"),
+    ("timeline_end", "i8"),
+    ("length", "i8"),
+]
+_PANEL_FIELDS = [
+    ("scene", "i8"),
+    ("scene_start", "i8"),
+    ("scene_end", "i8"),
+    ("clip_start", "i8"),
+    ("clip_end", "i8"),
+    ("timeline_start", "i8"),
+    ("timeline_end", "i8"),
+    ("length", "i8"),
+]
+_TRANSITION_FIELDS = [
+    ("timeline_start", "i8"),
+    ("timeline_end", "i8"),
+    ("type", "O"),
+]
+
+
+def _to_array(rows: List[tuple], fields: List[Tuple[str, str]]):
+    """Returns a structured numpy array from the given rows, the first value
+    of each row being the uid."""
+    if numpy is None:
+        raise ImportError("numpy is required to export arrays")
+
+    uid_length = max((len(row[0]) for row in rows), default=1)
+    dtype = [("uid", "U{}".format(uid_length))] + fields
+    return numpy.array(rows, dtype=dtype)
+
+
+class _EditEvent(NamedTuple):
+    """An event of the editorial exports of a timeline. Frames are counted from
+    0 at the first frame of the timeline and the out frames are excluded."""
+
+    # "clip" or "transition"
+    kind: str
+    # EDL channel of the event: V for video, A, A2... for audio
+    channel: str
+    name: str
+    uid: str
+    source_in: int
+    record_in: int
+    record_out: int
+    path: Optional[str]
+
+
+def _timecode(frame: int, rate: int) -> str:
+    """Returns the non drop frame timecode of the given frame."""
+    seconds, frames = divmod(frame, rate)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return "{:02d}:{:02d}:{:02d}:{:02d}".format(hours, minutes, seconds, frames)
+
+
+def _otio_range(start: int, duration: int, rate: float) -> dict:
+    """Returns the OpenTimelineIO time range of the given frames."""
+    return {
+        "OTIO_SCHEMA": "TimeRange.1",
+        "start_time": {"OTIO_SCHEMA": "RationalTime.1", "rate": rate, "value": start},
+        "duration": {"OTIO_SCHEMA": "RationalTime.1", "rate": rate, "value": duration},
+    }
+
+
+def _otio_clip(event: _EditEvent, rate: float) -> dict:
+    """Returns the OpenTimelineIO clip of the given event."""
+    if event.path is None:
+        media_reference = {"OTIO_SCHEMA": "MissingReference.1"}
+    else:
+        media_reference = {
+            "OTIO_SCHEMA": "ExternalReference.1",
+            "target_url": event.path,
+        }
+
+    return {
+        "OTIO_SCHEMA": "Clip.1",
+        "name": event.name,
+        "source_range": _otio_range(
+            event.source_in, event.record_out - event.record_in, rate
+        ),
+        "media_reference": media_reference,
+        "metadata": {"sboard": {"uid": event.uid}},
+    }
+
+
+def _otio_transition(event: _EditEvent, cut: int, rate: float) -> dict:
+    """Returns the OpenTimelineIO transition of the given event at the cut of
+    the given frame."""
+    return {
+        "OTIO_SCHEMA": "Transition.1",
+        "name": event.name,
+        "transition_type": (
+            "SMPTE_Dissolve" if event.name == "dissolve" else "Custom_Transition"
+        ),
+        "in_offset": {
+            "OTIO_SCHEMA": "RationalTime.1",
+            "rate": rate,
+            "value": cut - event.record_in,
+        },
+        "out_offset": {
+            "OTIO_SCHEMA": "RationalTime.1",
+            "rate": rate,
+            "value": event.record_out - cut,
+        },
+        "metadata": {"sboard": {"uid": event.uid}},
+    }
+
+
+def _otio_items(
+    events: Iterable[_EditEvent],
+    transitions: Iterable[_EditEvent],
+    rate: float,
+) -> Iterator[dict]:
+    """Generates the OpenTimelineIO items of a track from its events sorted by
+    record frame, filling the holes with gaps. Each transition is placed at
+    the first cut it overlaps, the others are dropped."""
+    transitions = iter(transitions)
+    transition = next(transitions, None)
+    position = 0
+
+    for event in events:
+        cut = event.record_in
+
+        while transition is not None and transition.record_in < cut:
+            if position > 0 and transition.record_out > cut:
+                yield _otio_transition(transition, cut, rate)
+            transition = next(transitions, None)
+
+        if cut > position:
+            yield {
+                "OTIO_SCHEMA": "Gap.1",
+                "name": "",
+                "source_range": _otio_range(0, cut - position, rate),
+            }
+
+        yield _otio_clip(event, rate)
+        position = event.record_out
+
+
+class _WarpSeq(NamedTuple):
+    """Pre-decoded attributes of a warpSeq node."""
+
+    exposures: Tuple[int, int]
+    start: int
+    end: int
+
+    @classmethod
+    def from_node(cls, node: ElementTree.Element) -> _WarpSeq:
+        """Decodes the given warpSeq node."""
+        attrib = node.attrib
+        return cls(
+            _parse_exposures(attrib["exposures"]),
+            int(attrib["start"]),
+            int(attrib["end"]),
+        )
+
+
+class _SceneTimeline(NamedTuple):
+    """The type 0 column of a scene with its decoded panel warp sequences."""
+
+    column: ElementTree.Element
+    panel_ids: List[str]
+    warps: Dict[str, _WarpSeq]
+    numbers: Dict[str, int]
+
+
+class _LayerGraph(NamedTuple):
+    """The modules of a panel and the links between them, by module name."""
+
+    modules: List[ElementTree.Element]
+    modules_by_name: Dict[str, ElementTree.Element]
+    # Names of the modules linked to each group, in link order
+    children: Dict[str, List[str]]
+    # Name of the group linking to each module
+    parents: Dict[str, str]
+
+
+class _IntervalIndex:
+    """Sorted start index over half-open frame intervals.
+
+    Each interval is stored once, sorted by start, along with the running
+    maximum of their stops. The intervals starting before the end of a range
+    are found by bisecting the starts, and the ones which all stop before its
+    beginning by bisecting the running maximum, so that only the intervals
+    left in between are scanned.
+    """
+
+    def __init__(self, intervals: List[Tuple[int, int, Any]]):
+        # Intervals are (start, stop, item) with stop excluded, empty ones
+        # never match
+        intervals = sorted(
+            (interval for interval in intervals if interval[0] < interval[1]),
+            key=lambda interval: interval[0],
+        )
+        self.__starts = [start for start, _, _ in intervals]
+        self.__stops = [stop for _, stop, _ in intervals]
+        self.__items = [item for _, _, item in intervals]
+        self.__max_stops = list(itertools.accumulate(self.__stops, max))
+
+    def at(self, frame: int) -> List[Any]:
+        """Returns the items active at the given frame."""
+        return self.overlapping(frame, frame + 1)
+
+    def overlapping(self, start: int, stop: int) -> List[Any]:
+        """Returns the items active in the given half-open frame range, in
+        the order of their start."""
+        if stop <= start:
+            return []
+
+        first = bisect.bisect_right(self.__max_stops, start)
+        last = bisect.bisect_left(self.__starts, stop)
+        stops = self.__stops
+        items = self.__items
+
+        return [
+            items[position]
+            for position in range(first, last)
+            if stops[position] > start
+        ]
+
+
+class _SBoardIndex:
+    """Lookup tables built once per project so that ranges and nodes can be
+    retrieved by id without scanning the xml tree."""
+
+    def __init__(
+        self,
+        project: SBoardProject,
+        scene_nodes: Optional[Iterable[ElementTree.Element]] = None,
+    ):
+        self.__project = project
+        self.scene_nodes: Dict[str, ElementTree.Element] = {}
+        self.top: Optional[ElementTree.Element] = None
+
+        # All the warp sequences of the Top scene in timeline order
+        self.top_warp_ids: List[str] = []
+        self.top_warps: Dict[str, _WarpSeq] = {}
+
+        self.__scene_timelines: Dict[str, _SceneTimeline] = {}
+
+        # Interval indices of the timeline elements, built on demand
+        self.frame_index: Optional[Dict[str, _IntervalIndex]] = None
+
+        if scene_nodes is None:
+            for node in project._findall("./scenes/scene"):
+                self.add(node)
+            assert self.top is not None
+        else:
+            for node in scene_nodes:
+                self.add(node)
+
+    def add(self, scene_node: ElementTree.Element) -> None:
+        """Indexes the given node of /project/scenes, which lets a streamed
+        project be indexed while it is parsed."""
+        if self.top is None and scene_node.attrib.get("name") == "Top":
+            self.top = scene_node
+
+            for node in self.__project._iter("warpSeq", scene_node):
+                uid = node.attrib["id"]
+                self.top_warp_ids.append(uid)
+                if uid not in self.top_warps:
+                    self.top_warps[uid] = _WarpSeq.from_node(node)
+
+        self.scene_nodes.setdefault(scene_node.attrib["id"], scene_node)
+
+    def scene_timeline(self, scene_node: ElementTree.Element) -> _SceneTimeline:
+        """Returns the indexed timeline of the given scene node."""
+        uid = scene_node.attrib["id"]
+        timeline = self.__scene_timelines.get(uid)
+
+        if timeline is None:
+            column = _get_timeline(self.__project, scene_node)
+            panel_ids = []
+            warps = {}
+            numbers = {}
+
+            for node in self.__project._findall("warpSeq", column):
+                panel_id = node.attrib["id"]
+                panel_ids.append(panel_id)
+                if panel_id not in warps:
+                    warps[panel_id] = _WarpSeq.from_node(node)
+                    numbers[panel_id] = len(panel_ids)
+
+            timeline = _SceneTimeline(column, panel_ids, warps, numbers)
+            self.__scene_timelines[uid] = timeline
+
+        return timeline
+
+    def forget(self, uid: str) -> None:
+        """Removes the node of the given id and its indexed timeline, once a
+        streamed scene or panel is discarded."""
+        self.scene_nodes.pop(uid, None)
+        self.__scene_timelines.pop(uid, None)
+
+    def scene_rows(
+        self, scene_node: ElementTree.Element, scene_index: int
+    ) -> Tuple[tuple, List[tuple]]:
+        """Returns the array row of the given scene and the array rows of its
+        panels."""
+        uid = scene_node.attrib["id"]
+        warp_seq = self.top_warps[uid]
+        scene_start = warp_seq.exposures[0]
+        scene_row = (
+            uid,
+            warp_seq.start,
+            warp_seq.end,
+            warp_seq.exposures[0],
+            warp_seq.exposures[1],
+            int(scene_node.attrib["nbframes"]),
+        )
+
+        panel_rows = []
+        timeline = self.scene_timeline(scene_node)
+
+        for panel_id in timeline.panel_ids:
+            panel_warp = timeline.warps[panel_id]
+            length = int(self.scene_nodes[panel_id].attrib["nbframes"])
+            start = scene_start + panel_warp.exposures[0]
+            panel_rows.append(
+                (
+                    panel_id,
+                    scene_index,
+                    panel_warp.exposures[0],
+                    panel_warp.exposures[1],
+                    panel_warp.start,
+                    panel_warp.end,
+                    start,
+                    start + length,
+                    length,
+                )
+            )
+
+        return scene_row, panel_rows
+
+
+class _LibraryIndex:
+    """Lookup tables of the library nodes by identifier, built once per
+    project."""
+
+    def __init__(
+        self,
+        project: SBoardProject,
+        library_node: Optional[ElementTree.Element] = None,
+    ):
+        self.__project = project
+        self.categories: Dict[str, ElementTree.Element] = {}
+        self.elements: Dict[Tuple[str, str], ElementTree.Element] = {}
+
+        # The panels and video clips using each element, built on demand
+        self.users: Optional[
+            Dict[Tuple[str, str], Tuple[List[SBoardPanel], List[SBoardVideoClip]]]
+        ] = None
+
+        if library_node is not None:
+            for category_node in project._findall("./element", library_node):
+                self.add(category_node)
+
+    def add(self, category_node: ElementTree.Element) -> None:
+        """Indexes the given category node and its elements, which lets a
+        streamed project be indexed while it is parsed."""
+        category_id = category_node.attrib["id"]
+        self.categories.setdefault(category_id, category_node)
+
+        for node in self.__project._findall("./drawings/dwg", category_node):
+            self.elements.setdefault((category_id, node.attrib["name"]), node)
+
+
+def _cached_property(func):
+    """Decorator of the _SBoardNode properties whose value is computed once
+    per object. The value is stored in the slot of the property, named after
+    it with the _cached_ prefix, which the class declares."""
+    slot = "_cached_" + func.__name__.lstrip("_")
+
+    @functools.wraps(func)
+    def getter(self):
+        try:
+            return getattr(self, slot)
+        except AttributeError:
+            pass
+
+        value = func(self)
+        setattr(self, slot, value)
+        return value
+
+    return property(getter)
+
+
+# The public properties of the object model are timed while the project of
+# their object is instrumented (see SBoardProject.instrument). They are wrapped
+# once when the module is loaded, see _time_properties, and otherwise only cost
+# a check of the statistics of the project.
+
+
+def _timed_property(prop: property, key: str) -> property:
+    """Returns a property calling the getter of the given one, timed as key
+    when the project of the object is instrumented."""
+    fget = prop.fget
+
+    @functools.wraps(fget)
+    def getter(self):
+        stats = self._project._stats
+
+        if stats is None:
+            return fget(self)
+
+        return stats._call(key, fget, self)
+
+    return property(getter)
+
+
+def _model_classes() -> List[type]:
+    """Returns all the classes of the object model."""
+    classes: List[type] = [SBoardSequence]
+    pending: List[type] = [_SBoardNode]
+
+    while pending:
+        subclasses = pending.pop().__subclasses__()
+        classes.extend(subclasses)
+        pending.extend(subclasses)
+
+    return classes
+
+
+def _time_properties() -> None:
+    """Replaces the public properties of the classes of the object model by
+    timed ones. Called once when the module is loaded."""
+    for cls in _model_classes():
+        for name, value in list(vars(cls).items()):
+            if name.startswith("_") or not isinstance(value, property):
+                continue
+            key = "{}.{}".format(cls.__name__, name)
+            setattr(cls, name, _timed_property(value, key))
+
+
+_NodeType = TypeVar("_NodeType", bound="_SBoardNode")
+
+
 class _SBoardNode:
     """Abstract class for all Story Board Pro objects derived from a given
-    xml node of the .sboard file."""
+    xml node of the .sboard file.
+
+    Objects are shared: they are obtained through their project (see
+    SBoardProject._wrap) so that the same xml node maps to the same object
+    while it is referenced. The derived attributes of an object are cached
+    in its slots, see _cached_property.
+    """
 
     __metaclass__ = abc.ABCMeta
+    __slots__ = ("__xml_node", "_project", "__weakref__")
 
-    def __init__(self, xml_node):
+    def __init__(self, xml_node, project: SBoardProject):
         self.__xml_node = xml_node
+        self._project = project
 
     @property
-    def xml_node(self) -> cElementTree.Element:
+    def xml_node(self) -> ElementTree.Element:
         """Returns the root xml node for this given object."""
         return self.__xml_node
 
+    def _find(
+        self, path: str, node=None, **variables: str
+    ) -> Optional[ElementTree.Element]:
+        """Returns the first element matching path from the given node, the
+        xml node of the object by default. See backends.XMLBackend for the
+        variables."""
+        project = self._project
+        if project._stats is not None:
+            project._stats._lookup("find", path)
+        return project._backend.find(
+            self.__xml_node if node is None else node, path, **variables
+        )
+
+    def _findall(
+        self, path: str, node=None, **variables: str
+    ) -> List[ElementTree.Element]:
+        """Returns all the elements matching path from the given node, the
+        xml node of the object by default. See backends.XMLBackend for the
+        variables."""
+        project = self._project
+        if project._stats is not None:
+            project._stats._lookup("findall", path)
+        return project._backend.findall(
+            self.__xml_node if node is None else node, path, **variables
+        )
+
+    def _iter(self, tag: str, node=None) -> Iterator[ElementTree.Element]:
+        """Returns an iterator of the descendants of the given node with the
+        given tag, the xml node of the object by default."""
+        project = self._project
+        if project._stats is not None:
+            project._stats._lookup("iter", tag)
+        return project._backend.iter(self.__xml_node if node is None else node, tag)
+
+    def _scan(self, iterable: Iterable, site: str) -> Iterable:
+        """Returns the given iterable, counting the items visited by the
+        linear scan at site when the project is instrumented."""
+        stats = self._project._stats
+        return iterable if stats is None else stats._scan(iterable, site)
+
 
 class SBoardAudioClip(_SBoardNode):
     """A Storyboard pro audio clip."""
 
-    def __init__(self, xml_node: cElementTree.Element, track: SBoardAudioTrack):
+    __slots__ = ("__track", "_cached_clip_range", "_cached_timeline_range")
+
+    def __init__(self, xml_node: ElementTree.Element, track: SBoardAudioTrack):
         # /projects/scenes/scene[@name='Top']/columns/column[@type='1']/soundSequence
-        super(SBoardAudioClip, self).__init__(xml_node)
+        super(SBoardAudioClip, self).__init__(xml_node, track._project)
         self.__track = track
 
     @property
@@ -74,14 +994,14 @@ class SBoardAudioClip(_SBoardNode):
         """Returns the full path of the file used relative to the .sboard file."""
         return "./audio/{}".format(self.file_name)
 
-    @property
+    @_cached_property
     def clip_range(self) -> Tuple[float, float]:
         """Returns the clip range of the audio track in seconds."""
         return float(self.xml_node.attrib["clippingTimeStart"]), float(
             self.xml_node.attrib["clippingTimeStop"]
         )
 
-    @property
+    @_cached_property
     def timeline_range(self) -> Tuple[int, int]:
         """Returns the timeline range of the audio track."""
         return int(self.xml_node.attrib["startFrame"]), int(
@@ -103,9 +1023,11 @@ class SBoardAudioClip(_SBoardNode):
 class SBoardVideoClip(_SBoardNode):
     """A Storyboard Pro Video Clip."""
 
-    def __init__(self, xml_node: cElementTree.Element, track: SBoardVideoTrack):
+    __slots__ = ("__track", "_cached_path", "_cached_element")
+
+    def __init__(self, xml_node: ElementTree.Element, track: SBoardVideoTrack):
         # /project/scenes/scene
-        super(SBoardVideoClip, self).__init__(xml_node)
+        super(SBoardVideoClip, self).__init__(xml_node, track._project)
         self.__track = track
 
     @property
@@ -122,9 +1044,7 @@ class SBoardVideoClip(_SBoardNode):
     def timeline_range(self) -> Tuple[int, int]:
         """Returns the range of the scene within the project timeline."""
         project = self.__track.timeline.project
-        top_node = project.xml_node.find("./scenes/scene[@name='Top']")
-        assert top_node is not None
-        return _get_timeline_range(top_node, self.uid)
+        return project._index.top_warps[self.uid].exposures
 
     @property
     def clip_range(self) -> Tuple[int, int]:
@@ -134,52 +1054,44 @@ class SBoardVideoClip(_SBoardNode):
         Returns:
             tuple(int, int)
         """
-
         project = self.__track.timeline.project
-        top_node = project.xml_node.find("./scenes/scene[@name='Top']")
-        assert top_node is not None
-        warp_sequences = top_node.iter("warpSeq")
-
-        warp_seq = next(ws for ws in warp_sequences if ws.attrib["id"] == self.uid)
-
-        return int(warp_seq.attrib["start"]), int(warp_seq.attrib["end"])
+        warp_seq = project._index.top_warps[self.uid]
+        return warp_seq.start, warp_seq.end
 
     @property
     def length(self) -> int:
         """Returns the number of frames of the clip."""
         return int(self.xml_node.attrib["nbframes"])
 
-    @property
+    @_cached_property
     def path(self) -> str:
         """Returns the full path of the clip file used relative to the .sboard file."""
         return self.element.path
 
     @property
-    def element(self) -> SBoardLibraryElement:
-        """Returns the path to the video clip."""
+    def _element_key(self) -> Tuple[str, str]:
+        """Returns the category id and the name of the element of the clip."""
         # Get the movieSeqExp or elementSeq node
-        mov = self.xml_node.find("./columns/column[@type='0']")
+        mov = self._find("./columns/column[@type='0']")
         assert mov is not None
-        mov = next(m for m in mov)
+        mov = next(m for m in self._scan(mov, "SBoardVideoClip.element"))
+        return mov.attrib["id"], mov.attrib["val"]
 
-        # Get in /projects/elements/ and find the element matching the mov
-        project = self.__track.timeline.project
-
-        cat_id = mov.attrib["id"]
-        element_name = mov.attrib["val"]
-
-        # Get the element in the library
-        cat = next(cat for cat in project.library.categories if cat.uid == cat_id)
-
-        return next(element for element in cat.elements if element.name == element_name)
+    @_cached_property
+    def element(self) -> Optional[SBoardLibraryElement]:
+        """Returns the library element of the video clip."""
+        library = self.__track.timeline.project.library
+        return library.get_element(*self._element_key)
 
 
 class SBoardAudioTrack(_SBoardNode):
     """A Storyboard Pro audio track"""
 
-    def __init__(self, xml_node: cElementTree.Element, timeline: SBoardTimeline):
+    __slots__ = ("__timeline",)
+
+    def __init__(self, xml_node: ElementTree.Element, timeline: SBoardTimeline):
         # /projects/scenes/scene[@name='Top']/columns/column[@type='1']
-        super(SBoardAudioTrack, self).__init__(xml_node)
+        super(SBoardAudioTrack, self).__init__(xml_node, timeline._project)
         self.__timeline = timeline
 
     @property
@@ -190,9 +1102,10 @@ class SBoardAudioTrack(_SBoardNode):
     @property
     def clips(self) -> Iterator[SBoardAudioClip]:
         """Generator f all the clips in the track."""
+        project = self.__timeline.project
         return (
-            SBoardAudioClip(node, self)
-            for node in self.xml_node.findall("./soundSequence")
+            project._wrap(SBoardAudioClip, node, self)
+            for node in self._findall("./soundSequence")
         )
 
     @property
@@ -208,15 +1121,17 @@ class SBoardAudioTrack(_SBoardNode):
 class SBoardVideoTrack(_SBoardNode):
     """A Storyboard Pro video track"""
 
-    def __init__(self, xml_node: cElementTree.Element, timeline: SBoardTimeline):
+    __slots__ = ("__timeline", "_cached_uid")
+
+    def __init__(self, xml_node: ElementTree.Element, timeline: SBoardTimeline):
         # /projects/scenes/scene[@name=Top]/rootgroup/nodelist/module
-        super(SBoardVideoTrack, self).__init__(xml_node)
+        super(SBoardVideoTrack, self).__init__(xml_node, timeline._project)
         self.__timeline = timeline
 
-    @property
+    @_cached_property
     def uid(self) -> str:
         """Returns the unique identifier of the video track."""
-        node = self.xml_node.find("./attrs/drawing/element")
+        node = self._find("./attrs/drawing/element")
         assert node is not None
         return node.attrib["col"]
 
@@ -228,19 +1143,16 @@ class SBoardVideoTrack(_SBoardNode):
     @property
     def clips(self) -> Iterator[SBoardVideoClip]:
         """Returns an iterator of all the clips in order."""
-        column = self.__timeline.xml_node.find(
-            "./columns/column[@name='{}']" "".format(self.uid)
+        column = self._find(
+            "./columns/column[@name=$name]", self.__timeline.xml_node, name=self.uid
         )
         assert column is not None
-        uids = [node.attrib["id"] for node in column.findall("./warpSeq")]
+        uids = [node.attrib["id"] for node in self._findall("./warpSeq", column)]
 
         # Get all the clips
-        video_clips = {
-            video_clip.attrib["id"]: video_clip
-            for video_clip in self.__timeline.project.xml_node.findall("./scenes/scene")
-            if video_clip.attrib["id"] in uids
-        }
-        return (SBoardVideoClip(video_clips[uid], self) for uid in uids)
+        project = self.__timeline.project
+        scene_nodes = project._index.scene_nodes
+        return (project._wrap(SBoardVideoClip, scene_nodes[uid], self) for uid in uids)
 
     @property
     def timeline(self) -> SBoardTimeline:
@@ -250,7 +1162,7 @@ class SBoardVideoTrack(_SBoardNode):
     def is_enabled(self) -> bool:
         """Returns True if the track is enabled, False otherwise."""
         # Look in the options, if the disabled tag is not here, the track is on.
-        disabled = self.xml_node.find("./options/disabled[@val='true']")
+        disabled = self._find("./options/disabled[@val='true']")
 
         if disabled is None:
             return True
@@ -261,9 +1173,11 @@ class SBoardVideoTrack(_SBoardNode):
 class SBoardLayer(_SBoardNode):
     """A layer group"""
 
-    def __init__(self, xml_node: cElementTree.Element, panel: SBoardPanel):
+    __slots__ = ("__panel", "_cached_element")
+
+    def __init__(self, xml_node: ElementTree.Element, panel: SBoardPanel):
         # /projects/scenes/scene[@name='panel']/rootgroup/nodeslist/module
-        super(SBoardLayer, self).__init__(xml_node)
+        super(SBoardLayer, self).__init__(xml_node, panel._project)
         self.__panel = panel
 
     @property
@@ -277,36 +1191,46 @@ class SBoardLayer(_SBoardNode):
         return self.xml_node.attrib["name"]
 
     @property
-    def element(self) -> Optional[SBoardLibraryElement]:
-        """Returns the library element for this layer."""
-        draw_node = self.xml_node.find("./attrs/drawing/element")
+    def _element_key(self) -> Optional[Tuple[str, str]]:
+        """Returns the category id and the name of the element of the layer
+        or None if the layer has no element."""
+        draw_node = self._find("./attrs/drawing/element")
         assert draw_node is not None
 
-        column_name = draw_node.attrib["col"]
-
-        column_node = self.__panel.xml_node.find(
-            "./columns/column[@name='{}']/elementSeq".format(column_name)
+        column_node = self._find(
+            "./columns/column[@name=$name]/elementSeq",
+            self.__panel.xml_node,
+            name=draw_node.attrib["col"],
         )
 
         if column_node is None:
             return None
 
-        element_cat_id = column_node.attrib["id"]
-        element_name = column_node.attrib["val"]
+        return column_node.attrib["id"], column_node.attrib["val"]
 
-        # Search directly in category
-        project = self.__panel.project
-        project_node = project.xml_node
-        cat_path = "./elements/element[@id='{}']".format(element_cat_id)
-        category_node = project_node.find(cat_path)
-        assert category_node is not None
+    @_cached_property
+    def element(self) -> Optional[SBoardLibraryElement]:
+        """Returns the library element for this layer."""
+        element_key = self._element_key
+
+        if element_key is None:
+            return None
 
-        element_path = "./drawings/dwg[@name='{}']".format(element_name)
-        element_node = category_node.find(element_path)
-        assert element_node is not None
+        return self.__panel.project.library.get_element(*element_key)
 
-        cat = SBoardLibraryCategory(category_node, project.library)
-        return SBoardLibraryElement(element_node, cat)
+    @property
+    def parent(self) -> Optional[SBoardLayer]:
+        """Returns the group the layer belongs to or None if it is a root
+        layer of the panel."""
+        graph = self.__panel._layer_graph
+        parent_name = graph.parents.get(self.xml_node.attrib["name"])
+
+        if parent_name is None:
+            return None
+
+        return self.__panel.project._wrap(
+            SBoardLayer, graph.modules_by_name[parent_name], self.__panel
+        )
 
     def layer_iter(
         self, groups: bool = False, recursive: bool = False
@@ -317,44 +1241,84 @@ class SBoardLayer(_SBoardNode):
             groups: If True, also yield layers in groups
             recursive: If True, iterate layer recursively
         """
+        for layer, _ in self._walk(recursive):
+            if groups or not layer.is_group():
+                yield layer
+
+    def _walk(self, recursive: bool = True) -> Iterator[Tuple[SBoardLayer, int]]:
+        """Returns an iterator of the sub layers of the layer in depth first
+        order, groups included, with their depth from 0 for the layers linked
+        to this one. Only the groups are walked into when recursive is True.
+        A group linked again from within itself is skipped, so that cyclic
+        links do not recurse forever."""
         if self.xml_node.attrib["type"] == "READ":
             return
 
-        modules = self.__panel.xml_node.findall("./rootgroup/nodeslist/module")
-        layers_by_name = {module.attrib["name"]: module for module in modules}
-        group_name = self.xml_node.attrib["name"]
+        graph = self.__panel._layer_graph
+        project = self.__panel.project
 
-        for link in self.__panel.xml_node.findall("./rootgroup/linkedlist/link"):
+        def walk(
+            name: str, depth: int, path: FrozenSet[str]
+        ) -> Iterator[Tuple[SBoardLayer, int]]:
+            for child_name in graph.children.get(name, ()):
 
-            if link.attrib["out"] != group_name:
-                continue
+                if child_name in path:
+                    continue
 
-            layer = SBoardLayer(layers_by_name[link.attrib["in"]], self.__panel)
+                layer = project._wrap(
+                    SBoardLayer, graph.modules_by_name[child_name], self.__panel
+                )
+                yield layer, depth
 
-            if layer.is_group():
+                if recursive and layer.is_group():
+                    yield from walk(child_name, depth + 1, path | {child_name})
 
-                if groups:
-                    yield layer
-
-                if recursive:
-                    for child in layer.layer_iter(groups, recursive):
-                        yield child
-            else:
-                yield layer
+        name = self.xml_node.attrib["name"]
+        yield from walk(name, 0, frozenset((name,)))
 
     def is_group(self) -> bool:
         """Returns True if the layer is a group."""
         return self.xml_node.attrib["type"] == "PEG"
 
 
+class SBoardLayerNode(NamedTuple):
+    """A layer with its sub layers in the layer tree of a panel (see
+    SBoardPanel.layer_tree). The children of a drawing layer are empty."""
+
+    layer: SBoardLayer
+    children: List[SBoardLayerNode]
+
+
 class SBoardPanel(_SBoardNode):
     """Representation of a Story Board Pro Panel."""
 
-    def __init__(self, xml_node: cElementTree.Element, scene: SBoardScene):
+    __slots__ = ("__scene", "_cached_layer_graph", "_cached_timeline_range")
+
+    def __init__(self, xml_node: ElementTree.Element, scene: SBoardScene):
         # /projects/elements/scene
-        super(SBoardPanel, self).__init__(xml_node)
+        super(SBoardPanel, self).__init__(xml_node, scene._project)
         self.__scene = scene  # /project/scenes/scene
 
+    def __scene_timeline(self) -> _SceneTimeline:
+        """Returns the indexed timeline of the scene of the panel."""
+        return self.project._index.scene_timeline(self.__scene.xml_node)
+
+    @_cached_property
+    def _layer_graph(self) -> _LayerGraph:
+        """Returns the modules of the panel and the links between them."""
+        modules = self._findall("./rootgroup/nodeslist/module")
+        modules_by_name = {module.attrib["name"]: module for module in modules}
+        children: Dict[str, List[str]] = {}
+        parents: Dict[str, str] = {}
+
+        for link in self._findall("./rootgroup/linkedlist/link"):
+            group_name = link.attrib["out"]
+            child_name = link.attrib["in"]
+            children.setdefault(group_name, []).append(child_name)
+            parents.setdefault(child_name, group_name)
+
+        return _LayerGraph(modules, modules_by_name, children, parents)
+
     @property
     def project(self) -> SBoardProject:
         """Returns the project of the panel."""
@@ -368,10 +1332,7 @@ class SBoardPanel(_SBoardNode):
     @property
     def number(self) -> int:
         """Returns the number of the panel."""
-        for k, panel in enumerate(self.__scene.panels):
-            if panel.uid == self.uid:
-                return k + 1
-        assert False
+        return self.__scene_timeline().numbers[self.uid]
 
     @property
     def scene(self) -> SBoardScene:
@@ -381,11 +1342,8 @@ class SBoardPanel(_SBoardNode):
     @property
     def clip_range(self) -> Tuple[int, int]:
         """Returns the frame range of the panel."""
-        timeline = _get_timeline(self.__scene.xml_node)
-
-        warp_seq = next(ws for ws in timeline if ws.attrib["id"] == self.uid)
-
-        return int(warp_seq.attrib["start"]), int(warp_seq.attrib["end"])
+        warp_seq = self.__scene_timeline().warps[self.uid]
+        return warp_seq.start, warp_seq.end
 
     @property
     def length(self) -> int:
@@ -396,10 +1354,9 @@ class SBoardPanel(_SBoardNode):
     def scene_range(self) -> Tuple[int, int]:
         """Returns the frame range of the panel relative to the scene."""
         # Get the panel within the timeline of the scene
-        timeline = _get_timeline(self.__scene.xml_node)
-        return _get_timeline_range(timeline, self.uid)
+        return self.__scene_timeline().warps[self.uid].exposures
 
-    @property
+    @_cached_property
     def timeline_range(self) -> Tuple[int, int]:
         """Returns the range within the global timeline."""
         # Get the timeline range of the scene
@@ -416,9 +1373,12 @@ class SBoardPanel(_SBoardNode):
             groups: If True, also yield layers in groups
             recursive: If True, iterate layer recursively
         """
-        for module in self.xml_node.findall("./rootgroup/nodeslist/module"):
+        project = self.project
+        project._require("layers")
+
+        for module in self._layer_graph.modules:
 
-            layer = SBoardLayer(module, self)
+            layer = project._wrap(SBoardLayer, module, self)
 
             if layer.is_group():
 
@@ -432,20 +1392,50 @@ class SBoardPanel(_SBoardNode):
             else:
                 yield layer
 
+    def layer_tree(self) -> List[SBoardLayerNode]:
+        """Returns the tree of the layers of the panel, from its root layers
+        which do not belong to any group, in the order they appear in the
+        panel. The children of each layer are the layers generated by its
+        layer_iter(groups=True, recursive=True), in link order."""
+        self.project._require("layers")
+        graph = self._layer_graph
+        project = self.project
+        tree = []
+
+        for module in graph.modules:
+
+            if module.attrib["name"] in graph.parents:
+                continue
+
+            root = SBoardLayerNode(project._wrap(SBoardLayer, module, self), [])
+            tree.append(root)
+            # Nodes of the groups being walked, by depth
+            stack = [root]
+
+            for layer, depth in root.layer._walk():
+                node = SBoardLayerNode(layer, [])
+                del stack[depth + 1 :]
+                stack[depth].children.append(node)
+                stack.append(node)
+
+        return tree
+
 
 class SBoardScene(_SBoardNode):
     """A Storyboard Pro Scene has it is conceptually defined within StoryBoard
     Pro. A scene is a collection of panels (see SBoardPanel) which is then
     placed on the project timeline."""
 
-    def __init__(self, xml_node: cElementTree.Element, project: SBoardProject):
+    __slots__ = ("__project", "_cached_name", "_cached_sequence")
+
+    def __init__(self, xml_node: ElementTree.Element, project: SBoardProject):
         # /project/scenes/scene
-        super(SBoardScene, self).__init__(xml_node)
+        super(SBoardScene, self).__init__(xml_node, project)
         self.__project = project  # /project
 
-    def __get_info(self) -> cElementTree.Element:
+    def __get_info(self) -> ElementTree.Element:
         """Returns the scene node info from the node metadata."""
-        scene_info = self.xml_node.find("./metas/meta/sceneInfo")
+        scene_info = self._find("./metas/meta/sceneInfo")
 
         assert scene_info is not None, "No scene info found"
         return scene_info
@@ -460,7 +1450,7 @@ class SBoardScene(_SBoardNode):
         """Returns the unique identifier of the scene."""
         return self.xml_node.attrib["id"]
 
-    @property
+    @_cached_property
     def name(self) -> str:
         """Returns the name of the scene."""
         return self.__get_info().attrib["name"]
@@ -468,9 +1458,7 @@ class SBoardScene(_SBoardNode):
     @property
     def timeline_range(self) -> Tuple[int, int]:
         """Returns the range of the scene within the project timeline."""
-        top_node = self.__project.xml_node.find("./scenes/scene[@name='Top']")
-        assert top_node is not None
-        return _get_timeline_range(top_node, self.uid)
+        return self.__project._index.top_warps[self.uid].exposures
 
     @property
     def clip_range(self) -> Tuple[int, int]:
@@ -478,13 +1466,8 @@ class SBoardScene(_SBoardNode):
         scene used in the project timeline.
 
         """
-        top_node = self.__project.xml_node.find("./scenes/scene[@name='Top']")
-        assert top_node is not None
-        warp_sequences = top_node.iter("warpSeq")
-
-        warp_seq = next(ws for ws in warp_sequences if ws.attrib["id"] == self.uid)
-
-        return int(warp_seq.attrib["start"]), int(warp_seq.attrib["end"])
+        warp_seq = self.__project._index.top_warps[self.uid]
+        return warp_seq.start, warp_seq.end
 
     @property
     def length(self) -> int:
@@ -494,46 +1477,53 @@ class SBoardScene(_SBoardNode):
     @property
     def panels(self) -> Iterator[SBoardPanel]:
         """Returns an iterator of panels within the scene."""
-        scene_iter = self.__project.xml_node.findall("./scenes/scene")
+        self.__project._require("panels")
+        index = self.__project._index
+        scene_nodes = index.scene_nodes
 
-        all_panels_by_id = {
-            panel.attrib["id"]: panel
-            for panel in scene_iter
-            if "panel" in panel.attrib["name"]
-        }
+        # Evaluate all the warp sequences
+        for panel_id in index.scene_timeline(self.xml_node).panel_ids:
+            yield self.__project._wrap(SBoardPanel, scene_nodes[panel_id], self)
 
-        timeline = _get_timeline(self.xml_node)
+    def to_arrays(self) -> Dict[str, numpy.ndarray]:
+        """Returns the scene and its panels as structured numpy arrays.
 
-        # Evaluate all the warp sequences
-        for warp_seq in timeline.findall("warpSeq"):
-            # Only get existing panels
-            panel_id = warp_seq.attrib["id"]
-            yield SBoardPanel(all_panels_by_id[panel_id], self)
+        The "scenes" array holds a single row and the "panels" array one row
+        per panel, in order. See SBoardTimeline.to_arrays for the fields.
+        """
+        self.__project._require("panels")
+        scene_row, panel_rows = self.__project._index.scene_rows(self.xml_node, 0)
+        return {
+            "scenes": _to_array([scene_row], _SCENE_FIELDS),
+            "panels": _to_array(panel_rows, _PANEL_FIELDS),
+        }
 
-    @property
+    @_cached_property
     def sequence(self) -> Optional[SBoardSequence]:
         """Returns the sequence the scene belongs to or None if there is no sequence."""
-        scene_info = self.xml_node.find("./metas/meta/sceneInfo")
+        scene_info = self._find("./metas/meta/sceneInfo")
         assert scene_info is not None
         sequence_name = scene_info.attrib["sequenceName"]
 
         if sequence_name == "":
             sequence_name = "0"
 
-        return SBoardSequence(self.__project, sequence_name)
+        return self.__project._sequence(sequence_name)
 
 
 class SBoardSequence(object):
     """A Storyboard sequence. A sequence contains one or more scenes."""
 
+    __slots__ = ("_project", "__sequence_name", "__weakref__")
+
     def __init__(self, project: SBoardProject, sequence_name: str):
-        self.__project = project
+        self._project = project
         self.__sequence_name = sequence_name
 
     @property
     def project(self) -> SBoardProject:
         """Returns the project of this scene."""
-        return self.__project
+        return self._project
 
     @property
     def name(self) -> str:
@@ -542,22 +1532,44 @@ class SBoardSequence(object):
 
     @property
     def scenes(self) -> Iterator[SBoardScene]:
-        """Generator of all the scenes within the sequence."""
+        """Returns an iterator of the scenes within the sequence, in the order
+        they appear in the project."""
+        return iter(self._project._sequence_groups.get(self.__sequence_name, []))
 
-        for scene in self.__project.scenes:
-            sequence = scene.sequence
-            if not sequence:
-                continue
-            if sequence.name == self.name:
-                yield scene
+    @property
+    def timeline_range(self) -> Optional[Tuple[int, int]]:
+        """Returns the range of the sequence within the project timeline, from
+        the start of its first scene to the end of its last scene, or None if
+        the sequence has no scene."""
+        ranges = [scene.timeline_range for scene in self.scenes]
+
+        if not ranges:
+            return None
+
+        return min(start for start, _ in ranges), max(end for _, end in ranges)
+
+
+class SBoardActiveElements(NamedTuple):
+    """The elements of a timeline active at a frame or within a frame range.
+
+    Each list is in timeline order.
+    """
+
+    scenes: List[SBoardScene]
+    panels: List[SBoardPanel]
+    transitions: List[SBoardTransition]
+    video_clips: List[SBoardVideoClip]
+    audio_clips: List[SBoardAudioClip]
 
 
 class SBoardTimeline(_SBoardNode):
     """Represents the timeline of the project."""
 
-    def __init__(self, xml_node: cElementTree.Element, project: SBoardProject):
+    __slots__ = ("__project",)
+
+    def __init__(self, xml_node: ElementTree.Element, project: SBoardProject):
         # /projects/scenes/scene[@name='Top']
-        super(SBoardTimeline, self).__init__(xml_node)
+        super(SBoardTimeline, self).__init__(xml_node, project)
         self.__project = project
 
     @property
@@ -581,8 +1593,9 @@ class SBoardTimeline(_SBoardNode):
 
         Tracks are generated in the same order as they appear in the project.
         """
-        audio_tracks = self.xml_node.findall("./columns/column[@type='1']")
-        return (SBoardAudioTrack(node, self) for node in audio_tracks)
+        audio_tracks = self._findall("./columns/column[@type='1']")
+        project = self.__project
+        return (project._wrap(SBoardAudioTrack, node, self) for node in audio_tracks)
 
     @property
     def video_tracks(self) -> Iterator[SBoardVideoTrack]:
@@ -592,10 +1605,11 @@ class SBoardTimeline(_SBoardNode):
         """
         # To get video tracks, we must  find the module which is not TopLayer
         # ./rootgroup/nodeslist
-        modules = self.xml_node.findall("./rootgroup/nodeslist/module")
+        modules = self._findall("./rootgroup/nodeslist/module")
 
+        project = self.__project
         return (
-            SBoardVideoTrack(module, self)
+            project._wrap(SBoardVideoTrack, module, self)
             for module in modules
             if module.attrib["name"] != "TopLayer"
         )
@@ -607,20 +1621,35 @@ class SBoardTimeline(_SBoardNode):
         The scenes are generated in the same order as they appear in the
         timeline.
         """
-        project_scenes_by_id = {s.uid: s for s in self.__project.scenes}
+        self.__project._require("scenes_meta")
+        index = self.__project._index
 
-        # Parse the warpSequences in the timeline node
-        warp_sequences = self.xml_node.iter("warpSeq")
+        # Walk the warpSequences of the timeline node
+        for uid in index.top_warp_ids:
 
-        for warp_seq in warp_sequences:
-
-            scene = project_scenes_by_id.get(warp_seq.attrib["id"], None)
+            scene_node = index.scene_nodes.get(uid, None)
 
             # Check if it is a scene
-            if scene is None:
+            if scene_node is None or "shot" not in scene_node.attrib["name"]:
                 continue
 
-            yield scene
+            yield self.__project._wrap(SBoardScene, scene_node, self.__project)
+
+    def get_scene(self, uid: str) -> Optional[SBoardScene]:
+        """Returns the scene of the timeline of the given unique identifier or
+        None if there is no such scene."""
+        self.__project._require("scenes_meta")
+        index = self.__project._index
+
+        if uid not in index.top_warps:
+            return None
+
+        scene_node = index.scene_nodes.get(uid)
+
+        if scene_node is None or "shot" not in scene_node.attrib["name"]:
+            return None
+
+        return self.__project._wrap(SBoardScene, scene_node, self.__project)
 
     @property
     def panels(self) -> Iterator[SBoardPanel]:
@@ -634,6 +1663,13 @@ class SBoardTimeline(_SBoardNode):
             for panel in scene.panels:
                 yield panel
 
+    def apanels(
+        self, batch_size: int = ASYNC_BATCH_SIZE
+    ) -> AsyncIterator[SBoardPanel]:
+        """Async iterator of the panels within the timeline, yielding control
+        to the event loop every batch_size panels. See panels."""
+        return _aiterate(self.panels, batch_size)
+
     @property
     def transitions(self) -> Iterator[SBoardTransition]:
         """Returns an iterator of the transitions within the timeline.
@@ -642,19 +1678,339 @@ class SBoardTimeline(_SBoardNode):
         """
 
         # Parse the warpSequences in the timeline node
-        warp_sequences = self.xml_node.iter("transitionSeq")
+        warp_sequences = self._iter("transitionSeq")
 
         for warp_seq in warp_sequences:
-            yield SBoardTransition(warp_seq, self)
+            yield self.__project._wrap(SBoardTransition, warp_seq, self)
+
+    def __frame_index(self) -> Dict[str, _IntervalIndex]:
+        """Returns the interval indices of the timeline elements by kind,
+        building them on first use."""
+        index = self.__project._index
+
+        if index.frame_index is not None:
+            return index.frame_index
+
+        # Ranges built from exposures include their last frame while the
+        # ones built from a length stop one frame after it. Panels are placed
+        # from their exposures within the scene, like the edit events, so
+        # that they are active within the frames of their scene.
+        scenes = []
+        panels = []
+        for scene_index, scene in enumerate(self.scenes):
+            start, end = scene.timeline_range
+            scenes.append((start, end + 1, scene))
+            _, panel_rows = index.scene_rows(scene.xml_node, scene_index)
+
+            for panel, row in zip(scene.panels, panel_rows):
+                panels.append((start + row[2] - 1, start + row[3], panel))
+
+        transitions = []
+        for transition in self.transitions:
+            start, end = transition.timeline_range
+            transitions.append((start, end + 1, transition))
+
+        video_clips = []
+        for video_track in self.video_tracks:
+            for video_clip in video_track.clips:
+                start, end = video_clip.timeline_range
+                video_clips.append((start, end + 1, video_clip))
+
+        audio_clips = []
+        for audio_track in self.audio_tracks:
+            for audio_clip in audio_track.clips:
+                start, stop = audio_clip.timeline_range
+                audio_clips.append((start, stop, audio_clip))
+
+        index.frame_index = {
+            kind: _IntervalIndex(intervals)
+            for kind, intervals in (
+                ("scenes", scenes),
+                ("panels", panels),
+                ("transitions", transitions),
+                ("video_clips", video_clips),
+                ("audio_clips", audio_clips),
+            )
+        }
+        return index.frame_index
+
+    def at_frame(self, frame: int) -> SBoardActiveElements:
+        """Returns the elements of the timeline active at the given frame.
+
+        Scenes, transitions and video clips include the last frame of their
+        timeline_range while audio clips stop one frame before the end of
+        their timeline_range. Panels are active over the frames of their
+        exposures within their scene, from the first frame of their scene for
+        the first panel. The lookup index is built on the first call,
+        subsequent calls run in logarithmic time.
+        """
+        frame_index = self.__frame_index()
+        return SBoardActiveElements(
+            **{kind: index.at(frame) for kind, index in frame_index.items()}
+        )
+
+    def in_range(self, start: int, end: int) -> SBoardActiveElements:
+        """Returns the elements of the timeline active at any frame between
+        start and end, both included. See at_frame."""
+        frame_index = self.__frame_index()
+        return SBoardActiveElements(
+            **{
+                kind: index.overlapping(start, end + 1)
+                for kind, index in frame_index.items()
+            }
+        )
+
+    def __panel_events(self) -> Iterator[_EditEvent]:
+        """Generates the edit events of the panels, computed from the index."""
+        self.__project._require("panels")
+        index = self.__project._index
+
+        for scene_index, scene in enumerate(self.scenes):
+            scene_row, panel_rows = index.scene_rows(scene.xml_node, scene_index)
+            scene_start = scene_row[3]
+
+            for number, row in enumerate(panel_rows, 1):
+                record_in = scene_start + row[2] - 2
+                yield _EditEvent(
+                    "clip",
+                    "V",
+                    "{}-{}".format(scene.name, number),
+                    row[0],
+                    row[4] - 1,
+                    record_in,
+                    record_in + row[3] - row[2] + 1,
+                    None,
+                )
+
+    def __video_events(self, video_track: SBoardVideoTrack) -> Iterator[_EditEvent]:
+        """Generates the edit events of the clips of the given video track."""
+        for clip in video_track.clips:
+            start, end = clip.timeline_range
+            element = clip.element
+            yield _EditEvent(
+                "clip",
+                "V",
+                clip.uid if element is None else element.name,
+                clip.uid,
+                clip.clip_range[0] - 1,
+                start - 1,
+                end,
+                None if element is None else element.path,
+            )
+
+    def __audio_events(
+        self, audio_track: SBoardAudioTrack, channel: str, rate: float
+    ) -> Iterator[_EditEvent]:
+        """Generates the edit events of the clips of the given audio track."""
+        for clip in audio_track.clips:
+            start, stop = clip.timeline_range
+            yield _EditEvent(
+                "clip",
+                channel,
+                clip.file_name,
+                clip.file_name,
+                int(round(clip.clip_range[0] * rate)),
+                start - 1,
+                stop - 1,
+                clip.path,
+            )
+
+    def __transition_events(self) -> List[_EditEvent]:
+        """Returns the edit events of the transitions sorted by record frame."""
+        events = []
+
+        for node in self._iter("transitionSeq"):
+            start, end = _parse_exposures(node.attrib["exposures"])
+            events.append(
+                _EditEvent(
+                    "transition",
+                    "V",
+                    node.attrib["type"],
+                    node.attrib["id"],
+                    0,
+                    start - 1,
+                    end,
+                    None,
+                )
+            )
+
+        events.sort(key=lambda event: event.record_in)
+        return events
+
+    def __edit_tracks(self, rate: float) -> Iterator[Tuple[str, str, Iterator]]:
+        """Generates the kind, name and edit events of every track of the
+        timeline: the panels, the video tracks then the audio tracks."""
+        yield "Video", "Storyboard", self.__panel_events()
+
+        for video_track in self.video_tracks:
+            yield "Video", video_track.name, self.__video_events(video_track)
+
+        for number, audio_track in enumerate(self.audio_tracks, 1):
+            channel = "A" if number == 1 else "A{}".format(number)
+            yield "Audio", audio_track.name, self.__audio_events(
+                audio_track, channel, rate
+            )
+
+    def export_edl(
+        self, fp: IO[str], video_track: Optional[SBoardVideoTrack] = None
+    ) -> None:
+        """Writes the timeline as a CMX 3600 edit decision list to the given
+        text file object.
+
+        An edit decision list holds a single video source on its V channel,
+        so that its events form a cut list: the panels of the storyboard by
+        default, or the clips of the given video track of the timeline. The
+        clips of the audio tracks are written on the A, A2... channels. The
+        events are cuts sorted by record time, each one followed by comments
+        with its name, its uid and the path of its media. The transitions of
+        the storyboard are written as comments at their record time.
+        Timecodes are non drop frame at the frame rate of the project,
+        starting at 00:00:00:00 on the first frame of the timeline.
+
+        The events are generated from the indexed ranges in a single pass and
+        written as they are generated.
+        """
+        project = self.__project
+        rate = project.frame_rate
+        base = int(round(rate))
+
+        if video_track is None:
+            streams = [self.__panel_events(), iter(self.__transition_events())]
+        else:
+            streams = [self.__video_events(video_track)]
+
+        streams.extend(
+            events
+            for kind, _, events in self.__edit_tracks(rate)
+            if kind == "Audio"
+        )
+
+        fp.write("TITLE: {}\nFCM: NON-DROP FRAME\n\n".format(project.title))
+        number = 0
+
+        for event in heapq.merge(*streams, key=lambda event: event.record_in):
+            record_in = _timecode(event.record_in, base)
+            record_out = _timecode(event.record_out, base)
+
+            if event.kind == "transition":
+                fp.write(
+                    "* TRANSITION: {} {} {} {}\n\n".format(
+                        event.name.upper(), record_in, record_out, event.uid
+                    )
+                )
+                continue
+
+            number += 1
+            source_in = event.source_in
+            source_out = source_in + event.record_out - event.record_in
+            fp.write(
+                "{:03d}  AX       {:<5} C        {} {} {} {}\n".format(
+                    number,
+                    event.channel,
+                    _timecode(source_in, base),
+                    _timecode(source_out, base),
+                    record_in,
+                    record_out,
+                )
+            )
+            fp.write("* FROM CLIP NAME: {}\n".format(event.name))
+            fp.write("* SBOARD UID: {}\n".format(event.uid))
+            if event.path is not None:
+                fp.write("* SOURCE FILE: {}\n".format(event.path))
+            fp.write("\n")
+
+    def export_otio_json(self, fp: IO[str]) -> None:
+        """Writes the timeline as an OpenTimelineIO json document to the given
+        text file object.
+
+        The timeline holds a Storyboard video track with the panels, one video
+        track per video track of the timeline and one audio track per audio
+        track, the holes between clips being filled with gaps. Transitions are
+        placed on the Storyboard track at the cut they overlap. Times are in
+        frames at the frame rate of the project, from 0 on the first frame of
+        the timeline, and the source range of audio clips comes from their
+        clip_range.
+
+        The document is written item by item as the tracks are walked, in a
+        single pass over the indexed ranges.
+        """
+        project = self.__project
+        rate = project.frame_rate
+        write = fp.write
+
+        write(
+            '{{"OTIO_SCHEMA": "Timeline.1", "name": {}, "metadata": {}, '
+            '"global_start_time": null, "tracks": {{"OTIO_SCHEMA": "Stack.1", '
+            '"name": "tracks", "metadata": {{}}, "children": ['.format(
+                json.dumps(project.title), json.dumps({"sboard": {"uid": self.uid}})
+            )
+        )
+
+        for track_index, (kind, name, events) in enumerate(self.__edit_tracks(rate)):
+            transitions = self.__transition_events() if track_index == 0 else []
+            write(
+                '{}{{"OTIO_SCHEMA": "Track.1", "name": {}, "kind": "{}", '
+                '"metadata": {{}}, "children": ['.format(
+                    ", " if track_index else "", json.dumps(name), kind
+                )
+            )
+
+            for item_index, item in enumerate(_otio_items(events, transitions, rate)):
+                if item_index:
+                    write(", ")
+                write(json.dumps(item))
+
+            write("]}")
+
+        write("]}}\n")
+
+    def to_arrays(self) -> Dict[str, numpy.ndarray]:
+        """Returns the scenes, panels and transitions of the timeline as
+        structured numpy arrays, computed in a single pass over the index.
+
+        Each array has a uid field and the following ones:
+            scenes: clip_start, clip_end, timeline_start, timeline_end, length
+            panels: scene (the row of the scene in the scenes array),
+                scene_start, scene_end, clip_start, clip_end, timeline_start,
+                timeline_end, length
+            transitions: timeline_start, timeline_end, type
+
+        Rows are in timeline order and ranges are the same as the ones of the
+        matching properties. numpy must be installed.
+        """
+        self.__project._require("panels")
+        index = self.__project._index
+        scene_rows = []
+        panel_rows = []
+
+        for scene in self.scenes:
+            scene_row, rows = index.scene_rows(scene.xml_node, len(scene_rows))
+            scene_rows.append(scene_row)
+            panel_rows.extend(rows)
+
+        transition_rows = [
+            (node.attrib["id"],)
+            + _parse_exposures(node.attrib["exposures"])
+            + (node.attrib["type"],)
+            for node in self._iter("transitionSeq")
+        ]
+
+        return {
+            "scenes": _to_array(scene_rows, _SCENE_FIELDS),
+            "panels": _to_array(panel_rows, _PANEL_FIELDS),
+            "transitions": _to_array(transition_rows, _TRANSITION_FIELDS),
+        }
 
 
 class SBoardTransition(_SBoardNode):
     """A Storyboard Pro Transition has it is conceptually defined within StoryBoard
     Pro. A transition is a moment over scene in a timeline."""
 
-    def __init__(self, xml_node: cElementTree.Element, timeline: SBoardTimeline):
+    __slots__ = ("__timeline", "_cached_timeline_range")
+
+    def __init__(self, xml_node: ElementTree.Element, timeline: SBoardTimeline):
         # /project/scenes/scene[@name='Top']
-        super(SBoardTransition, self).__init__(xml_node)
+        super(SBoardTransition, self).__init__(xml_node, timeline._project)
         self.__timeline = timeline  # /project/scenes/scene
 
     @property
@@ -667,7 +2023,7 @@ class SBoardTransition(_SBoardNode):
         """Returns the unique identifier of the transition."""
         return self.xml_node.attrib["id"]
 
-    @property
+    @_cached_property
     def timeline_range(self) -> Tuple[int, int]:
         """Returns the unique identifier of the transition."""
 
@@ -683,9 +2039,11 @@ class SBoardTransition(_SBoardNode):
 class SBoardLibraryElement(_SBoardNode):
     """Storyboard Pro library element. Represents a file used within the project"""
 
-    def __init__(self, xml_node: cElementTree.Element, category: SBoardLibraryCategory):
+    __slots__ = ("__category", "_cached_path")
+
+    def __init__(self, xml_node: ElementTree.Element, category: SBoardLibraryCategory):
         # /projects/elements/element/drawings/dwg
-        super(SBoardLibraryElement, self).__init__(xml_node)
+        super(SBoardLibraryElement, self).__init__(xml_node, category._project)
         self.__category = category
 
     @property
@@ -698,7 +2056,7 @@ class SBoardLibraryElement(_SBoardNode):
         """Returns the name of the element."""
         return self.xml_node.attrib["name"]
 
-    @property
+    @_cached_property
     def path(self) -> str:
         """Returns the path of the file relative to the project .sboard file."""
         file_name = "{}.{}".format(self.name, self.__category.extension)
@@ -706,10 +2064,28 @@ class SBoardLibraryElement(_SBoardNode):
             ".", self.__category.root_folder, self.__category.folder, file_name
         )
 
+    @property
+    def panels(self) -> Iterator[SBoardPanel]:
+        """Returns an iterator of the panels with a layer using the element,
+        in timeline order."""
+        panels, _ = self.__category.library._users(self.__category.uid, self.name)
+        return iter(panels)
+
+    @property
+    def video_clips(self) -> Iterator[SBoardVideoClip]:
+        """Returns an iterator of the video clips using the element, in track
+        and timeline order."""
+        _, video_clips = self.__category.library._users(
+            self.__category.uid, self.name
+        )
+        return iter(video_clips)
+
 
 class SBoardLibraryCategory(_SBoardNode):
     """A category of files in the library"""
 
+    __slots__ = ("__library",)
+
     # If lower names are in this dict, the associated extension is used.
     # Otherwise, the name of the category is used
     EXTENSION_BY_LOW_NAME = {
@@ -718,11 +2094,16 @@ class SBoardLibraryCategory(_SBoardNode):
         "abcmodels": "abc",
     }
 
-    def __init__(self, xml_node: cElementTree.Element, library: SBoardLibrary):
+    def __init__(self, xml_node: ElementTree.Element, library: SBoardLibrary):
         # /projects/elements/element
-        super(SBoardLibraryCategory, self).__init__(xml_node)
+        super(SBoardLibraryCategory, self).__init__(xml_node, library._project)
         self.__library = library
 
+    @property
+    def library(self) -> SBoardLibrary:
+        """Returns the library of the category."""
+        return self.__library
+
     @property
     def uid(self) -> str:
         """Returns the unique identifier of the library category.
@@ -754,13 +2135,16 @@ class SBoardLibraryCategory(_SBoardNode):
     @property
     def extension(self) -> str:
         """Returns the extension for this category."""
-        return self.EXTENSION_BY_LOW_NAME.get(self.name, self.name)
+        name = self.name
+        return self.EXTENSION_BY_LOW_NAME.get(name.lower(), name)
 
     @property
     def elements(self) -> Iterator[SBoardLibraryElement]:
         """Returns an iterator of all the elements for this category."""
-        for node in self.xml_node.findall("./drawings/dwg"):
-            yield SBoardLibraryElement(node, self)
+        project = self.__library.project
+
+        for node in self._findall("./drawings/dwg"):
+            yield project._wrap(SBoardLibraryElement, node, self)
 
 
 class SBoardLibrary(_SBoardNode):
@@ -768,9 +2152,11 @@ class SBoardLibrary(_SBoardNode):
     used in the project. Note that audio files are not stored in the library
     folder."""
 
-    def __init__(self, xml_node: cElementTree.Element, project: SBoardProject):
+    __slots__ = ("__project",)
+
+    def __init__(self, xml_node: ElementTree.Element, project: SBoardProject):
         # /projects/elements
-        super(SBoardLibrary, self).__init__(xml_node)
+        super(SBoardLibrary, self).__init__(xml_node, project)
         self.__project = project
 
     @property
@@ -781,8 +2167,8 @@ class SBoardLibrary(_SBoardNode):
     @property
     def categories(self) -> Iterator[SBoardLibraryCategory]:
         """Returns an iterator of all the categories in the library."""
-        for node in self.xml_node.findall("./element"):
-            yield SBoardLibraryCategory(node, self)
+        for node in self._findall("./element"):
+            yield self.__project._wrap(SBoardLibraryCategory, node, self)
 
     @property
     def elements(self) -> Iterator[SBoardLibraryElement]:
@@ -791,6 +2177,128 @@ class SBoardLibrary(_SBoardNode):
             for element in cat.elements:
                 yield element
 
+    def aelements(
+        self, batch_size: int = ASYNC_BATCH_SIZE
+    ) -> AsyncIterator[SBoardLibraryElement]:
+        """Async iterator of all the elements in the library, yielding control
+        to the event loop every batch_size elements."""
+        return _aiterate(self.elements, batch_size)
+
+    def get_category(self, uid: str) -> Optional[SBoardLibraryCategory]:
+        """Returns the category of the given unique identifier or None if
+        there is no such category."""
+        node = self.__project._library_index.categories.get(uid)
+
+        if node is None:
+            return None
+
+        return self.__project._wrap(SBoardLibraryCategory, node, self)
+
+    def get_element(
+        self, category_uid: str, name: str
+    ) -> Optional[SBoardLibraryElement]:
+        """Returns the element of the given name in the category of the given
+        unique identifier or None if there is no such element."""
+        node = self.__project._library_index.elements.get((category_uid, name))
+
+        if node is None:
+            return None
+
+        category = self.get_category(category_uid)
+        return self.__project._wrap(SBoardLibraryElement, node, category)
+
+    def _users(
+        self, category_uid: str, name: str
+    ) -> Tuple[List[SBoardPanel], List[SBoardVideoClip]]:
+        """Returns the panels and video clips using the given element,
+        indexing the elements of all of them on first use."""
+        index = self.__project._library_index
+
+        if index.users is None:
+            users: Dict[
+                Tuple[str, str], Tuple[List[SBoardPanel], List[SBoardVideoClip]]
+            ] = {}
+            timeline = self.__project.timeline
+
+            for panel in timeline.panels:
+                for layer in panel.layer_iter():
+                    element_key = layer._element_key
+
+                    if element_key is None:
+                        continue
+
+                    panels = users.setdefault(element_key, ([], []))[0]
+
+                    if not panels or panels[-1] is not panel:
+                        panels.append(panel)
+
+            for video_track in timeline.video_tracks:
+                for video_clip in video_track.clips:
+                    element_key = video_clip._element_key
+                    users.setdefault(element_key, ([], []))[1].append(video_clip)
+
+            index.users = users
+
+        return index.users.get((category_uid, name), ([], []))
+
+
+class SBoardChanges(NamedTuple):
+    """The identifiers of the objects of a kind added, removed or modified
+    between two versions of a project (see SBoardProject.diff)."""
+
+    added: List[str]
+    removed: List[str]
+    modified: List[str]
+
+    @classmethod
+    def from_fingerprints(
+        cls, old: Dict[str, str], new: Dict[str, str]
+    ) -> SBoardChanges:
+        """Returns the changes between the given fingerprints."""
+        return cls(
+            [uid for uid in new if uid not in old],
+            [uid for uid in old if uid not in new],
+            [uid for uid, digest in new.items() if old.get(uid, digest) != digest],
+        )
+
+
+class SBoardDiff(NamedTuple):
+    """The differences between two versions of a project.
+
+    ranges maps the uid of the scenes and panels present in both versions
+    whose timeline_range changed to their old and new timeline ranges.
+    """
+
+    scenes: SBoardChanges
+    panels: SBoardChanges
+    audio_tracks: SBoardChanges
+    video_tracks: SBoardChanges
+    categories: SBoardChanges
+    ranges: Dict[str, Tuple[Tuple[int, int], Tuple[int, int]]]
+
+
+class SBoardAssets(NamedTuple):
+    """The media files of a project found on disk (see
+    SBoardProject.resolve_assets). Paths are relative to the directory of the
+    project, like the path of the library elements and clips."""
+
+    # Referenced files which exist
+    present: FrozenSet[str]
+    # Referenced files which do not exist
+    missing: FrozenSet[str]
+    # Files of the media directories which are not referenced
+    unused: FrozenSet[str]
+
+
+def _list_directory(path: str) -> Optional[Dict[str, bool]]:
+    """Returns whether each entry of the given directory is a directory, or
+    None if it cannot be listed."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name: entry.is_dir() for entry in entries}
+    except OSError:
+        return None
+
 
 class SBoardProject(_SBoardNode):
     """A StoryBoard Pro project abstraction built usually from a .sboard file
@@ -798,71 +2306,687 @@ class SBoardProject(_SBoardNode):
     .sboard file to provides a more intuitive way of accessing components of a
     project than just parsing directly the xml content."""
 
+    __slots__ = (
+        "__index",
+        "__library_index",
+        "__wrappers",
+        "__sections",
+        "_stats",
+        "_backend",
+        "_slim_report",
+        "_cached_sequence_groups",
+        "_cached_fingerprint",
+    )
+
+    def __init__(
+        self,
+        xml_node: ElementTree.ElementTree,
+        sections: Optional[FrozenSet[str]] = None,
+        backend: Union[str, XMLBackend, None] = None,
+    ):
+        # /project
+        super(SBoardProject, self).__init__(xml_node, self)
+        self._stats: Optional[SBoardStats] = None
+        self._backend = (
+            backend_of(xml_node) if backend is None else get_backend(backend)
+        )
+        self.__index: Optional[_SBoardIndex] = None
+        self.__library_index: Optional[_LibraryIndex] = None
+        # Objects in use, forgotten once they are not referenced anymore
+        self.__wrappers: weakref.WeakValueDictionary[
+            tuple, object
+        ] = weakref.WeakValueDictionary()
+        self.__sections = sections
+        self._slim_report: Optional[SBoardSlimReport] = None
+
     @classmethod
-    def from_file(cls, sboard_path) -> SBoardProject:
-        """Returns a SBoardProject from the given path."""
-        return cls(cElementTree.parse(sboard_path))
+    def from_file(
+        cls,
+        sboard_path,
+        sections: Optional[Iterable[str]] = None,
+        backend: Union[str, XMLBackend, None] = None,
+        slim: bool = False,
+    ) -> SBoardProject:
+        """Returns a SBoardProject from the given path.
+
+        Args:
+            sboard_path: The path of the .sboard file. Gzip compressed files
+                and zip archives holding a .sboard file are read directly.
+            sections: The sections of the project to load among SECTIONS, all
+                of them by default. The sections they depend on are loaded
+                too. The xml subtrees of the other sections are skipped
+                while parsing and accessing them raises a SBoardSectionError.
+                The sections are:
+                    timeline: the timeline, its tracks and transitions
+                    library: the library categories and elements
+                    scenes_meta: the scenes and their sequences
+                    panels: the panels, without their layers
+                    layers: the layers of the panels
+            backend: The name of the xml backend among backends.BACKENDS,
+                "etree" (the standard library) by default or "lxml"
+            slim: If True, only keep the nodes and attributes read by the
+                object model, which lets many projects stay in memory. The
+                nodes kept are listed in _SLIM_NODES: the library, the frame
+                rate, the title and sequenceExists metas of the project, and
+                for each scene its columns, its sceneInfo and the drawing
+                element, disabled option and links of its modules. Their
+                attributes are listed in _SLIM_ATTRIBUTES. The rest is
+                skipped while parsing and slim_report tells what was dropped.
+                The full object model is available, as are the fingerprints.
+                This trades parse time for memory: the parser still walks the
+                skipped subtrees through a Python target, which is slower
+                than building the whole tree in C.
+        """
+        with _open_board(sboard_path) as source:
+            return cls._load(source, sections, backend, slim)
+
+    @classmethod
+    def from_stream(
+        cls,
+        stream: IO[bytes],
+        sections: Optional[Iterable[str]] = None,
+        backend: Union[str, XMLBackend, None] = None,
+        slim: bool = False,
+    ) -> SBoardProject:
+        """Returns a SBoardProject from the given binary file object, read in
+        chunks while it is parsed. Gzip compressed content and zip archives
+        holding a .sboard file are read directly. See from_file for the
+        sections, the backend and slim."""
+        with _open_board(stream) as source:
+            return cls._load(source, sections, backend, slim)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: Union[bytes, bytearray, memoryview],
+        sections: Optional[Iterable[str]] = None,
+        backend: Union[str, XMLBackend, None] = None,
+        slim: bool = False,
+    ) -> SBoardProject:
+        """Returns a SBoardProject from the given content of a .sboard file,
+        which may also be gzip compressed or a zip archive. See from_file for
+        the sections, the backend and slim."""
+        return cls.from_stream(io.BytesIO(data), sections, backend, slim)
+
+    @classmethod
+    def _load(
+        cls,
+        source: Any,
+        sections: Optional[Iterable[str]],
+        backend: Union[str, XMLBackend, None],
+        slim: bool = False,
+    ) -> SBoardProject:
+        """Returns a SBoardProject parsed from the given path or file object
+        of uncompressed xml content."""
+        backend = get_backend(backend)
+
+        if sections is None and not slim:
+            return cls(backend.parse(source), backend=backend)
+
+        target = model_target = backend.tree_builder()
+
+        if slim:
+            target = model_target = _ModelTreeBuilder(target, slim)
+
+        if sections is not None:
+            sections = _resolve_sections(sections)
+            target = _SectionTreeBuilder(sections, target)
+
+        project = cls(backend.parse(source, target), sections, backend)
+
+        if slim:
+            project._slim_report = model_target.report
+
+        return project
+
+    @classmethod
+    def iter_file(
+        cls, sboard_path, backend: Union[str, XMLBackend, None] = None
+    ) -> Iterator[_SBoardNode]:
+        """Parses the given path incrementally and yields the objects of the
+        project as soon as their xml subtree is complete.
+
+        Library elements, audio tracks, transitions, scenes, panels and
+        video tracks are generated in the order they appear in the file,
+        the elements of a category once its subtree is parsed. A scene is
+        generated once all of its panels, the Top scene and the library are
+        parsed, followed by its panels in timeline order, and their subtrees
+        are discarded when the object following its last panel is
+        requested, so the objects generated must not be kept around. The
+        video tracks are generated once all the scenes are. Panels which do
+        not belong to any scene are skipped. Only the library, the options,
+        the timeline and the video clips of the project are retained as
+        they are needed to resolve ranges and elements, and they are
+        indexed as they are parsed. See from_file for the path and the
+        backend.
+        """
+        with _open_board(sboard_path) as source:
+            yield from cls._iter_source(source, backend)
+
+    @classmethod
+    def _iter_source(
+        cls, source: Any, backend: Union[str, XMLBackend, None]
+    ) -> Iterator[_SBoardNode]:
+        """Parses the given path or file object of uncompressed xml content
+        incrementally, see iter_file."""
+        backend = get_backend(backend)
+        project = None
+        # Indexes of the project, fed as the nodes are parsed
+        index = library_index = None
+        # Stack of the nodes being built, from the project node
+        stack = []
+        # Scenes waiting for their panels, in file order, with the ids of
+        # their panels which are not parsed yet
+        pending: collections.OrderedDict[
+            str, Tuple[ElementTree.Element, Set[str]]
+        ] = collections.OrderedDict()
+        # Id of the pending scene of each panel
+        panel_scenes: Dict[str, str] = {}
+        # Panel nodes parsed and not generated yet, by id
+        panels: Dict[str, ElementTree.Element] = {}
+        # Scenes and video tracks resolve ranges against the Top scene and
+        # elements against the library, so they wait for both
+        library_done = scenes_done = finished = False
+
+        def ready() -> bool:
+            """Returns True if the Top scene and the library are parsed."""
+            return index.top is not None and library_done
+
+        def complete(flush: bool = False) -> Iterator[_SBoardNode]:
+            """Generates the pending scenes whose panels are all parsed, in
+            file order, or all of them if flush is True, with their panels."""
+            if not flush and not ready():
+                return
+
+            while pending:
+                uid, (scene_node, missing) = next(iter(pending.items()))
+
+                if missing and not flush:
+                    return
+
+                del pending[uid]
+                panel_ids = index.scene_timeline(scene_node).panel_ids
+                project._clear_wrappers()
+                scene = project._wrap(SBoardScene, scene_node, project)
+                yield scene
+
+                for panel_id in panel_ids:
+                    if panel_id in panels:
+                        yield project._wrap(SBoardPanel, panels[panel_id], scene)
+
+                for panel_id in panel_ids:
+                    panel_scenes.pop(panel_id, None)
+                    panel_node = panels.pop(panel_id, None)
+
+                    if panel_node is not None:
+                        panel_node.clear()
+                    index.forget(panel_id)
+
+                index.forget(uid)
+                project._clear_wrappers()
+
+        def finish(force: bool = False) -> Iterator[_SBoardNode]:
+            """Generates the scenes left once /project/scenes is parsed, then
+            the video tracks, as soon as they can be resolved or anyway if
+            force is True."""
+            nonlocal finished
+
+            if finished or not scenes_done or not (force or ready()):
+                return
+
+            finished = True
+            yield from complete(flush=True)
+
+            # Panels which do not belong to any scene
+            for uid, panel_node in panels.items():
+                panel_node.clear()
+                index.forget(uid)
+            panels.clear()
+
+            if index.top is not None:
+                yield from project.timeline.video_tracks
+
+        for event, node in backend.iterparse(source, ("start", "end")):
+
+            if event == "start":
+                if project is None:
+                    project = cls(backend.element_tree(node), backend=backend)
+                    index = project.__index = _SBoardIndex(project, ())
+                    library_index = project.__library_index = _LibraryIndex(
+                        project
+                    )
+                stack.append(node)
+                continue
+
+            stack.pop()
+
+            if len(stack) == 1 and node.tag == "elements":
+                library_done = True
+                yield from complete()
+                yield from finish()
+                continue
+
+            if len(stack) == 1 and node.tag == "scenes":
+                scenes_done = True
+                yield from finish()
+                continue
+
+            # Only look at the children of /project/elements and /project/scenes
+            if len(stack) != 2:
+                continue
+
+            parent = stack[-1]
+
+            if parent.tag == "elements":
+                library_index.add(node)
+                category = project._wrap(SBoardLibraryCategory, node, project.library)
+                yield from category.elements
+                continue
+
+            if parent.tag != "scenes":
+                continue
+
+            name = node.attrib["name"]
+
+            if name == "Top" and index.top is None:
+                index.add(node)
+                timeline = project.timeline
+
+                for audio_track in timeline.audio_tracks:
+                    yield audio_track
+
+                for transition in timeline.transitions:
+                    yield transition
+
+                yield from complete()
+                yield from finish()
+
+            elif "shot" in name:
+                parent.remove(node)
+                uid = node.attrib["id"]
+                index.add(node)
+                panel_ids = index.scene_timeline(node).panel_ids
+
+                for panel_id in panel_ids:
+                    panel_scenes.setdefault(panel_id, uid)
+
+                pending[uid] = (node, set(panel_ids).difference(panels))
+                yield from complete()
+
+            elif "panel" in name:
+                parent.remove(node)
+                uid = node.attrib["id"]
+                scene_uid = panel_scenes.get(uid)
+                # Panels of scenes which are not parsed yet are kept until
+                # their scene is
+                index.add(node)
+                panels[uid] = node
+
+                if scene_uid is not None:
+                    pending[scene_uid][1].discard(uid)
+                    yield from complete()
+
+            else:
+                # Keep the video clips so that tracks can resolve them
+                index.add(node)
+
+        if project is None:
+            return
+
+        # Scenes still waiting for the Top scene or the library
+        scenes_done = True
+        yield from finish(force=True)
+
+    @property
+    def backend(self) -> XMLBackend:
+        """Returns the xml backend of the project."""
+        return self._backend
+
+    @property
+    def sections(self) -> FrozenSet[str]:
+        """Returns the sections loaded in the project."""
+        if self.__sections is None:
+            return frozenset(SECTIONS)
+        return self.__sections
+
+    def _require(self, section: str) -> None:
+        """Raises a SBoardSectionError if the given section is not loaded."""
+        if self.__sections is not None and section not in self.__sections:
+            raise SBoardSectionError(
+                "The {!r} section of the project is not loaded".format(section)
+            )
+
+    @property
+    def _index(self) -> _SBoardIndex:
+        """Returns the lookup index of the project, building it on first use."""
+        if self.__index is None:
+            self.__index = _SBoardIndex(self)
+        return self.__index
+
+    @property
+    def _library_index(self) -> _LibraryIndex:
+        """Returns the lookup index of the library, building it on first use."""
+        if self.__library_index is None:
+            self.__library_index = _LibraryIndex(self, self.library.xml_node)
+        return self.__library_index
+
+    def _wrap(self, cls: Type[_NodeType], xml_node, parent) -> _NodeType:
+        """Returns the object of the given class wrapping the xml node, which
+        is created with the given parent on first use."""
+        key = (cls, xml_node)
+        wrapper = self.__wrappers.get(key)
+
+        if wrapper is None:
+            wrapper = self.__wrappers[key] = cls(xml_node, parent)
+
+            if self._stats is not None:
+                self._stats._object(cls)
+
+        return wrapper
+
+    def _sequence(self, sequence_name: str) -> SBoardSequence:
+        """Returns the SBoardSequence of the given name, created on first use."""
+        key = (SBoardSequence, sequence_name)
+        sequence = self.__wrappers.get(key)
+
+        if sequence is None:
+            sequence = self.__wrappers[key] = SBoardSequence(self, sequence_name)
+
+            if self._stats is not None:
+                self._stats._object(SBoardSequence)
+
+        return sequence
+
+    def _clear_wrappers(self) -> None:
+        """Forgets all the objects created for the xml nodes of the project."""
+        self.__wrappers.clear()
+
+    @contextlib.contextmanager
+    def instrument(self) -> Iterator[SBoardStats]:
+        """Context manager collecting statistics on the accesses to the
+        project and its objects while it is active: xml lookups, elements
+        visited by linear scans, objects created and time spent in each
+        property. Instrumenting a project already instrumented returns its
+        current statistics.
+
+        Example:
+            with project.instrument() as stats:
+                run_pipeline(project)
+            print(stats.report())
+        """
+        if self._stats is not None:
+            yield self._stats
+            return
+
+        stats = self._stats = SBoardStats()
+
+        try:
+            yield stats
+        finally:
+            self._stats = None
 
     @property
     def sequences(self) -> Iterator[SBoardSequence]:
         """Returns an iterator of the sequences in the project."""
-        # Check that there are sequences
-        for meta in self.xml_node.findall("./metas/meta[@name='sequenceExists']"):
-            node = meta.find("bool")
+        if not self.__sequence_exists():
+            return
+
+        for sequence_name in self._sequence_groups:
+            yield self._sequence(sequence_name)
+
+    def sequence_by_name(self, name: str) -> Optional[SBoardSequence]:
+        """Returns the sequence of the given name or None if there is no such
+        sequence in the project."""
+        if not self.__sequence_exists() or name not in self._sequence_groups:
+            return None
+        return self._sequence(name)
+
+    def __sequence_exists(self) -> bool:
+        """Returns False if the project states that it has no sequence."""
+        for meta in self._findall("./metas/meta[@name='sequenceExists']"):
+            node = self._find("bool", meta)
             assert node is not None
             if node.attrib["value"] != "true":
-                return
+                return False
 
-        # Get all the sequences
-        sequence_names = set([])
+        return True
 
-        for scene in self.scenes:
-            seq = scene.sequence
-            if not seq:
-                continue
-            seq_name = seq.name
+    @_cached_property
+    def _sequence_groups(self) -> Dict[str, List[SBoardScene]]:
+        """Returns the scenes of the project by sequence name, in the order
+        they appear in the project, grouped in a single pass. The scenes are
+        grouped even if the project has no sequence, as each scene still
+        belongs to the default one."""
+        self._require("scenes_meta")
+        groups: Dict[str, List[SBoardScene]] = {}
 
-            if seq_name in sequence_names:
-                continue
+        for scene in self.scenes:
+            groups.setdefault(scene.sequence.name, []).append(scene)
 
-            sequence_names.add(seq_name)
-            yield seq
+        return groups
 
     @property
     def scenes(self) -> Iterator[SBoardScene]:
         """Returns an iterator of scenes within the project."""
-        for scene in self.xml_node.findall("./scenes/scene[@name]"):
+        self._require("scenes_meta")
+
+        for scene in self._findall("./scenes/scene[@name]"):
 
             if "shot" not in scene.attrib["name"]:
                 continue
 
-            yield SBoardScene(scene, self)
+            yield self._wrap(SBoardScene, scene, self)
+
+    def ascenes(self, batch_size: int = ASYNC_BATCH_SIZE) -> AsyncIterator[SBoardScene]:
+        """Async iterator of the scenes within the project, yielding control to
+        the event loop every batch_size scenes."""
+        return _aiterate(self.scenes, batch_size)
 
     @property
     def timeline(self) -> SBoardTimeline:
         """Returns the SBoardTimeline of the project."""
-        # Get the number of frames in the top node
-        top_node = self.xml_node.find("./scenes/scene[@name='Top']")
-        assert top_node is not None
-        return SBoardTimeline(top_node, self)
+        self._require("timeline")
+        return self._wrap(SBoardTimeline, self._index.top, self)
+
+    @property
+    def slim_report(self) -> Optional[SBoardSlimReport]:
+        """Returns what was dropped while parsing the project if it was
+        loaded with slim=True, None otherwise."""
+        return self._slim_report
 
     @property
     def frame_rate(self) -> float:
         """Returns the frame rate of the project"""
-        node = self.xml_node.find("./options/framerate")
+        node = self._find("./options/framerate")
         assert node is not None
         return float(node.attrib["val"])
 
     @property
     def title(self) -> str:
         """Returns the title of the project."""
-        node = self.xml_node.find("./metas/meta[@name='projectTitle']/string")
+        node = self._find("./metas/meta[@name='projectTitle']/string")
         assert node is not None
         return node.attrib["value"]
 
     @property
     def library(self) -> SBoardLibrary:
         """Returns the library of the project."""
-        node = self.xml_node.find("elements")
+        self._require("library")
+        node = self._find("elements")
         assert node is not None
-        return SBoardLibrary(node, self)
+        return self._wrap(SBoardLibrary, node, self)
+
+    def fingerprint(self) -> Dict[str, Dict[str, str]]:
+        """Returns the content hashes of the objects of the project.
+
+        The hashes are computed over the canonical form of the xml subtree of
+        each object, restricted to the nodes and attributes read by the object
+        model (see _SLIM_NODES and _SLIM_ATTRIBUTES). They are stable across
+        saves which do not modify what is read from the object, and do not
+        depend on the backend, the slim option or a SnapshotCache. They are
+        returned by kind ("scenes", "panels", "audio_tracks", "video_tracks"
+        and "categories") and by identifier, the name for audio tracks and the
+        uid for the other objects. The hashes of projects only match if they
+        were loaded with the same sections, as the subtrees of the sections
+        which are not loaded are missing.
+        """
+        return {kind: dict(hashes) for kind, hashes in self._fingerprint.items()}
+
+    @_cached_property
+    def _fingerprint(self) -> Dict[str, Dict[str, str]]:
+        """Returns the content hashes of the objects of the project."""
+        fingerprint: Dict[str, Dict[str, str]] = {
+            "scenes": {},
+            "panels": {},
+            "audio_tracks": {},
+            "video_tracks": {},
+            "categories": {},
+        }
+
+        for scene in self.scenes:
+            digest = _subtree_hash((scene.xml_node, _SCENE_SPEC))
+            fingerprint["scenes"][scene.uid] = digest
+
+            for panel in scene.panels:
+                digest = _subtree_hash((panel.xml_node, _PANEL_SPEC))
+                fingerprint["panels"][panel.uid] = digest
+
+        timeline = self.timeline
+
+        for audio_track in timeline.audio_tracks:
+            # Columns hold any kind of sequence, all of their nodes are read
+            digest = _subtree_hash((audio_track.xml_node, None))
+            fingerprint["audio_tracks"][audio_track.name] = digest
+
+        for video_track in timeline.video_tracks:
+            column = self._find(
+                "./columns/column[@name=$name]", timeline.xml_node, name=video_track.uid
+            )
+            assert column is not None
+            digest = _subtree_hash(
+                (video_track.xml_node, _MODULE_SPEC), (column, None)
+            )
+            fingerprint["video_tracks"][video_track.uid] = digest
+
+        for category in self.library.categories:
+            digest = _subtree_hash((category.xml_node, _CATEGORY_SPEC))
+            fingerprint["categories"][category.uid] = digest
+
+        return fingerprint
+
+    def materialize(self) -> ProjectRecord:
+        """Returns the whole project converted once into frozen records (see
+        the records module), with all the ranges, names and cross references
+        precomputed. The records do not refer to the xml tree, so the project
+        can be dropped once materialized.
+
+        Raises:
+            SBoardSectionError: If the project was not loaded with all the
+                sections
+        """
+        return materialize(self)
+
+    def resolve_assets(self, root: str, workers: int = 8) -> SBoardAssets:
+        """Returns the media files referenced by the project which exist or
+        are missing in the given directory of the project, along with the
+        files of the media directories which are not referenced.
+
+        The paths of the library elements, audio clips and video clips are
+        collected in a single pass and grouped by directory. Each directory
+        is listed once, the listings running in a pool of workers threads,
+        instead of checking each file separately.
+        """
+        directories: Dict[str, Set[str]] = {}
+
+        def add(path: str) -> None:
+            directory, name = os.path.split(path)
+            directories.setdefault(directory, set()).add(name)
+
+        for element in self.library.elements:
+            add(element.path)
+
+        timeline = self.timeline
+
+        for video_track in timeline.video_tracks:
+            for video_clip in video_track.clips:
+                if video_clip.element is not None:
+                    add(video_clip.path)
+
+        for audio_track in timeline.audio_tracks:
+            for audio_clip in audio_track.clips:
+                add(audio_clip.path)
+
+        paths = [os.path.join(root, directory) for directory in directories]
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            listings = list(executor.map(_list_directory, paths))
+
+        present = []
+        missing = []
+        unused = []
+
+        for (directory, names), listing in zip(directories.items(), listings):
+            listing = listing or {}
+
+            for name in names:
+                path = os.path.join(directory, name)
+                (present if name in listing else missing).append(path)
+
+            unused.extend(
+                os.path.join(directory, name)
+                for name, is_directory in listing.items()
+                if not is_directory and name not in names
+            )
+
+        return SBoardAssets(frozenset(present), frozenset(missing), frozenset(unused))
+
+    def diff(self, other: SBoardProject) -> SBoardDiff:
+        """Returns the differences between this project and the other one,
+        this project being the old version and the other one the new version.
+
+        The objects are compared through their fingerprint, so the diff runs
+        in linear time in the size of both projects.
+
+        Raises:
+            ValueError: If the projects were not loaded with the same sections,
+                as their fingerprints cannot be compared
+        """
+        if self.sections != other.sections:
+            raise ValueError(
+                "Cannot diff projects loaded with different sections: "
+                "{} and {}".format(sorted(self.sections), sorted(other.sections))
+            )
+
+        old = self._fingerprint
+        new = other._fingerprint
+
+        old_ranges = {scene.uid: scene.timeline_range for scene in self.scenes}
+        old_ranges.update(
+            (panel.uid, panel.timeline_range) for panel in self.timeline.panels
+        )
+        new_ranges = {scene.uid: scene.timeline_range for scene in other.scenes}
+        new_ranges.update(
+            (panel.uid, panel.timeline_range) for panel in other.timeline.panels
+        )
+
+        return SBoardDiff(
+            scenes=SBoardChanges.from_fingerprints(old["scenes"], new["scenes"]),
+            panels=SBoardChanges.from_fingerprints(old["panels"], new["panels"]),
+            audio_tracks=SBoardChanges.from_fingerprints(
+                old["audio_tracks"], new["audio_tracks"]
+            ),
+            video_tracks=SBoardChanges.from_fingerprints(
+                old["video_tracks"], new["video_tracks"]
+            ),
+            categories=SBoardChanges.from_fingerprints(
+                old["categories"], new["categories"]
+            ),
+            ranges={
+                uid: (old_range, new_ranges[uid])
+                for uid, old_range in old_ranges.items()
+                if uid in new_ranges and new_ranges[uid] != old_range
+            },
+        )
+
+
+_time_properties()
@@ -0,0 +1,536 @@
+"""
+Materialized model of the Storyboard Pro projects.
+materialize converts a SBoardProject once into frozen records holding all the
+values of the object model, with their ranges, names and cross references
+precomputed. The records do not keep any xml node, so the xml tree of the
+project can be dropped, and all the accesses are plain attribute reads.
+
+The records have the same attributes as the matching objects of the model,
+the collections being tuples instead of iterators, and is_group and
+is_enabled are also available as the group and enabled attributes.
+"""
+
+from __future__ import annotations
+
+import types
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+
+
+class _Record(object):
+    """Base class of the records. Their attributes are set once while the
+    project is materialized and cannot be changed afterwards."""
+
+    __slots__ = ()
+
+    def __init__(self, **fields: Any):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("{} is immutable".format(type(self).__name__))
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("{} is immutable".format(type(self).__name__))
+
+    def __repr__(self) -> str:
+        key = self.__slots__[0]
+        return "<{} {}={!r}>".format(type(self).__name__, key, getattr(self, key))
+
+
+def _link(record: _Record, **fields: Any) -> None:
+    """Sets the given cross references of a record being materialized."""
+    for name, value in fields.items():
+        object.__setattr__(record, name, value)
+
+
+class ProjectRecord(_Record):
+    """A materialized SBoardProject."""
+
+    __slots__ = ("title", "frame_rate", "timeline", "scenes", "sequences", "library")
+
+    title: str
+    frame_rate: float
+    timeline: TimelineRecord
+    scenes: Tuple[SceneRecord, ...]
+    sequences: Tuple[SequenceRecord, ...]
+    library: LibraryRecord
+
+
+class TimelineRecord(_Record):
+    """A materialized SBoardTimeline."""
+
+    __slots__ = (
+        "uid",
+        "length",
+        "scenes",
+        "panels",
+        "transitions",
+        "video_tracks",
+        "audio_tracks",
+        "project",
+    )
+
+    uid: str
+    length: int
+    scenes: Tuple[SceneRecord, ...]
+    panels: Tuple[PanelRecord, ...]
+    transitions: Tuple[TransitionRecord, ...]
+    video_tracks: Tuple[VideoTrackRecord, ...]
+    audio_tracks: Tuple[AudioTrackRecord, ...]
+    project: ProjectRecord
+
+
+class SequenceRecord(_Record):
+    """A materialized SBoardSequence."""
+
+    __slots__ = ("name", "scenes", "timeline_range", "project")
+
+    name: str
+    scenes: Tuple[SceneRecord, ...]
+    timeline_range: Tuple[int, int]
+    project: ProjectRecord
+
+
+class SceneRecord(_Record):
+    """A materialized SBoardScene."""
+
+    __slots__ = (
+        "uid",
+        "name",
+        "sequence",
+        "clip_range",
+        "timeline_range",
+        "length",
+        "panels",
+        "project",
+    )
+
+    uid: str
+    name: str
+    sequence: SequenceRecord
+    clip_range: Tuple[int, int]
+    timeline_range: Tuple[int, int]
+    length: int
+    panels: Tuple[PanelRecord, ...]
+    project: ProjectRecord
+
+
+class PanelRecord(_Record):
+    """A materialized SBoardPanel. layers holds all the layers of the panel,
+    groups included, in the order they appear in the panel."""
+
+    __slots__ = (
+        "uid",
+        "number",
+        "clip_range",
+        "scene_range",
+        "timeline_range",
+        "length",
+        "layers",
+        "scene",
+        "project",
+    )
+
+    uid: str
+    number: int
+    clip_range: Tuple[int, int]
+    scene_range: Tuple[int, int]
+    timeline_range: Tuple[int, int]
+    length: int
+    layers: Tuple[LayerRecord, ...]
+    scene: SceneRecord
+    project: ProjectRecord
+
+
+class LayerRecord(_Record):
+    """A materialized SBoardLayer. children holds the layers linked to a
+    group, in link order."""
+
+    __slots__ = ("name", "group", "element", "parent", "children", "panel")
+
+    name: str
+    group: bool
+    element: Optional[ElementRecord]
+    parent: Optional[LayerRecord]
+    children: Tuple[LayerRecord, ...]
+    panel: PanelRecord
+
+    def is_group(self) -> bool:
+        """Returns True if the layer is a group."""
+        return self.group
+
+
+class TransitionRecord(_Record):
+    """A materialized SBoardTransition."""
+
+    __slots__ = ("uid", "type", "timeline_range", "timeline")
+
+    uid: str
+    type: str
+    timeline_range: Tuple[int, int]
+    timeline: TimelineRecord
+
+
+class VideoTrackRecord(_Record):
+    """A materialized SBoardVideoTrack."""
+
+    __slots__ = ("uid", "name", "enabled", "clips", "timeline")
+
+    uid: str
+    name: str
+    enabled: bool
+    clips: Tuple[VideoClipRecord, ...]
+    timeline: TimelineRecord
+
+    def is_enabled(self) -> bool:
+        """Returns True if the track is enabled, False otherwise."""
+        return self.enabled
+
+
+class VideoClipRecord(_Record):
+    """A materialized SBoardVideoClip."""
+
+    __slots__ = (
+        "uid",
+        "clip_range",
+        "timeline_range",
+        "length",
+        "path",
+        "element",
+        "track",
+    )
+
+    uid: str
+    clip_range: Tuple[int, int]
+    timeline_range: Tuple[int, int]
+    length: int
+    path: Optional[str]
+    element: Optional[ElementRecord]
+    track: VideoTrackRecord
+
+
+class AudioTrackRecord(_Record):
+    """A materialized SBoardAudioTrack."""
+
+    __slots__ = ("name", "enabled", "clips", "timeline")
+
+    name: str
+    enabled: bool
+    clips: Tuple[AudioClipRecord, ...]
+    timeline: TimelineRecord
+
+    def is_enabled(self) -> bool:
+        """Returns True if the track is enabled, False otherwise."""
+        return self.enabled
+
+
+class AudioClipRecord(_Record):
+    """A materialized SBoardAudioClip."""
+
+    __slots__ = (
+        "file_name",
+        "path",
+        "clip_range",
+        "timeline_range",
+        "length",
+        "track",
+    )
+
+    file_name: str
+    path: str
+    clip_range: Tuple[float, float]
+    timeline_range: Tuple[int, int]
+    length: int
+    track: AudioTrackRecord
+
+
+class LibraryRecord(_Record):
+    """A materialized SBoardLibrary. elements_by_key maps the category uid and
+    the name of each element to its record."""
+
+    __slots__ = ("categories", "elements", "elements_by_key", "project")
+
+    categories: Tuple[CategoryRecord, ...]
+    elements: Tuple[ElementRecord, ...]
+    elements_by_key: Mapping[Tuple[str, str], ElementRecord]
+    project: ProjectRecord
+
+
+class CategoryRecord(_Record):
+    """A materialized SBoardLibraryCategory."""
+
+    __slots__ = (
+        "uid",
+        "name",
+        "root_folder",
+        "folder",
+        "extension",
+        "elements",
+        "library",
+    )
+
+    uid: str
+    name: str
+    root_folder: str
+    folder: str
+    extension: str
+    elements: Tuple[ElementRecord, ...]
+    library: LibraryRecord
+
+
+class ElementRecord(_Record):
+    """A materialized SBoardLibraryElement."""
+
+    __slots__ = ("name", "path", "category", "panels", "video_clips")
+
+    name: str
+    path: str
+    category: CategoryRecord
+    panels: Tuple[PanelRecord, ...]
+    video_clips: Tuple[VideoClipRecord, ...]
+
+
+def _library(library) -> Tuple[LibraryRecord, Dict[Tuple[str, str], ElementRecord]]:
+    """Returns the record of the given library and its elements by key."""
+    categories = []
+    elements = []
+    elements_by_key = {}
+
+    for category in library.categories:
+        category_record = CategoryRecord(
+            uid=category.uid,
+            name=category.name,
+            root_folder=category.root_folder,
+            folder=category.folder,
+            extension=category.extension,
+        )
+        category_elements = []
+
+        for element in category.elements:
+            key = (category.uid, element.name)
+
+            # Elements are indexed by their first occurrence, like the library
+            if key in elements_by_key:
+                continue
+
+            element_record = ElementRecord(
+                name=element.name, path=element.path, category=category_record
+            )
+            elements_by_key[key] = element_record
+            category_elements.append(element_record)
+
+        _link(category_record, elements=tuple(category_elements))
+        categories.append(category_record)
+        elements.extend(category_elements)
+
+    library_record = LibraryRecord(
+        categories=tuple(categories),
+        elements=tuple(elements),
+        elements_by_key=types.MappingProxyType(elements_by_key),
+    )
+
+    for category_record in categories:
+        _link(category_record, library=library_record)
+
+    return library_record, elements_by_key
+
+
+def _layers(panel, panel_record: PanelRecord, elements_by_key, users) -> None:
+    """Sets the layers of the given panel record, counting the panel among
+    the users of their elements."""
+    layers = list(panel.layer_iter(groups=True))
+    records = {}
+
+    for layer in layers:
+        group = layer.is_group()
+        element = None
+
+        if not group:
+            element = elements_by_key.get(layer._element_key)
+
+            if element is not None:
+                panels = users.setdefault(element, ([], []))[0]
+                if not panels or panels[-1] is not panel_record:
+                    panels.append(panel_record)
+
+        records[layer.name] = LayerRecord(
+            name=layer.name, group=group, element=element, panel=panel_record
+        )
+
+    for layer in layers:
+        parent = layer.parent
+        _link(
+            records[layer.name],
+            parent=None if parent is None else records[parent.name],
+            children=tuple(
+                records[child.name] for child in layer.layer_iter(groups=True)
+            ),
+        )
+
+    _link(panel_record, layers=tuple(records[layer.name] for layer in layers))
+
+
+def materialize(project) -> ProjectRecord:
+    """Returns the records of the given SBoardProject, computed in a single
+    walk over the object model. All the sections of the project must be
+    loaded."""
+    library, elements_by_key = _library(project.library)
+    timeline = project.timeline
+    # Panels and video clips using each element
+    users: Dict[ElementRecord, Tuple[List, List]] = {}
+
+    scenes = []
+    panels = []
+    sequence_scenes: Dict[str, List[SceneRecord]] = {}
+
+    for scene in timeline.scenes:
+        scene_record = SceneRecord(
+            uid=scene.uid,
+            name=scene.name,
+            clip_range=scene.clip_range,
+            timeline_range=scene.timeline_range,
+            length=scene.length,
+        )
+        sequence_scenes.setdefault(scene.sequence.name, []).append(scene_record)
+        scene_panels = []
+
+        for panel in scene.panels:
+            panel_record = PanelRecord(
+                uid=panel.uid,
+                number=panel.number,
+                clip_range=panel.clip_range,
+                scene_range=panel.scene_range,
+                timeline_range=panel.timeline_range,
+                length=panel.length,
+                scene=scene_record,
+            )
+            _layers(panel, panel_record, elements_by_key, users)
+            scene_panels.append(panel_record)
+
+        _link(scene_record, panels=tuple(scene_panels))
+        scenes.append(scene_record)
+        panels.extend(scene_panels)
+
+    sequences = {}
+
+    for name, records in sequence_scenes.items():
+        ranges = [record.timeline_range for record in records]
+        sequences[name] = SequenceRecord(
+            name=name,
+            scenes=tuple(records),
+            timeline_range=(
+                min(start for start, _ in ranges),
+                max(end for _, end in ranges),
+            ),
+        )
+
+        for record in records:
+            _link(record, sequence=sequences[name])
+
+    timeline_record = TimelineRecord(
+        uid=timeline.uid,
+        length=timeline.length,
+        scenes=tuple(scenes),
+        panels=tuple(panels),
+    )
+
+    transitions = tuple(
+        TransitionRecord(
+            uid=transition.uid,
+            type=transition.type,
+            timeline_range=transition.timeline_range,
+            timeline=timeline_record,
+        )
+        for transition in timeline.transitions
+    )
+
+    video_tracks = []
+
+    for video_track in timeline.video_tracks:
+        track_record = VideoTrackRecord(
+            uid=video_track.uid,
+            name=video_track.name,
+            enabled=video_track.is_enabled(),
+            timeline=timeline_record,
+        )
+        clips = []
+
+        for clip in video_track.clips:
+            element = elements_by_key.get(clip._element_key)
+            clip_record = VideoClipRecord(
+                uid=clip.uid,
+                clip_range=clip.clip_range,
+                timeline_range=clip.timeline_range,
+                length=clip.length,
+                path=None if element is None else element.path,
+                element=element,
+                track=track_record,
+            )
+
+            if element is not None:
+                users.setdefault(element, ([], []))[1].append(clip_record)
+
+            clips.append(clip_record)
+
+        _link(track_record, clips=tuple(clips))
+        video_tracks.append(track_record)
+
+    audio_tracks = []
+
+    for audio_track in timeline.audio_tracks:
+        track_record = AudioTrackRecord(
+            name=audio_track.name,
+            enabled=audio_track.is_enabled(),
+            timeline=timeline_record,
+        )
+        _link(
+            track_record,
+            clips=tuple(
+                AudioClipRecord(
+                    file_name=clip.file_name,
+                    path=clip.path,
+                    clip_range=clip.clip_range,
+                    timeline_range=clip.timeline_range,
+                    length=clip.length,
+                    track=track_record,
+                )
+                for clip in audio_track.clips
+            ),
+        )
+        audio_tracks.append(track_record)
+
+    _link(
+        timeline_record,
+        transitions=transitions,
+        video_tracks=tuple(video_tracks),
+        audio_tracks=tuple(audio_tracks),
+    )
+
+    for element in library.elements:
+        element_panels, element_clips = users.get(element, ((), ()))
+        _link(element, panels=tuple(element_panels), video_clips=tuple(element_clips))
+
+    project_record = ProjectRecord(
+        title=project.title,
+        frame_rate=project.frame_rate,
+        timeline=timeline_record,
+        scenes=tuple(scenes),
+        sequences=tuple(
+            sequences[sequence.name]
+            for sequence in project.sequences
+            if sequence.name in sequences
+        ),
+        library=library,
+    )
+    _link(timeline_record, project=project_record)
+    _link(library, project=project_record)
+
+    for record in list(sequences.values()) + scenes + panels:
+        _link(record, project=project_record)
+
+    return project_record
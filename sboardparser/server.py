@@ -0,0 +1,371 @@
+"""
+Local HTTP service answering json queries on Storyboard Pro projects.
+SBoardServer keeps the parsed projects warm in a ProjectCache, so that tools
+querying the same boards get their answers without parsing them again. Files
+are parsed again when they change and the responses are cached until then.
+
+All the endpoints answer GET requests and take the path of the .sboard file
+in the path query parameter, relative to the root directory of the server if
+any:
+    /summary: the summary of the project, see batch.summary
+    /scenes: the scenes of the timeline
+    /panels: the panels of the timeline, of a single scene with scene=<uid>
+    /tracks: the clips of the video and audio tracks, see batch.tracks
+    /transitions: the transitions of the timeline
+    /library: the elements of the library, see batch.library
+    /frame?frame=<frame>: the elements active at a frame, see at_frame
+    /ranges?start=<frame>&end=<frame>: the elements active within a frame
+        range, see in_range
+
+Usage:
+    python -m sboardparser.server --port 8765 --root /path/to/boards
+    curl "http://127.0.0.1:8765/frame?path=board.sboard&frame=120"
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import json
+import os
+import threading
+import urllib.parse
+import weakref
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from . import batch
+from .cache import ProjectCache
+from .parser import SBoardActiveElements
+from .parser import SBoardProject
+
+# Query parameters of a request, as returned by urllib.parse.parse_qs
+_Query = Dict[str, List[str]]
+
+
+class _QueryError(Exception):
+    """Raised when a request cannot be answered, with its http status."""
+
+    def __init__(self, status: int, message: str):
+        super(_QueryError, self).__init__(message)
+        self.status = status
+
+
+def _param(query: _Query, name: str) -> str:
+    """Returns the value of the given query parameter."""
+    values = query.get(name)
+
+    if not values:
+        raise _QueryError(400, "Missing {!r} parameter".format(name))
+
+    return values[0]
+
+
+def _int_param(query: _Query, name: str) -> int:
+    """Returns the value of the given integer query parameter."""
+    value = _param(query, name)
+
+    try:
+        return int(value)
+    except ValueError:
+        raise _QueryError(400, "Invalid {!r} parameter {!r}".format(name, value))
+
+
+def _scenes(project: SBoardProject, query: _Query) -> List[dict]:
+    """Returns the scenes of the timeline."""
+    rows = []
+
+    for scene in project.timeline.scenes:
+        start, end = scene.timeline_range
+        rows.append(
+            {
+                "uid": scene.uid,
+                "name": scene.name,
+                "sequence": scene.sequence.name,
+                "timeline_start": start,
+                "timeline_end": end,
+                "length": scene.length,
+            }
+        )
+
+    return rows
+
+
+def _panels(project: SBoardProject, query: _Query) -> List[dict]:
+    """Returns the panels of the timeline or of the scene of the query."""
+    if "scene" not in query:
+        return batch.panels(project)
+
+    uid = _param(query, "scene")
+    scene = project.timeline.get_scene(uid)
+
+    if scene is None:
+        raise _QueryError(404, "No scene {!r} in the project".format(uid))
+
+    return batch.scene_panels(scene)
+
+
+def _transitions(project: SBoardProject, query: _Query) -> List[dict]:
+    """Returns the transitions of the timeline."""
+    rows = []
+
+    for transition in project.timeline.transitions:
+        start, end = transition.timeline_range
+        rows.append(
+            {
+                "uid": transition.uid,
+                "type": transition.type,
+                "timeline_start": start,
+                "timeline_end": end,
+            }
+        )
+
+    return rows
+
+
+def _active(elements: SBoardActiveElements) -> dict:
+    """Returns the given active elements as plain values."""
+    return {
+        "scenes": [scene.uid for scene in elements.scenes],
+        "panels": [panel.uid for panel in elements.panels],
+        "transitions": [transition.uid for transition in elements.transitions],
+        "video_clips": [clip.uid for clip in elements.video_clips],
+        "audio_clips": [
+            {
+                "file_name": clip.file_name,
+                "timeline_start": clip.timeline_range[0],
+                "timeline_end": clip.timeline_range[1],
+            }
+            for clip in elements.audio_clips
+        ],
+    }
+
+
+def _frame(project: SBoardProject, query: _Query) -> dict:
+    """Returns the elements active at the frame of the query."""
+    return _active(project.timeline.at_frame(_int_param(query, "frame")))
+
+
+def _ranges(project: SBoardProject, query: _Query) -> dict:
+    """Returns the elements active within the range of the query."""
+    start = _int_param(query, "start")
+    end = _int_param(query, "end")
+    return _active(project.timeline.in_range(start, end))
+
+
+# Function returning the json value of each endpoint
+ENDPOINTS: Dict[str, Callable[[SBoardProject, _Query], Any]] = {
+    "/summary": lambda project, query: batch.summary(project),
+    "/scenes": _scenes,
+    "/panels": _panels,
+    "/tracks": lambda project, query: batch.tracks(project),
+    "/transitions": _transitions,
+    "/library": lambda project, query: batch.library(project),
+    "/frame": _frame,
+    "/ranges": _ranges,
+}
+
+
+class SBoardRequestHandler(BaseHTTPRequestHandler):
+    """Handler of the requests of SBoardServer. The X-Cache header of the
+    responses tells whether the response was cached."""
+
+    server: SBoardServer
+
+    def do_GET(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+
+        try:
+            body, cached = self.server.query(url.path, urllib.parse.parse_qs(url.query))
+            status = 200
+        except _QueryError as error:
+            body = json.dumps({"error": str(error)}).encode("utf-8")
+            cached = False
+            status = error.status
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Cache", "hit" if cached else "miss")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super(SBoardRequestHandler, self).log_message(format, *args)
+
+
+class SBoardServer(ThreadingHTTPServer):
+    """An http server answering json queries on Storyboard Pro projects, see
+    the module documentation for the endpoints.
+
+    Requests are handled in their own thread. The projects are kept in the
+    given ProjectCache, a new one by default, and the max_responses last
+    responses are cached as long as the cache returns the project they were
+    computed from, until the file changes or the project is evicted. The
+    responses only refer weakly to their project, so that they do not keep
+    the projects dropped by the cache in memory. The responses of a project
+    which are not cached are computed one at a time, as the lazy indices of
+    a project are not built concurrently.
+
+    When root is given, the paths of the requests are relative to it and
+    the files outside of it cannot be queried.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        root: Optional[str] = None,
+        cache: Optional[ProjectCache] = None,
+        max_responses: int = 1024,
+        verbose: bool = False,
+    ):
+        super(SBoardServer, self).__init__(address, SBoardRequestHandler)
+        self.__root = None if root is None else os.path.realpath(root)
+        self.__cache = ProjectCache() if cache is None else cache
+        self.__max_responses = max_responses
+        self.verbose = verbose
+        # Weak reference to the project and json body of the responses by
+        # endpoint, path and query
+        self.__responses: collections.OrderedDict[
+            tuple, Tuple[weakref.ref, bytes]
+        ] = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        # Locks held while computing the responses of each file, dropped once
+        # no request uses them
+        self.__project_locks: weakref.WeakValueDictionary[str, threading.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    @property
+    def root(self) -> Optional[str]:
+        """Returns the directory of the files which can be queried."""
+        return self.__root
+
+    @property
+    def cache(self) -> ProjectCache:
+        """Returns the cache of the projects."""
+        return self.__cache
+
+    @property
+    def url(self) -> str:
+        """Returns the base url of the server."""
+        host, port = self.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def query(self, endpoint: str, query: _Query) -> Tuple[bytes, bool]:
+        """Returns the json body of the response of the given endpoint and
+        query, and whether it was cached.
+
+        Raises:
+            _QueryError: If the request cannot be answered
+        """
+        handler = ENDPOINTS.get(endpoint)
+
+        if handler is None:
+            raise _QueryError(404, "Unknown endpoint {!r}".format(endpoint))
+
+        path = self.__resolve(_param(query, "path"))
+
+        try:
+            project = self.__cache.parse(path)
+        except OSError as error:
+            raise _QueryError(404, str(error))
+        except Exception as error:
+            raise _QueryError(500, "Cannot parse {}: {}".format(path, error))
+
+        key = (
+            endpoint,
+            path,
+            tuple((name, tuple(values)) for name, values in sorted(query.items())),
+        )
+
+        with self.__lock:
+            response = self.__responses.get(key)
+
+            if response is not None and response[0]() is project:
+                self.__responses.move_to_end(key)
+                return response[1], True
+
+            project_lock = self.__project_locks.get(path)
+
+            if project_lock is None:
+                project_lock = self.__project_locks[path] = threading.Lock()
+
+        with project_lock:
+            try:
+                value = handler(project, query)
+            except _QueryError:
+                raise
+            except Exception as error:
+                raise _QueryError(500, "{}: {}".format(type(error).__name__, error))
+
+        body = json.dumps(value).encode("utf-8")
+
+        with self.__lock:
+            self.__responses[key] = (weakref.ref(project), body)
+            self.__responses.move_to_end(key)
+
+            while len(self.__responses) > self.__max_responses:
+                self.__responses.popitem(last=False)
+
+        return body, False
+
+    def __resolve(self, path: str) -> str:
+        """Returns the real path of the file of a request."""
+        if self.__root is None:
+            return os.path.realpath(path)
+
+        real_path = os.path.realpath(os.path.join(self.__root, path))
+
+        if os.path.commonpath([self.__root, real_path]) != self.__root:
+            raise _QueryError(403, "{} is outside of the root directory".format(path))
+
+        return real_path
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    argument_parser.add_argument("--host", default="127.0.0.1")
+    argument_parser.add_argument("--port", type=int, default=8765)
+    argument_parser.add_argument(
+        "--root", help="Directory of the files which can be queried"
+    )
+    argument_parser.add_argument(
+        "--max-projects", type=int, default=16, help="Number of projects kept"
+    )
+    argument_parser.add_argument("--backend", default=None, help="Xml backend")
+    argument_parser.add_argument(
+        "--slim", action="store_true", help="Only keep the nodes read by the model"
+    )
+    argument_parser.add_argument(
+        "--verbose", action="store_true", help="Log the requests"
+    )
+    args = argument_parser.parse_args()
+
+    cache = ProjectCache(
+        max_projects=args.max_projects, backend=args.backend, slim=args.slim
+    )
+    server = SBoardServer(
+        (args.host, args.port), root=args.root, cache=cache, verbose=args.verbose
+    )
+    print("Serving on {}".format(server.url))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Instrumentation of the parsed projects.
+SBoardStats holds the counters collected while a project is instrumented (see
+SBoardProject.instrument): xml lookups, elements visited by linear scans,
+objects created and time spent in the properties of the object model.
+"""
+
+from __future__ import annotations
+
+import collections
+import time
+import types
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import Tuple
+
+
+class SBoardStats(object):
+    """The statistics of the accesses to an instrumented project.
+
+    Property times are inclusive: the time of a property accessing other
+    properties also counts in their own times. The time of the properties
+    returning an iterator includes the time spent generating its items.
+    """
+
+    def __init__(self):
+        self.__lookups: Dict[Tuple[str, str], int] = collections.Counter()
+        self.__scans: Dict[str, int] = collections.Counter()
+        self.__objects: Dict[str, int] = collections.Counter()
+        self.__calls: Dict[str, int] = collections.Counter()
+        self.__times: Dict[str, float] = collections.defaultdict(float)
+
+    @property
+    def lookups(self) -> Dict[Tuple[str, str], int]:
+        """Returns the number of xml lookups by method (find, findall or iter)
+        and path."""
+        return dict(self.__lookups)
+
+    @property
+    def scans(self) -> Dict[str, int]:
+        """Returns the number of elements visited by the linear scans of the
+        object model by location."""
+        return dict(self.__scans)
+
+    @property
+    def objects(self) -> Dict[str, int]:
+        """Returns the number of objects of the model created by class name."""
+        return dict(self.__objects)
+
+    @property
+    def calls(self) -> Dict[str, int]:
+        """Returns the number of accesses to each property, named as
+        Class.property."""
+        return dict(self.__calls)
+
+    @property
+    def times(self) -> Dict[str, float]:
+        """Returns the cumulative time in seconds spent in each property,
+        named as Class.property."""
+        return dict(self.__times)
+
+    def reset(self) -> None:
+        """Resets all the counters."""
+        for counter in (
+            self.__lookups,
+            self.__scans,
+            self.__objects,
+            self.__calls,
+            self.__times,
+        ):
+            counter.clear()
+
+    def report(self, limit: int = 20) -> str:
+        """Returns a text report of the statistics, with the limit highest
+        counts of each kind."""
+
+        def top(counter):
+            return sorted(counter.items(), key=lambda item: item[1], reverse=True)[
+                :limit
+            ]
+
+        lines = ["Properties (calls, total ms):"]
+        lines.extend(
+            "  {:<48}{:>10}{:>12.3f}".format(key, self.__calls[key], value * 1e3)
+            for key, value in top(self.__times)
+        )
+        lines.append("XML lookups:")
+        lines.extend(
+            "  {:<58}{:>10}".format("{} {}".format(*key), value)
+            for key, value in top(self.__lookups)
+        )
+        lines.append("Elements scanned:")
+        lines.extend(
+            "  {:<58}{:>10}".format(key, value) for key, value in top(self.__scans)
+        )
+        lines.append("Objects created:")
+        lines.extend(
+            "  {:<58}{:>10}".format(key, value) for key, value in top(self.__objects)
+        )
+        return "\n".join(lines)
+
+    def _lookup(self, method: str, path: str) -> None:
+        """Counts an xml lookup."""
+        self.__lookups[(method, path)] += 1
+
+    def _object(self, cls: type) -> None:
+        """Counts the creation of an object of the given class."""
+        self.__objects[cls.__name__] += 1
+
+    def _scan(self, iterable: Iterable, site: str) -> Iterator:
+        """Generates the items of the iterable, counting them as visited by the
+        linear scan at the given site."""
+        scans = self.__scans
+
+        for item in iterable:
+            scans[site] += 1
+            yield item
+
+    def _call(self, key: str, func: Callable[[Any], Any], obj: Any) -> Any:
+        """Returns func(obj), timing the call as the property of the given key."""
+        start = time.perf_counter()
+
+        try:
+            value = func(obj)
+        finally:
+            self.__times[key] += time.perf_counter() - start
+            self.__calls[key] += 1
+
+        if isinstance(value, types.GeneratorType):
+            return self.__timed_iter(key, value)
+
+        return value
+
+    def __timed_iter(self, key: str, iterator: Iterator) -> Iterator:
+        """Generates the items of the iterator, adding the time spent to
+        generate them to the property of the given key."""
+        times = self.__times
+
+        while True:
+            start = time.perf_counter()
+
+            try:
+                item = next(iterator)
+            except StopIteration:
+                times[key] += time.perf_counter() - start
+                return
+
+            times[key] += time.perf_counter() - start
+            yield item
+
@@ -2,15 +2,39 @@
 """
 """
 
+import asyncio
+import contextlib
+import csv
+import gc
+import gzip
 import types
 
+import io
+import json
 import os
+import shutil
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+import weakref
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
+from unittest import mock
+from unittest import skipIf
+from xml.etree import ElementTree
 
 import sboardparser
+import sboardparser.__main__
+import sboardparser.server
 
 SAMPLE_DIRECTORY = os.path.join(os.path.dirname(os.path.realpath(__file__)),
                                 "samples")
+BENCHMARK_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "benchmarks")
 
 
 class SBoardParserTest(TestCase):
@@ -385,3 +409,1479 @@ class SBoardTrackTest(TestCase):
         self.assertEqual("mp4", element_video_clip1.category.name)
         self.assertEqual("Shared", element_video_clip2.category.name)
         self.assertEqual("mp4", element_video_clip3.category.name)
+
+
+class SBoardIndexTest(TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(SBoardIndexTest, self).__init__(*args, **kwargs)
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        self.project = sboardparser.parse(test_path)
+
+    def test_panel_numbers(self):
+
+        for scene in self.project.scenes:
+            numbers = [panel.number for panel in scene.panels]
+            self.assertEqual(list(range(1, len(numbers) + 1)), numbers)
+
+    def test_ranges(self):
+
+        scenes = list(self.project.timeline.scenes)
+        self.assertEqual(4, len(scenes))
+        self.assertEqual((1, 48), scenes[0].timeline_range)
+        self.assertEqual((49, 72), scenes[1].timeline_range)
+        self.assertEqual((1, 48), scenes[0].clip_range)
+
+        panels = list(scenes[0].panels)
+        self.assertEqual((1, 24), panels[0].scene_range)
+        self.assertEqual((25, 48), panels[1].scene_range)
+        self.assertEqual((26, 50), panels[1].timeline_range)
+
+
+class SBoardStreamTest(TestCase):
+
+    def test_stream(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        project = sboardparser.parse(test_path)
+
+        expected = []
+        for scene in project.scenes:
+            expected.append((scene.uid, scene.timeline_range))
+            for panel in scene.panels:
+                expected.append((panel.uid, panel.timeline_range))
+
+        streamed = []
+        for obj in sboardparser.iter_project(test_path):
+            if isinstance(obj, (sboardparser.parser.SBoardScene,
+                                sboardparser.parser.SBoardPanel)):
+                streamed.append((obj.uid, obj.timeline_range))
+
+        self.assertEqual(expected, streamed)
+
+    def test_stream_tracks(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "track.sboard")
+        video_tracks = [
+            obj for obj in sboardparser.iter_project(test_path)
+            if isinstance(obj, sboardparser.parser.SBoardVideoTrack)
+        ]
+        self.assertEqual(2, len(video_tracks))
+        self.assertEqual(5, len(list(video_tracks[0].clips)))
+
+    def test_stream_large(self):
+        sys.path.insert(0, BENCHMARK_DIRECTORY)
+        import sboardgen
+        sys.path.remove(BENCHMARK_DIRECTORY)
+
+        sboard = io.StringIO()
+        sboardgen.generate(sboard, scenes=40, panels=5)
+        data = sboard.getvalue().encode("utf-8")
+        # The parsers read the content in several chunks
+        self.assertGreater(len(data), 1 << 18)
+        project = sboardparser.SBoardProject.from_bytes(data)
+
+        expected = []
+        for scene in project.scenes:
+            expected.append((scene.uid, scene.timeline_range))
+            for panel in scene.panels:
+                expected.append((panel.uid, panel.timeline_range))
+
+        for backend in ("etree", "lxml"):
+            streamed = []
+            scene = None
+            for obj in sboardparser.iter_project(io.BytesIO(data),
+                                                 backend=backend):
+                if isinstance(obj, sboardparser.parser.SBoardScene):
+                    scene = obj
+                    streamed.append((obj.uid, obj.timeline_range))
+                    self.assertEqual(5, len(list(obj.panels)))
+                elif isinstance(obj, sboardparser.parser.SBoardPanel):
+                    streamed.append((obj.uid, obj.timeline_range))
+                    self.assertEqual(scene.uid, obj.scene.uid)
+                    self.assertEqual(4, len(list(obj.layer_iter())))
+
+            self.assertEqual(expected, streamed)
+
+    def test_stream_order(self):
+        sys.path.insert(0, BENCHMARK_DIRECTORY)
+        import sboardgen
+        sys.path.remove(BENCHMARK_DIRECTORY)
+
+        sboard = io.StringIO()
+        sboardgen.generate(sboard, scenes=5, panels=3, library=4)
+        data = sboard.getvalue().encode("utf-8")
+        project = sboardparser.SBoardProject.from_bytes(data)
+
+        expected = []
+        for scene in project.scenes:
+            expected.append((scene.uid, scene.timeline_range))
+            for panel in scene.panels:
+                expected.append(
+                    (panel.uid, panel.timeline_range,
+                     [layer.element.name for layer in panel.layer_iter()
+                      if layer.element is not None]))
+
+        # The library after the scenes and the Top scene after the shots
+        root = ElementTree.fromstring(data)
+        library = root.find("elements")
+        root.remove(library)
+        root.append(library)
+        scenes = root.find("scenes")
+        top = scenes.find("scene[@name='Top']")
+        scenes.remove(top)
+        scenes.append(top)
+        data = ElementTree.tostring(root)
+
+        streamed = []
+        elements = []
+        for obj in sboardparser.iter_project(io.BytesIO(data)):
+            if isinstance(obj, sboardparser.parser.SBoardScene):
+                streamed.append((obj.uid, obj.timeline_range))
+            elif isinstance(obj, sboardparser.parser.SBoardPanel):
+                streamed.append(
+                    (obj.uid, obj.timeline_range,
+                     [layer.element.name for layer in obj.layer_iter()
+                      if layer.element is not None]))
+            elif isinstance(obj, sboardparser.parser.SBoardLibraryElement):
+                elements.append(obj.name)
+
+        self.assertEqual(expected, streamed)
+        self.assertEqual(
+            [element.name for element in project.library.elements], elements)
+
+
+class SBoardSnapshotCacheTest(TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.test_path = os.path.join(self.cache_dir, "sequence.sboard")
+        shutil.copy(os.path.join(SAMPLE_DIRECTORY, "sequence.sboard"),
+                    self.test_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_hit_and_miss(self):
+        cache = sboardparser.SnapshotCache(self.cache_dir)
+
+        parsed = cache.parse(self.test_path)
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+
+        cached = cache.parse(self.test_path)
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+        self.assertEqual(0.5, cache.hit_rate)
+
+        self.assertEqual(
+            [(p.uid, p.timeline_range) for p in parsed.timeline.panels],
+            [(p.uid, p.timeline_range) for p in cached.timeline.panels])
+        SBoardParserTest()._test_project(cached)
+
+        # Touching the file does not invalidate the snapshot
+        os.utime(self.test_path, (0, 0))
+        cache.parse(self.test_path)
+        self.assertEqual((2, 1), (cache.hits, cache.misses))
+
+        # Modifying it does
+        with open(self.test_path, "ab") as sboard_file:
+            sboard_file.write(b"\n")
+        cache.parse(self.test_path)
+        self.assertEqual((2, 2), (cache.hits, cache.misses))
+
+    def test_eviction(self):
+        cache = sboardparser.SnapshotCache(self.cache_dir, max_size=0)
+        cache.parse(self.test_path)
+        self.assertEqual(1, cache.evictions)
+        self.assertFalse(os.path.exists(cache.snapshot_path(self.test_path)))
+
+    def test_evicted_meanwhile(self):
+        cache = sboardparser.SnapshotCache(self.cache_dir)
+        reference = _panel_uids(cache.parse(self.test_path))
+
+        # Another process removes the snapshot once it is read
+        with mock.patch.object(os, "utime", side_effect=FileNotFoundError):
+            project = cache.parse(self.test_path)
+
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+        self.assertEqual(reference, _panel_uids(project))
+
+    @skipIf(sboardparser.backends.lxml_etree is None, "lxml is not installed")
+    def test_backend(self):
+        cache = sboardparser.SnapshotCache(self.cache_dir, backend="lxml")
+        reference = _panel_uids(sboardparser.parse(self.test_path))
+
+        for _ in range(2):
+            project = cache.parse(self.test_path)
+            self.assertEqual("lxml", project.backend.name)
+            self.assertEqual(reference, _panel_uids(project))
+
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+
+class SBoardProjectCacheTest(TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.test_paths = []
+
+        for name in ("sequence.sboard", "track.sboard"):
+            test_path = os.path.join(self.cache_dir, name)
+            shutil.copy(os.path.join(SAMPLE_DIRECTORY, name), test_path)
+            self.test_paths.append(test_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_reload(self):
+        cache = sboardparser.ProjectCache()
+        test_path = self.test_paths[0]
+
+        project = cache.parse(test_path)
+        self.assertIs(project, cache.parse(test_path))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+        # Modifying the file parses it again, the old project stays usable
+        panels = _panel_uids(project)
+        with open(test_path, "ab") as sboard_file:
+            sboard_file.write(b"\n")
+
+        reloaded = cache.parse(test_path)
+        self.assertIsNot(project, reloaded)
+        self.assertEqual(1, cache.reloads)
+        self.assertEqual(panels, _panel_uids(project))
+        self.assertEqual(panels, _panel_uids(reloaded))
+        self.assertEqual(os.path.getsize(test_path), cache.size)
+
+    def test_eviction(self):
+        cache = sboardparser.ProjectCache(max_projects=1)
+        first = cache.parse(self.test_paths[0])
+        cache.parse(self.test_paths[1])
+        self.assertEqual((1, 1), (len(cache), cache.evictions))
+        self.assertIsNot(first, cache.parse(self.test_paths[0]))
+
+        # The most recent project is kept whatever its size
+        cache = sboardparser.ProjectCache(max_size=0)
+        project = cache.parse(self.test_paths[0])
+        self.assertIs(project, cache.parse(self.test_paths[0]))
+        cache.parse(self.test_paths[1])
+        self.assertEqual((1, 1), (len(cache), cache.evictions))
+
+    def test_threads(self):
+        cache = sboardparser.ProjectCache()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            projects = list(executor.map(cache.parse, self.test_paths * 8))
+
+        self.assertEqual(2, cache.misses)
+        self.assertEqual(2, len(set(map(id, projects))))
+
+    def test_threads_eviction(self):
+        cache = sboardparser.ProjectCache(max_projects=1)
+        from_file = sboardparser.SBoardProject.from_file
+        guard = threading.Lock()
+        parsing = []
+        overlaps = []
+
+        def parse(path, **kwargs):
+            with guard:
+                if path in parsing:
+                    overlaps.append(path)
+                parsing.append(path)
+            try:
+                return from_file(path, **kwargs)
+            finally:
+                with guard:
+                    parsing.remove(path)
+
+        with mock.patch.object(sboardparser.SBoardProject, "from_file",
+                               side_effect=parse):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(cache.parse, self.test_paths * 16))
+
+        # Evictions never let two threads parse the same file
+        self.assertEqual([], overlaps)
+        self.assertEqual({}, cache._ProjectCache__parse_locks)
+
+
+@skipIf(sboardparser.parser.numpy is None, "numpy is not installed")
+class SBoardArraysTest(TestCase):
+
+    def test_timeline_arrays(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        project = sboardparser.parse(test_path)
+        arrays = project.timeline.to_arrays()
+
+        scenes = list(project.timeline.scenes)
+        self.assertEqual([s.uid for s in scenes],
+                         list(arrays["scenes"]["uid"]))
+        self.assertEqual([s.timeline_range for s in scenes],
+                         list(zip(arrays["scenes"]["timeline_start"],
+                                  arrays["scenes"]["timeline_end"])))
+
+        panels = list(project.timeline.panels)
+        panel_array = arrays["panels"]
+        self.assertEqual([p.uid for p in panels], list(panel_array["uid"]))
+        self.assertEqual([p.timeline_range for p in panels],
+                         list(zip(panel_array["timeline_start"],
+                                  panel_array["timeline_end"])))
+        self.assertEqual([p.clip_range for p in panels],
+                         list(zip(panel_array["clip_start"],
+                                  panel_array["clip_end"])))
+        self.assertEqual([p.scene_range for p in panels],
+                         list(zip(panel_array["scene_start"],
+                                  panel_array["scene_end"])))
+        self.assertEqual([p.scene.uid for p in panels],
+                         list(arrays["scenes"]["uid"][panel_array["scene"]]))
+        self.assertEqual(0, len(arrays["transitions"]))
+
+    def test_scene_arrays(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        project = sboardparser.parse(test_path)
+        scene = next(project.scenes)
+        arrays = scene.to_arrays()
+
+        self.assertEqual(1, len(arrays["scenes"]))
+        self.assertEqual(scene.length, arrays["panels"]["length"].sum())
+
+
+class SBoardFrameLookupTest(TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(SBoardFrameLookupTest, self).__init__(*args, **kwargs)
+        test_path = os.path.join(SAMPLE_DIRECTORY, "track.sboard")
+        self.project = sboardparser.parse(test_path)
+
+    def test_at_frame(self):
+        timeline = self.project.timeline
+
+        active = timeline.at_frame(146)
+        self.assertEqual(["0a5a672aa5c0189f"],
+                         [clip.uid for clip in active.video_clips])
+        self.assertEqual([(146, 699)],
+                         [clip.timeline_range for clip in active.audio_clips])
+        self.assertEqual([], active.scenes)
+
+        active = timeline.at_frame(10)
+        self.assertEqual(["0a5a672aa5c00f9f"],
+                         [scene.uid for scene in active.scenes])
+        self.assertEqual(["0a5a672aa5c00fa7"],
+                         [panel.uid for panel in active.panels])
+
+        active = timeline.at_frame(5000)
+        self.assertEqual(([], [], [], [], []), tuple(active))
+
+    def test_in_range(self):
+        timeline = self.project.timeline
+
+        active = timeline.in_range(1040, 1210)
+        self.assertEqual(
+            ["0a5a672aa5c0189f", "0a5a672aa5c04668", "0a5a672aa5c03a09"],
+            [clip.uid for clip in active.video_clips])
+        self.assertEqual(1, len(active.audio_clips))
+        self.assertEqual([], active.panels)
+
+    def test_panels_in_scenes(self):
+        for sample in ("sequence.sboard", "track.sboard"):
+            timeline = sboardparser.parse(
+                os.path.join(SAMPLE_DIRECTORY, sample)).timeline
+
+            for frame in range(timeline.length + 2):
+                active = timeline.at_frame(frame)
+                scenes = [scene.uid for scene in active.scenes]
+                self.assertEqual(scenes,
+                                 [panel.scene.uid for panel in active.panels])
+
+    def test_get_scene(self):
+        timeline = self.project.timeline
+
+        for scene in timeline.scenes:
+            self.assertIs(scene, timeline.get_scene(scene.uid))
+
+        panel = next(timeline.panels)
+        self.assertIsNone(timeline.get_scene(panel.uid))
+        self.assertIsNone(timeline.get_scene("unknown"))
+
+    def test_interval_index(self):
+        intervals = [(0, 100, "long"), (5, 10, "a"), (8, 12, "b"),
+                     (12, 12, "empty"), (20, 30, "c"), (25, 40, "d")]
+        index = sboardparser.parser._IntervalIndex(intervals)
+
+        for start in range(-2, 105):
+            expected = [item for first, last, item in intervals
+                        if first <= start < last]
+            self.assertEqual(expected, index.at(start))
+
+            for stop in range(start + 1, start + 15):
+                expected = [item for first, last, item in intervals
+                            if first < stop and last > start and first < last]
+                self.assertEqual(expected, index.overlapping(start, stop))
+
+
+def _panel_uids(project):
+    return [panel.uid for panel in project.timeline.panels]
+
+
+class SBoardParseManyTest(TestCase):
+
+    def test_parse_many(self):
+        paths = [os.path.join(SAMPLE_DIRECTORY, name)
+                 for name in ("sequence.sboard", "track.sboard",
+                              "missing.sboard")]
+
+        results = {result.path: result
+                   for result in sboardparser.parse_many(paths, workers=2)}
+        self.assertEqual(set(paths), set(results))
+
+        sequence = results[paths[0]]
+        self.assertTrue(sequence.ok)
+        self.assertEqual(4, sequence.value["scenes"])
+        self.assertEqual(6, sequence.value["panels"])
+
+        missing = results[paths[2]]
+        self.assertFalse(missing.ok)
+        self.assertIn("FileNotFoundError", missing.error)
+
+        results = {result.path: result.value
+                   for result in sboardparser.parse_many(
+                       paths[:2], workers=2, extract=_panel_uids)}
+        self.assertEqual(
+            _panel_uids(sboardparser.parse(paths[0])), results[paths[0]])
+
+
+class SBoardCommandLineTest(TestCase):
+
+    def run_main(self, *argv):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with contextlib.redirect_stdout(stdout), \
+                contextlib.redirect_stderr(stderr):
+            code = sboardparser.__main__.main(list(argv))
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_summary(self):
+        code, stdout, stderr = self.run_main(
+            "summary", SAMPLE_DIRECTORY, "--workers", "2", "--timings")
+        self.assertEqual(0, code)
+
+        rows = [json.loads(line) for line in stdout.splitlines()]
+        self.assertEqual(
+            len([name for name in os.listdir(SAMPLE_DIRECTORY)
+                 if name.endswith(".sboard")]), len(rows))
+        self.assertEqual(len(rows), stderr.count("parse "))
+
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        row = next(row for row in rows if row["file"] == test_path)
+        self.assertEqual(6, row["panels"])
+
+    def test_csv(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        code, stdout, _ = self.run_main(
+            "panels", test_path, "--format", "csv", "--workers", "1")
+        self.assertEqual(0, code)
+
+        rows = list(csv.DictReader(io.StringIO(stdout)))
+        self.assertEqual(_panel_uids(sboardparser.parse(test_path)),
+                         [row["uid"] for row in rows])
+
+    def test_error(self):
+        code, stdout, stderr = self.run_main(
+            "library", os.path.join(SAMPLE_DIRECTORY, "missing.sboard"))
+        self.assertEqual((1, ""), (code, stdout))
+        self.assertIn("FileNotFoundError", stderr)
+
+
+class SBoardAsyncTest(TestCase):
+
+    def test_aparse(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+
+        async def collect():
+            project = await sboardparser.aparse(test_path)
+            scenes = [scene.uid async for scene in project.ascenes()]
+            panels = [panel.uid async for panel in
+                      project.timeline.apanels(batch_size=1)]
+            elements = [element.name async for element in
+                        project.library.aelements()]
+            return project, scenes, panels, elements
+
+        project, scenes, panels, elements = asyncio.run(collect())
+        self.assertEqual([scene.uid for scene in project.scenes], scenes)
+        self.assertEqual(_panel_uids(project), panels)
+        self.assertEqual(
+            [element.name for element in project.library.elements], elements)
+
+    def test_aparse_options(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        project = asyncio.run(sboardparser.aparse(
+            test_path, sections=["panels"], slim=True))
+
+        self.assertEqual(_panel_uids(sboardparser.parse(test_path)),
+                         _panel_uids(project))
+        self.assertNotIn("library", project.sections)
+        self.assertIsNotNone(project.slim_report)
+
+    def test_yield_control(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        project = sboardparser.parse(test_path)
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        async def collect():
+            task = asyncio.ensure_future(tick())
+            await asyncio.sleep(0)
+            count = len(ticks)
+            async for _ in project.timeline.apanels(batch_size=1):
+                pass
+            task.cancel()
+            return len(ticks) - count
+
+        self.assertGreater(asyncio.run(collect()), 1)
+
+
+class SBoardWrapperTest(TestCase):
+
+    def test_shared_wrappers(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "track.sboard")
+        project = sboardparser.parse(test_path)
+
+        self.assertIs(project.timeline, project.timeline)
+        self.assertIs(project.library, project.library)
+
+        scene = next(project.scenes)
+        self.assertIs(scene, next(project.timeline.scenes))
+        self.assertIs(scene.sequence, scene.sequence)
+
+        panel = next(scene.panels)
+        self.assertIs(panel, next(project.timeline.panels))
+        self.assertEqual({panel: 1}, {next(scene.panels): 1})
+
+        clip = next(next(project.timeline.video_tracks).clips)
+        self.assertIs(clip.element, clip.element)
+        self.assertIn(clip.element, list(clip.element.category.elements))
+
+        with self.assertRaises(AttributeError):
+            panel.attribute = None
+
+    def test_released_wrappers(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "track.sboard")
+        project = sboardparser.parse(test_path)
+
+        panel = next(project.timeline.panels)
+        timeline_range = panel.timeline_range
+        self.assertEqual(timeline_range, panel._cached_timeline_range)
+        self.assertFalse(hasattr(panel, "__dict__"))
+
+        # The project does not keep the objects alive
+        released = weakref.ref(panel)
+        del panel
+        gc.collect()
+        self.assertIsNone(released())
+
+        panel = next(project.timeline.panels)
+        self.assertFalse(hasattr(panel, "_cached_timeline_range"))
+        self.assertEqual(timeline_range, panel.timeline_range)
+
+    def test_direct_construction(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "track.sboard")
+        project = sboardparser.parse(test_path)
+        scene = next(project.scenes)
+
+        direct_scene = sboardparser.parser.SBoardScene(scene.xml_node, project)
+        self.assertEqual(scene.name, direct_scene.name)
+        self.assertEqual(scene.timeline_range, direct_scene.timeline_range)
+
+        panel = next(scene.panels)
+        direct_panel = sboardparser.parser.SBoardPanel(panel.xml_node,
+                                                       direct_scene)
+        self.assertEqual([layer.name for layer in panel.layer_iter()],
+                         [layer.name for layer in direct_panel.layer_iter()])
+
+
+class SBoardSectionsTest(TestCase):
+
+    def test_all_sections(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "track.sboard")
+        project = sboardparser.parse(test_path, sections=sboardparser.SECTIONS)
+        SBoardParserTest()._test_project(project)
+
+    def test_timeline_only(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        project = sboardparser.parse(test_path, sections={"scenes_meta"})
+
+        self.assertEqual({"timeline", "scenes_meta"}, project.sections)
+        self.assertEqual(4, len(list(project.timeline.scenes)))
+
+        with self.assertRaises(sboardparser.SBoardSectionError):
+            list(next(project.scenes).panels)
+
+        with self.assertRaises(sboardparser.SBoardSectionError):
+            project.library
+
+        self.assertIsNone(project.xml_node.find("elements"))
+        self.assertIsNone(project.xml_node.find("./scenes/scene[@name='panel']"))
+
+    def test_panels_without_layers(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        project = sboardparser.parse(test_path, sections={"panels"})
+        full_project = sboardparser.parse(test_path)
+
+        self.assertEqual(
+            [p.timeline_range for p in full_project.timeline.panels],
+            [p.timeline_range for p in project.timeline.panels])
+
+        with self.assertRaises(sboardparser.SBoardSectionError):
+            list(next(project.timeline.panels).layer_iter())
+
+    def test_unknown_section(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+
+        with self.assertRaises(ValueError):
+            sboardparser.parse(test_path, sections={"unknown"})
+
+
+class SBoardDiffTest(TestCase):
+
+    def test_fingerprint(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        fingerprint = sboardparser.parse(test_path).fingerprint()
+
+        self.assertEqual(4, len(fingerprint["scenes"]))
+        self.assertEqual(6, len(fingerprint["panels"]))
+        self.assertEqual(fingerprint,
+                         sboardparser.parse(test_path).fingerprint())
+
+        # Attribute order and whitespaces do not change the fingerprint
+        with open(test_path) as sboard_file:
+            content = sboard_file.read()
+        content = content.replace(
+            '<warpSeq exposures="1-24" id="0a56c0ed54300eaa" start="1" '
+            'end="24"/>',
+            '<warpSeq   id="0a56c0ed54300eaa" exposures="1-24" end="24" '
+            'start="1" />')
+        root = sboardparser.parser.ElementTree.fromstring(content)
+        project = sboardparser.SBoardProject(
+            sboardparser.parser.ElementTree.ElementTree(root))
+        self.assertEqual(fingerprint, project.fingerprint())
+
+    def test_fingerprint_load_modes(self):
+        for sample in ("sequence.sboard", "track.sboard", "test3d.sboard"):
+            test_path = os.path.join(SAMPLE_DIRECTORY, sample)
+            fingerprint = sboardparser.parse(test_path).fingerprint()
+
+            backends = ["etree"]
+            if sboardparser.backends.lxml_etree is not None:
+                backends.append("lxml")
+
+            for backend in backends:
+                for slim in (False, True):
+                    project = sboardparser.parse(
+                        test_path, backend=backend, slim=slim)
+                    self.assertEqual(fingerprint, project.fingerprint())
+
+            project = sboardparser.parse(
+                test_path, sections=sboardparser.SECTIONS)
+            self.assertEqual(fingerprint, project.fingerprint())
+
+            with tempfile.TemporaryDirectory() as cache_dir:
+                cache = sboardparser.SnapshotCache(cache_dir)
+                for _ in range(2):
+                    project = cache.parse(test_path)
+                    self.assertEqual(fingerprint, project.fingerprint())
+
+    def test_diff_sections(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        old = sboardparser.parse(test_path)
+        new = sboardparser.parse(test_path, sections=["panels"])
+
+        with self.assertRaises(ValueError):
+            old.diff(new)
+
+    def test_diff(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        old = sboardparser.parse(test_path)
+        new = sboardparser.parse(test_path)
+
+        # Shift the second scene and modify a layer of the first panel
+        top = new.xml_node.find("./scenes/scene[@name='Top']")
+        warp_seq = top.find(".//warpSeq[@id='0a56c0ed543017f8']")
+        warp_seq.set("exposures", "50-73")
+        panel = new.xml_node.find("./scenes/scene[@id='0a56c0ed54300eaa']")
+        panel.find("./rootgroup/nodeslist/module").set("name", "renamed")
+
+        # Remove the last panel of the last scene
+        scenes = new.xml_node.find("scenes")
+        scenes.remove(scenes.find("./scene[@id='0a56c0ed54301bbe']"))
+        scene = scenes.find("./scene[@id='0a56c0ed54301bb7']")
+        column = scene.find("./columns/column[@type='0']")
+        column.remove(column.find("warpSeq"))
+
+        diff = old.diff(new)
+        self.assertEqual(([], [], ["0a56c0ed54301bb7"]), diff.scenes)
+        self.assertEqual(([], ["0a56c0ed54301bbe"], ["0a56c0ed54300eaa"]),
+                         diff.panels)
+        self.assertEqual(((49, 72), (50, 73)), diff.ranges["0a56c0ed543017f8"])
+        self.assertEqual(((50, 74), (51, 75)), diff.ranges["0a56c0ed543017ff"])
+        self.assertNotIn("0a56c0ed54300ea2", diff.ranges)
+        self.assertEqual(([], [], []), diff.categories)
+
+
+class SBoardGeneratorTest(TestCase):
+
+    def setUp(self):
+        sys.path.insert(0, BENCHMARK_DIRECTORY)
+        import sboardgen
+        self.generate = sboardgen.generate
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        sys.path.remove(BENCHMARK_DIRECTORY)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_generated_project(self):
+        test_path = os.path.join(self.tmp_dir, "generated.sboard")
+        with open(test_path, "w") as sboard_file:
+            self.generate(sboard_file, scenes=20, panels=5, video_clips=3,
+                          transitions=4, scenes_per_sequence=8)
+
+        project = sboardparser.parse(test_path)
+        SBoardParserTest()._test_project(project)
+
+        timeline = project.timeline
+        self.assertEqual(20, len(list(timeline.scenes)))
+        self.assertEqual(100, len(list(timeline.panels)))
+        self.assertEqual(3, len(list(project.sequences)))
+        self.assertEqual(3, len(list(next(timeline.video_tracks).clips)))
+        self.assertEqual(4, len(list(timeline.transitions)))
+        self.assertEqual(20 * 5 * 24, timeline.length)
+
+
+class SBoardStatsTest(TestCase):
+
+    def test_instrument(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "track.sboard")
+        project = sboardparser.parse(test_path)
+        panel_class = sboardparser.parser.SBoardPanel
+        uid_property = vars(panel_class)["uid"]
+
+        with project.instrument() as stats:
+            self.assertIsInstance(stats, sboardparser.SBoardStats)
+
+            # Nested instrumentation shares the statistics
+            with project.instrument() as nested_stats:
+                self.assertIs(stats, nested_stats)
+
+            panels = list(project.timeline.panels)
+            for panel in panels:
+                self.assertEqual(panel.timeline_range, panel.timeline_range)
+                for layer in panel.layer_iter(groups=True, recursive=True):
+                    if not layer.is_group():
+                        layer.element
+
+            video_track = next(project.timeline.video_tracks)
+            for clip in video_track.clips:
+                clip.element
+
+        self.assertIs(uid_property, vars(panel_class)["uid"])
+        self.assertEqual(len(panels), stats.objects["SBoardPanel"])
+        self.assertEqual(1, stats.calls["SBoardTimeline.panels"])
+        self.assertEqual(2 * len(panels), stats.calls["SBoardPanel.timeline_range"])
+        self.assertGreater(stats.times["SBoardTimeline.panels"], 0)
+        self.assertEqual(1, stats.lookups[("findall", "./scenes/scene")])
+        self.assertIn("SBoardVideoClip.element", stats.scans)
+        self.assertIn("SBoardLayer.element", stats.report())
+
+        # Nothing is counted once the instrumentation is over
+        project.timeline.uid
+        self.assertNotIn("SBoardTimeline.uid", stats.calls)
+
+    def test_instrument_project(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "track.sboard")
+        project = sboardparser.parse(test_path)
+        other = sboardparser.parse(test_path)
+        properties = dict(vars(sboardparser.parser.SBoardPanel))
+
+        with project.instrument() as stats:
+            # The classes are left untouched
+            self.assertEqual(properties,
+                             dict(vars(sboardparser.parser.SBoardPanel)))
+
+            # Other projects are not timed
+            with other.instrument() as other_stats:
+                list(other.timeline.panels)
+            list(other.timeline.panels)
+
+        self.assertNotIn("SBoardTimeline.panels", stats.calls)
+        self.assertEqual(1, other_stats.calls["SBoardTimeline.panels"])
+
+        stats.reset()
+        self.assertEqual({}, stats.calls)
+
+
+class SBoardBackendTest(TestCase):
+
+    def test_unknown_backend(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        with self.assertRaises(ValueError):
+            sboardparser.parse(test_path, backend="unknown")
+
+    def test_etree_variables(self):
+        backend = sboardparser.backends.get_backend("etree")
+        root = sboardparser.parser.ElementTree.fromstring(
+            "<a><b name=\"it's\"/><b name='other'/></a>")
+        node = backend.find(root, "./b[@name=$name]", name="it's")
+        self.assertEqual("it's", node.attrib["name"])
+        self.assertEqual(
+            1, len(backend.findall(root, "./b[@name=$name]", name="other")))
+
+    @skipIf(sboardparser.backends.lxml_etree is None, "lxml is not installed")
+    def test_lxml(self):
+        for sample in ("sequence.sboard", "track.sboard"):
+            test_path = os.path.join(SAMPLE_DIRECTORY, sample)
+            project = sboardparser.parse(test_path, backend="lxml")
+            self.assertEqual("lxml", project.backend.name)
+            SBoardParserTest()._test_project(project)
+
+            reference = sboardparser.parse(test_path)
+            self.assertEqual("etree", reference.backend.name)
+            self.assertEqual(_panel_uids(reference), _panel_uids(project))
+            self.assertEqual(reference.fingerprint(), project.fingerprint())
+
+            # The backend is found from the xml nodes
+            tree = project.xml_node
+            self.assertEqual(
+                "lxml", sboardparser.SBoardProject(tree).backend.name)
+
+            project = sboardparser.parse(
+                test_path, sections=["panels"], backend="lxml")
+            self.assertEqual(_panel_uids(reference), _panel_uids(project))
+
+            streamed = [
+                node.uid for node in sboardparser.iter_project(
+                    test_path, backend="lxml")
+                if isinstance(node, sboardparser.parser.SBoardPanel)]
+            self.assertEqual(_panel_uids(reference), streamed)
+
+
+class SBoardLayerTreeTest(TestCase):
+
+    def test_layer_tree(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "test3d.sboard")
+        project = sboardparser.parse(test_path)
+        panel = next(project.timeline.panels)
+
+        def names(nodes):
+            return [(node.layer.name, names(node.children)) for node in nodes]
+
+        self.assertEqual([("test_abc_1", []),
+                          ("test_abc", []),
+                          ("test_decor_fbx_layer", []),
+                          ("Group_1", [("Group_2", [("B", [])]), ("A", [])]),
+                          ("BG", [])],
+                         names(panel.layer_tree()))
+
+        layers = {layer.name: layer
+                  for layer in panel.layer_iter(groups=True, recursive=True)}
+        self.assertIsNone(layers["Group_1"].parent)
+        self.assertIsNone(layers["BG"].parent)
+        self.assertIs(layers["Group_1"], layers["Group_2"].parent)
+        self.assertIs(layers["Group_2"], layers["B"].parent)
+        self.assertIs(layers["Group_1"], layers["A"].parent)
+        self.assertEqual(["Group_2", "B", "A"],
+                         [layer.name for layer in layers["Group_1"].layer_iter(
+                             groups=True, recursive=True)])
+
+        # The graph of the panel is built once
+        with project.instrument() as stats:
+            for layer in panel.layer_iter(groups=True, recursive=True):
+                list(layer.layer_iter(groups=True, recursive=True))
+                layer.parent
+            panel.layer_tree()
+        self.assertEqual({}, stats.lookups)
+
+    def test_layer_tree_links(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "test3d.sboard")
+        project = sboardparser.parse(test_path)
+        panel_node = next(project.timeline.panels).xml_node
+
+        # A cycle between both groups and a link from a drawing layer
+        links = panel_node.find("./rootgroup/linkedlist")
+        ElementTree.SubElement(links, "link",
+                               {"out": "Group_2", "in": "Group_1"})
+        ElementTree.SubElement(links, "link", {"out": "BG", "in": "A"})
+
+        project = sboardparser.SBoardProject(project.xml_node)
+        panel = next(project.timeline.panels)
+        layers = {layer.name: layer
+                  for layer in panel.layer_iter(groups=True, recursive=True)}
+        self.assertEqual(["B", "Group_1", "A"],
+                         [layer.name for layer in layers["Group_2"].layer_iter(
+                             groups=True, recursive=True)])
+        self.assertEqual([], list(layers["BG"].layer_iter(groups=True)))
+
+        def check(nodes):
+            for node in nodes:
+                self.assertEqual(
+                    [layer.name for layer in node.layer.layer_iter(
+                        groups=True, recursive=True)],
+                    [child.layer.name for child in _preorder(node.children)])
+                check(node.children)
+
+        tree = panel.layer_tree()
+        self.assertEqual(
+            ["test_abc_1", "test_abc", "test_decor_fbx_layer", "BG"],
+            [node.layer.name for node in tree])
+        check(tree)
+
+
+def _preorder(nodes):
+    for node in nodes:
+        yield node
+        yield from _preorder(node.children)
+
+
+class SBoardLibraryIndexTest(TestCase):
+
+    def test_get(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "test3d.sboard")
+        project = sboardparser.parse(test_path)
+        library = project.library
+
+        for category in library.categories:
+            self.assertIs(category, library.get_category(category.uid))
+            self.assertIs(library, category.library)
+
+            for element in category.elements:
+                self.assertIs(
+                    element, library.get_element(category.uid, element.name))
+
+        self.assertIsNone(library.get_category("unknown"))
+        self.assertIsNone(library.get_element(category.uid, "unknown"))
+
+    def test_users(self):
+        for sample in ("test3d.sboard", "track.sboard"):
+            test_path = os.path.join(SAMPLE_DIRECTORY, sample)
+            project = sboardparser.parse(test_path)
+
+            expected_panels = {}
+            for panel in project.timeline.panels:
+                for layer in panel.layer_iter():
+                    if layer.element is not None:
+                        panels = expected_panels.setdefault(layer.element, [])
+                        if panel not in panels:
+                            panels.append(panel)
+
+            expected_clips = {}
+            for video_track in project.timeline.video_tracks:
+                for clip in video_track.clips:
+                    expected_clips.setdefault(clip.element, []).append(clip)
+
+            for element in project.library.elements:
+                self.assertEqual(expected_panels.get(element, []),
+                                 list(element.panels))
+                self.assertEqual(expected_clips.get(element, []),
+                                 list(element.video_clips))
+
+            if sample == "test3d.sboard":
+                self.assertTrue(expected_panels)
+            else:
+                self.assertTrue(expected_clips)
+
+
+class SBoardSequenceIndexTest(TestCase):
+
+    def test_sequences(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        project = sboardparser.parse(test_path)
+        scenes = list(project.scenes)
+
+        sequences = list(project.sequences)
+        self.assertTrue(sequences)
+
+        for sequence in sequences:
+            expected = [scene for scene in scenes
+                        if scene.sequence.name == sequence.name]
+            self.assertEqual(expected, list(sequence.scenes))
+            self.assertIs(sequence, project.sequence_by_name(sequence.name))
+            self.assertEqual((expected[0].timeline_range[0],
+                              expected[-1].timeline_range[1]),
+                             sequence.timeline_range)
+
+        self.assertIsNone(project.sequence_by_name("unknown"))
+
+    def test_without_sequences(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "track.sboard")
+        project = sboardparser.parse(test_path)
+        scene = next(project.scenes)
+
+        self.assertEqual([], list(project.sequences))
+        self.assertIsNone(project.sequence_by_name(scene.sequence.name))
+        self.assertIn(scene, list(scene.sequence.scenes))
+        self.assertEqual(scene.timeline_range[0],
+                         scene.sequence.timeline_range[0])
+        self.assertIsNone(project._sequence("unknown").timeline_range)
+
+
+class SBoardSourceTest(TestCase):
+
+    def setUp(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "test3d.sboard")
+        self.reference = _panel_uids(sboardparser.parse(test_path))
+
+        with open(test_path, "rb") as fp:
+            self.data = fp.read()
+
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zip_file:
+            zip_file.writestr("readme.txt", "")
+            zip_file.writestr("board/test3d.sboard", self.data)
+        self.archive = archive.getvalue()
+
+    def test_bytes(self):
+        for data in (self.data, gzip.compress(self.data), self.archive):
+            project = sboardparser.SBoardProject.from_bytes(memoryview(data))
+            self.assertEqual(self.reference, _panel_uids(project))
+
+    def test_stream(self):
+        for data in (self.data, gzip.compress(self.data), self.archive):
+            project = sboardparser.SBoardProject.from_stream(
+                io.BytesIO(data), sections=["panels"])
+            self.assertEqual(self.reference, _panel_uids(project))
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name, data in (("test3d.sboard.gz", gzip.compress(self.data)),
+                               ("test3d.zip", self.archive)):
+                path = os.path.join(tmp_dir, name)
+                with open(path, "wb") as fp:
+                    fp.write(data)
+
+                self.assertEqual(self.reference,
+                                 _panel_uids(sboardparser.parse(path)))
+                streamed = [
+                    node.uid for node in sboardparser.iter_project(path)
+                    if isinstance(node, sboardparser.parser.SBoardPanel)]
+                self.assertEqual(self.reference, streamed)
+
+    def test_missing_member(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zip_file:
+            zip_file.writestr("readme.txt", "")
+
+        with self.assertRaises(ValueError):
+            sboardparser.SBoardProject.from_bytes(archive.getvalue())
+
+
+class SBoardExportTest(TestCase):
+
+    def test_edl(self):
+        for sample in ("sequence.sboard", "track.sboard"):
+            test_path = os.path.join(SAMPLE_DIRECTORY, sample)
+            project = sboardparser.parse(test_path)
+            timeline = project.timeline
+
+            edl = io.StringIO()
+            timeline.export_edl(edl)
+            lines = edl.getvalue().splitlines()
+            self.assertEqual("TITLE: {}".format(project.title), lines[0])
+
+            uids = [line.split(": ")[1] for line in lines
+                    if line.startswith("* SBOARD UID: ")]
+            audio_uids = [clip.file_name for track in timeline.audio_tracks
+                          for clip in track.clips]
+            self.assertEqual(sorted(_panel_uids(project) + audio_uids),
+                             sorted(uids))
+
+            for video_track in timeline.video_tracks:
+                edl = io.StringIO()
+                timeline.export_edl(edl, video_track)
+                uids = [line.split(": ")[1]
+                        for line in edl.getvalue().splitlines()
+                        if line.startswith("* SBOARD UID: ")]
+                self.assertEqual(
+                    sorted([clip.uid for clip in video_track.clips]
+                           + audio_uids),
+                    sorted(uids))
+
+    def test_edl_cuts(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "track.sboard")
+        timeline = sboardparser.parse(test_path).timeline
+
+        for video_track in [None] + list(timeline.video_tracks):
+            edl = io.StringIO()
+            timeline.export_edl(edl, video_track)
+            # Record in and out timecodes of the events on the V channel
+            ranges = [line.split()[-2:]
+                      for line in edl.getvalue().splitlines()
+                      if line[:3].isdigit() and line.split()[2] == "V"]
+            clips = (timeline.panels if video_track is None
+                     else video_track.clips)
+            self.assertEqual(len(list(clips)), len(ranges))
+
+            for (_, previous_out), (record_in, _) in zip(ranges, ranges[1:]):
+                self.assertLessEqual(previous_out, record_in)
+
+    def test_otio_json(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "track.sboard")
+        project = sboardparser.parse(test_path)
+        timeline = project.timeline
+
+        document = io.StringIO()
+        timeline.export_otio_json(document)
+        tracks = json.loads(document.getvalue())["tracks"]["children"]
+
+        storyboard = tracks[0]["children"]
+        self.assertEqual(_panel_uids(project),
+                         [item["metadata"]["sboard"]["uid"]
+                          for item in storyboard])
+        self.assertEqual(
+            project.frame_rate,
+            storyboard[0]["source_range"]["duration"]["rate"])
+
+        audio_tracks = list(timeline.audio_tracks)
+        for track, audio_track in zip(tracks[-len(audio_tracks):],
+                                      audio_tracks):
+            self.assertEqual((audio_track.name, "Audio"),
+                             (track["name"], track["kind"]))
+
+            # Gaps and clips place the clips at their timeline frame
+            position = 0
+            for item in track["children"]:
+                source_range = item["source_range"]
+                if item["OTIO_SCHEMA"] == "Clip.1":
+                    clip = next(
+                        c for c in audio_track.clips
+                        if c.timeline_range[0] - 1 == position)
+                    self.assertEqual(
+                        round(clip.clip_range[0] * project.frame_rate),
+                        source_range["start_time"]["value"])
+                position += source_range["duration"]["value"]
+
+    def test_transitions(self):
+        sys.path.insert(0, BENCHMARK_DIRECTORY)
+        import sboardgen
+        sys.path.remove(BENCHMARK_DIRECTORY)
+
+        sboard = io.StringIO()
+        sboardgen.generate(sboard, scenes=4, panels=2, transitions=3)
+        project = sboardparser.SBoardProject.from_bytes(
+            sboard.getvalue().encode("utf-8"))
+
+        document = io.StringIO()
+        project.timeline.export_otio_json(document)
+        storyboard = json.loads(
+            document.getvalue())["tracks"]["children"][0]["children"]
+        transitions = [item for item in storyboard
+                       if item["OTIO_SCHEMA"] == "Transition.1"]
+        self.assertEqual(3, len(transitions))
+        self.assertEqual("SMPTE_Dissolve", transitions[0]["transition_type"])
+
+        edl = io.StringIO()
+        project.timeline.export_edl(edl)
+        self.assertEqual(3, edl.getvalue().count("* TRANSITION: DISSOLVE"))
+
+
+class SBoardServerTest(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for name in ("sequence.sboard", "track.sboard"):
+            shutil.copy(os.path.join(SAMPLE_DIRECTORY, name), self.root)
+
+        self.server = sboardparser.server.SBoardServer(
+            ("127.0.0.1", 0), root=self.root)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.root)
+
+    def get(self, endpoint, **params):
+        url = "{}{}?{}".format(self.server.url, endpoint,
+                               urllib.parse.urlencode(params))
+        try:
+            with urllib.request.urlopen(url) as response:
+                return (response.status, response.headers["X-Cache"],
+                        json.loads(response.read()))
+        except urllib.error.HTTPError as error:
+            return error.code, None, json.loads(error.read())
+
+    def test_endpoints(self):
+        project = sboardparser.parse(
+            os.path.join(self.root, "sequence.sboard"))
+        timeline = project.timeline
+
+        status, cache, panels = self.get("/panels", path="sequence.sboard")
+        self.assertEqual((200, "miss"), (status, cache))
+        self.assertEqual(_panel_uids(project),
+                         [panel["uid"] for panel in panels])
+        self.assertEqual("hit", self.get("/panels", path="sequence.sboard")[1])
+
+        scenes = self.get("/scenes", path="sequence.sboard")[2]
+        self.assertEqual([scene.uid for scene in timeline.scenes],
+                         [scene["uid"] for scene in scenes])
+
+        panels = self.get("/panels", path="sequence.sboard",
+                          scene=scenes[1]["uid"])[2]
+        scene = list(timeline.scenes)[1]
+        self.assertEqual([panel.uid for panel in scene.panels],
+                         [panel["uid"] for panel in panels])
+
+        frame = self.get("/frame", path="sequence.sboard", frame=30)[2]
+        self.assertEqual([panel.uid for panel in timeline.at_frame(30).panels],
+                         frame["panels"])
+
+        ranges = self.get(
+            "/ranges", path="sequence.sboard", start=1, end=60)[2]
+        self.assertEqual(
+            [scene.uid for scene in timeline.in_range(1, 60).scenes],
+            ranges["scenes"])
+
+        for endpoint in ("/summary", "/tracks", "/transitions", "/library"):
+            self.assertEqual(200, self.get(endpoint, path="track.sboard")[0])
+
+    def test_errors(self):
+        self.assertEqual(404, self.get("/unknown", path="track.sboard")[0])
+        self.assertEqual(400, self.get("/panels")[0])
+        self.assertEqual(400, self.get("/frame", path="track.sboard",
+                                       frame="first")[0])
+        self.assertEqual(404, self.get("/panels", path="missing.sboard")[0])
+        self.assertEqual(403, self.get("/panels", path="../track.sboard")[0])
+
+    def test_reload(self):
+        test_path = os.path.join(self.root, "sequence.sboard")
+        self.get("/summary", path="sequence.sboard")
+
+        with open(test_path, "ab") as sboard_file:
+            sboard_file.write(b"\n")
+
+        status, cache, _ = self.get("/summary", path="sequence.sboard")
+        self.assertEqual((200, "miss"), (status, cache))
+        self.assertEqual(1, self.server.cache.reloads)
+
+    def test_concurrency(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda frame: self.get("/frame", path="sequence.sboard",
+                                       frame=frame),
+                range(1, 145)))
+
+        self.assertTrue(all(status == 200 for status, _, _ in results))
+        self.assertEqual(1, self.server.cache.misses)
+
+    def test_evicted_projects(self):
+        cache = sboardparser.ProjectCache(max_projects=1)
+        server = sboardparser.server.SBoardServer(
+            ("127.0.0.1", 0), root=self.root, cache=cache)
+        self.addCleanup(server.server_close)
+
+        server.query("/summary", {"path": ["sequence.sboard"]})
+        project = weakref.ref(
+            cache.parse(os.path.join(self.root, "sequence.sboard")))
+        server.query("/summary", {"path": ["track.sboard"]})
+        gc.collect()
+
+        self.assertIsNone(project())
+        self.assertFalse(
+            server.query("/summary", {"path": ["sequence.sboard"]})[1])
+        self.assertEqual(0, len(server._SBoardServer__project_locks))
+
+
+class SBoardAssetsTest(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_resolve_assets(self):
+        project = sboardparser.parse(
+            os.path.join(SAMPLE_DIRECTORY, "track.sboard"))
+        referenced = {element.path for element in project.library.elements}
+        referenced.update(clip.path for track in project.timeline.audio_tracks
+                          for clip in track.clips)
+
+        present = sorted(referenced)[::2]
+        for path in present + ["./audio/unused.wav"]:
+            full_path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, "w"):
+                pass
+        os.makedirs(os.path.join(self.root, "audio", "takes"))
+
+        assets = project.resolve_assets(self.root, workers=2)
+        self.assertEqual(set(present), assets.present)
+        self.assertEqual(referenced - set(present), assets.missing)
+        self.assertEqual({os.path.join("./audio", "unused.wav")},
+                         set(assets.unused))
+
+    def test_resolve_drawings(self):
+        project = sboardparser.parse(
+            os.path.join(SAMPLE_DIRECTORY, "test3d.sboard"))
+        self.assertEqual(
+            {"Draw": "tvg", "FbxModels": "fbx", "abcModels": "abc"},
+            {category.name: category.extension
+             for category in project.library.categories})
+
+        category = next(category for category in project.library.categories
+                        if category.name == "Draw")
+        element = next(category.elements)
+        self.assertTrue(element.path.endswith(element.name + ".tvg"))
+
+        full_path = os.path.join(self.root, element.path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w"):
+            pass
+
+        assets = project.resolve_assets(self.root, workers=2)
+        self.assertIn(element.path, assets.present)
+        self.assertNotIn(element.path, assets.missing)
+
+
+class SBoardMaterializeTest(TestCase):
+
+    def test_materialize(self):
+        for sample in ("sequence.sboard", "track.sboard", "test3d.sboard"):
+            project = sboardparser.parse(os.path.join(SAMPLE_DIRECTORY,
+                                                      sample))
+            record = project.materialize()
+            timeline = project.timeline
+
+            self.assertEqual(project.title, record.title)
+            self.assertEqual(timeline.length, record.timeline.length)
+            self.assertEqual(
+                [(s.uid, s.timeline_range, s.sequence.name)
+                 for s in timeline.scenes],
+                [(s.uid, s.timeline_range, s.sequence.name)
+                 for s in record.timeline.scenes])
+            self.assertEqual(
+                [(p.uid, p.scene_range, p.timeline_range)
+                 for p in timeline.panels],
+                [(p.uid, p.scene_range, p.timeline_range)
+                 for p in record.timeline.panels])
+            self.assertEqual([s.name for s in project.sequences],
+                             [s.name for s in record.sequences])
+
+            for panel, panel_record in zip(timeline.panels,
+                                           record.timeline.panels):
+                layers = list(panel.layer_iter(groups=True))
+                self.assertEqual(
+                    [(layer.name, layer.is_group(),
+                      layer.parent and layer.parent.name,
+                      None if layer.is_group() else
+                      layer.element and layer.element.path)
+                     for layer in layers],
+                    [(layer.name, layer.is_group(),
+                      layer.parent and layer.parent.name,
+                      layer.element and layer.element.path)
+                     for layer in panel_record.layers])
+
+            self.assertEqual(
+                [(c.uid, c.timeline_range, c.path)
+                 for t in timeline.video_tracks for c in t.clips],
+                [(c.uid, c.timeline_range, c.path)
+                 for t in record.timeline.video_tracks for c in t.clips])
+            self.assertEqual(
+                [(c.file_name, c.clip_range, c.timeline_range)
+                 for t in timeline.audio_tracks for c in t.clips],
+                [(c.file_name, c.clip_range, c.timeline_range)
+                 for t in record.timeline.audio_tracks for c in t.clips])
+            self.assertEqual(
+                [(e.path, [p.uid for p in e.panels],
+                  [c.uid for c in e.video_clips])
+                 for e in project.library.elements],
+                [(e.path, [p.uid for p in e.panels],
+                  [c.uid for c in e.video_clips])
+                 for e in record.library.elements])
+
+    def test_frozen(self):
+        project = sboardparser.parse(os.path.join(SAMPLE_DIRECTORY,
+                                                  "track.sboard"))
+        record = project.materialize()
+        scene = record.timeline.scenes[0]
+
+        self.assertIs(record, scene.project)
+        self.assertIs(scene, scene.panels[0].scene)
+        with self.assertRaises(AttributeError):
+            scene.name = "renamed"
+        with self.assertRaises(AttributeError):
+            del record.timeline
+        with self.assertRaises(TypeError):
+            record.library.elements_by_key[("0", "name")] = None
+
+    def test_sections(self):
+        project = sboardparser.parse(os.path.join(SAMPLE_DIRECTORY,
+                                                  "track.sboard"),
+                                     sections=["timeline"])
+        with self.assertRaises(sboardparser.SBoardSectionError):
+            project.materialize()
+
+
+class SBoardSlimTest(TestCase):
+
+    def test_slim(self):
+        for sample in ("sequence.sboard", "track.sboard", "test3d.sboard"):
+            test_path = os.path.join(SAMPLE_DIRECTORY, sample)
+            project = sboardparser.parse(test_path)
+            slim_project = sboardparser.parse(test_path, slim=True)
+
+            self.assertIsNone(project.slim_report)
+            self.assertGreater(slim_project.slim_report.elements, 0)
+            self.assertGreater(slim_project.slim_report.bytes, 0)
+            self.assertLess(
+                len(list(slim_project.xml_node.iter())),
+                len(list(project.xml_node.iter())))
+
+            self.assertEqual(project.title, slim_project.title)
+            self.assertEqual(project.frame_rate, slim_project.frame_rate)
+            self.assertEqual(
+                [(p.uid, p.timeline_range,
+                  [(layer.name, layer.is_group(),
+                    None if layer.is_group() else
+                    layer.element and layer.element.path)
+                   for layer in p.layer_iter(groups=True, recursive=True)])
+                 for p in project.timeline.panels],
+                [(p.uid, p.timeline_range,
+                  [(layer.name, layer.is_group(),
+                    None if layer.is_group() else
+                    layer.element and layer.element.path)
+                   for layer in p.layer_iter(groups=True, recursive=True)])
+                 for p in slim_project.timeline.panels])
+            self.assertEqual(
+                [(t.name, t.is_enabled(), [c.path for c in t.clips])
+                 for t in project.timeline.video_tracks],
+                [(t.name, t.is_enabled(), [c.path for c in t.clips])
+                 for t in slim_project.timeline.video_tracks])
+            self.assertEqual(
+                [(t.name, t.is_enabled(), [c.clip_range for c in t.clips])
+                 for t in project.timeline.audio_tracks],
+                [(t.name, t.is_enabled(), [c.clip_range for c in t.clips])
+                 for t in slim_project.timeline.audio_tracks])
+            self.assertEqual([s.name for s in project.sequences],
+                             [s.name for s in slim_project.sequences])
+
+    def test_slim_attributes(self):
+        project = sboardparser.parse(
+            os.path.join(SAMPLE_DIRECTORY, "track.sboard"), slim=True)
+
+        for node in project.xml_node.iter("module"):
+            self.assertEqual({"name", "type"}, set(node.attrib))
+        self.assertEqual({}, project.xml_node.getroot().attrib)
+
+    def test_slim_sections(self):
+        test_path = os.path.join(SAMPLE_DIRECTORY, "sequence.sboard")
+        project = sboardparser.parse(test_path, sections={"scenes_meta"},
+                                     slim=True)
+        self.assertEqual(
+            [s.name for s in sboardparser.parse(test_path).scenes],
+            [s.name for s in project.scenes])
+
+    def test_slim_cache(self):
+        cache = sboardparser.ProjectCache(slim=True)
+        project = cache.parse(os.path.join(SAMPLE_DIRECTORY, "track.sboard"))
+        self.assertIsNotNone(project.slim_report)